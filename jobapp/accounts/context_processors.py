@@ -0,0 +1,3 @@
+def user_type(request):
+    """Make the current user's role available to every template as user_type"""
+    return {'user_type': getattr(request, 'user_type', None)}
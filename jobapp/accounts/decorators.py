@@ -17,20 +17,16 @@ def user_type_required(user_type):
         @wraps(view_func)
         @login_required
         def wrapper(request, *args, **kwargs):
-            try:
-                profile = request.user.userprofile
-                if profile.user_type != user_type:
-                    # Redirect to appropriate dashboard based on user type
-                    if profile.user_type == 'applicant':
-                        return redirect('applicants:dashboard')
-                    elif profile.user_type == 'recruiter':
-                        return redirect('recruiters:dashboard')
-                    else:
-                        return redirect('home.index')
+            current = request.user_type
+            if current == user_type:
                 return view_func(request, *args, **kwargs)
-            except:
-                # If user doesn't have a profile, redirect to home
-                return redirect('home.index')
+            # Redirect to appropriate dashboard based on user type
+            if current == 'applicant':
+                return redirect('applicants:dashboard')
+            elif current == 'recruiter':
+                return redirect('recruiters:dashboard')
+            # No profile: send them home
+            return redirect('home.index')
         return wrapper
     return decorator
 
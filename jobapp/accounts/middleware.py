@@ -0,0 +1,16 @@
+from .roles import get_user_type
+
+
+class UserTypeMiddleware:
+    """
+    Expose the current user's role as request.user_type.
+
+    Must come after AuthenticationMiddleware. Anonymous users get None.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user_type = get_user_type(request)
+        return self.get_response(request)
@@ -0,0 +1,23 @@
+"""
+Request-scoped user role (applicant/recruiter).
+
+The role is read from the user's UserProfile, which ProfileModelBackend
+joins into the query that loads request.user, so it costs no query of its
+own and a changed role shows on the next request in every process.
+"""
+from django.core.exceptions import ObjectDoesNotExist
+
+
+def load_user_type(user):
+    """Role from the user's profile (joined by ProfileModelBackend), or None"""
+    try:
+        return user.userprofile.user_type
+    except ObjectDoesNotExist:
+        return None
+
+
+def get_user_type(request):
+    """Current user's role, or None for anonymous users and users without a profile"""
+    if not request.user.is_authenticated:
+        return None
+    return load_user_type(request.user)
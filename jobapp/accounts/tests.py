@@ -1,3 +1,37 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from perf.testing import PASSWORD, make_applicant, make_recruiter
+from .backends import ProfileModelBackend
+from .models import UserProfile
+from .roles import load_user_type
+
+
+class UserRoleTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+
+    def test_role_comes_with_the_user(self):
+        user = ProfileModelBackend().get_user(self.recruiter.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(load_user_type(user), 'recruiter')
+
+    def test_role_changes_show_on_the_next_request(self):
+        self.client.login(username='recruiter', password=PASSWORD)
+        self.assertEqual(self.client.get(reverse('home.index')).context['user_type'], 'recruiter')
+        # Even a write that skips signals and caches is seen straight away
+        UserProfile.objects.filter(user=self.recruiter).update(user_type='applicant')
+        self.assertEqual(self.client.get(reverse('home.index')).context['user_type'], 'applicant')
+        response = self.client.get(reverse('recruiters:dashboard'))
+        self.assertRedirects(response, reverse('applicants:dashboard'), fetch_redirect_response=False)
+
+    def test_users_without_a_profile(self):
+        applicant = make_applicant('applicant')
+        UserProfile.objects.filter(user=applicant).delete()
+        self.client.force_login(applicant)
+        self.assertIsNone(self.client.get(reverse('home.index')).context['user_type'])
+        response = self.client.get(reverse('applicants:dashboard'))
+        self.assertRedirects(response, reverse('home.index'), fetch_redirect_response=False)
+        self.assertIsNone(load_user_type(get_user_model().objects.get(pk=applicant.pk)))
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from django.contrib.auth import login as auth_login, authenticate, logout as auth_logout
 from .forms import CustomUserCreationForm, CustomErrorList
+from .roles import load_user_type
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
 @login_required
@@ -42,12 +43,9 @@ def login(request):
         else:
             auth_login(request, user)
             # Redirect to appropriate dashboard based on user type
-            try:
-                profile = user.userprofile
-                if profile.user_type == 'applicant':
-                    return redirect('applicants:dashboard')
-                elif profile.user_type == 'recruiter':
-                    return redirect('recruiters:dashboard')
-            except:
-                pass
+            user_type = load_user_type(user)
+            if user_type == 'applicant':
+                return redirect('applicants:dashboard')
+            elif user_type == 'recruiter':
+                return redirect('recruiters:dashboard')
             return redirect('home.index')
\ No newline at end of file
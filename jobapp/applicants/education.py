@@ -0,0 +1,54 @@
+import re
+
+# Ordered education levels; higher values are more advanced
+NO_EDUCATION = 0
+HIGH_SCHOOL = 1
+ASSOCIATE = 2
+BACHELOR = 3
+MASTER = 4
+DOCTORATE = 5
+
+EDUCATION_LEVEL_CHOICES = [
+    (NO_EDUCATION, 'None listed'),
+    (HIGH_SCHOOL, 'High School'),
+    (ASSOCIATE, 'Associate Degree'),
+    (BACHELOR, "Bachelor's Degree"),
+    (MASTER, "Master's Degree"),
+    (DOCTORATE, 'Doctorate'),
+]
+
+# Candidate search form keys -> minimum level
+EDUCATION_FILTER_LEVELS = {
+    'high_school': HIGH_SCHOOL,
+    'associate': ASSOCIATE,
+    'bachelor': BACHELOR,
+    'master': MASTER,
+    'phd': DOCTORATE,
+}
+
+# Checked highest level first; degree text is lowercased and stripped before
+# matching. Abbreviations that are also words only count dotted ("a.s.") or
+# as the whole field ("AS"), so "Same as above" is not an associate degree.
+DEGREE_PATTERNS = [
+    (DOCTORATE, re.compile(r"\b(ph\.?\s?d|doctor\w*|d\.?phil|ed\.?d|m\.?d|j\.?d|pharm\.?d|dds|dmd)\b")),
+    (MASTER, re.compile(r"\b(master\w*|m\.?s|m\.?sc|m\.?a|mba|m\.?eng|mfa|mph|m\.?ed|llm)\b")),
+    (BACHELOR, re.compile(r"\b(bachelor\w*|b\.?s|b\.?sc|b\.?a|bba|b\.?eng|bfa|undergrad\w*)\b")),
+    # Postgraduate diplomas and certificates follow a first degree
+    (BACHELOR, re.compile(r"\b(post-?\s?graduate|graduate (diploma|certificate))\b")),
+    (ASSOCIATE, re.compile(r"\b(associate\w*|aas?|a\.\s?a(\.\s?s)?|a\.\s?s)\b|^as$")),
+    (HIGH_SCHOOL, re.compile(r"\b(high school|secondary|ged|diploma)\b")),
+]
+
+
+def degree_level(degree):
+    """Map free-text degree (e.g. "B.S. Computer Science") to an education level"""
+    text = (degree or '').strip().lower()
+    for level, pattern in DEGREE_PATTERNS:
+        if pattern.search(text):
+            return level
+    return NO_EDUCATION
+
+
+def highest_education_level(degrees):
+    """Highest education level across a profile's degree strings"""
+    return max((degree_level(degree) for degree in degrees), default=NO_EDUCATION)
@@ -0,0 +1,56 @@
+from datetime import date
+
+DAYS_PER_MONTH = 365.25 / 12
+
+# Candidate search buckets as half-open month ranges [low, high)
+EXPERIENCE_BUCKETS = {
+    '0-2': (0, 36),
+    '3-5': (36, 72),
+    '6-10': (72, 120),
+    '10+': (120, None),
+}
+
+
+def total_experience_months(periods, today=None):
+    """
+    Total months of work experience from (start_date, end_date, is_current) rows.
+
+    Overlapping or back-to-back roles are merged so concurrent jobs are not
+    double counted. Current roles, and roles without an end date, run until
+    today.
+    """
+    today = today or date.today()
+    intervals = []
+    for start, end, is_current in periods:
+        if start is None:
+            continue
+        if is_current or end is None or end > today:
+            end = today
+        if end > start:
+            intervals.append((start, end))
+    intervals.sort()
+
+    total_days = 0
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_days += (current_end - current_start).days
+            current_start, current_end = start, end
+        elif end > current_end:
+            current_end = end
+    if current_end is not None:
+        total_days += (current_end - current_start).days
+    # Rounded: whole years come out as 12 months a year whatever the leap days
+    return round(total_days / DAYS_PER_MONTH)
+
+
+def experience_bucket_filter(bucket):
+    """Queryset filter kwargs for an experience bucket key, or None if unknown"""
+    if bucket not in EXPERIENCE_BUCKETS:
+        return None
+    low, high = EXPERIENCE_BUCKETS[bucket]
+    filters = {'experience_months__gte': low}
+    if high is not None:
+        filters['experience_months__lt'] = high
+    return filters
@@ -0,0 +1,62 @@
+import os
+from multiprocessing import Pool
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+from applicants.models import ApplicantProfile
+from applicants.recommendations import build_job_pool, compute_recommendations, save_recommendations
+
+# Per-worker state, set by _init_worker
+_job_pool = None
+_limit = None
+
+
+def _init_worker(job_pool, limit):
+    global _job_pool, _limit
+    if not apps.ready:
+        # Spawned (rather than forked) workers start without Django configured
+        django.setup()
+    _job_pool = job_pool
+    _limit = limit
+
+
+def _recommend_chunk(profile_ids):
+    return compute_recommendations(_job_pool, profile_ids, _limit)
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild precomputed job recommendations for every applicant. Scoring is '
+        'split across a process pool; results are written by this process.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--chunk-size', type=int, default=500, help='Applicants per worker task')
+        parser.add_argument('--limit', type=int, default=None, help='Recommendations kept per user')
+
+    def handle(self, *args, **options):
+        job_pool = build_job_pool()
+        profile_ids = list(ApplicantProfile.objects.order_by('pk').values_list('pk', flat=True))
+        chunk_size = options['chunk_size']
+        chunks = [profile_ids[i:i + chunk_size] for i in range(0, len(profile_ids), chunk_size)]
+
+        users = rows = 0
+        if options['processes'] <= 1 or len(chunks) <= 1:
+            results = (compute_recommendations(job_pool, chunk, options['limit']) for chunk in chunks)
+            for result in results:
+                users += len(result)
+                rows += save_recommendations(result)
+        else:
+            # Forked workers must not share the parent's database connection
+            connections.close_all()
+            with Pool(options['processes'], _init_worker, (job_pool, options['limit'])) as pool:
+                for result in pool.imap_unordered(_recommend_chunk, chunks):
+                    users += len(result)
+                    rows += save_recommendations(result)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {rows} recommendations for {users} applicants across {len(job_pool)} active jobs'
+        ))
@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from applicants.models import ApplicantProfile
+from jobapp.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalculate total experience months for applicant profiles. '
+        'Run with --current-only on a schedule (e.g. daily cron) to keep '
+        'profiles with ongoing roles up to date.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--current-only', action='store_true',
+            help='Only refresh profiles with a current role that are out of date'
+        )
+        parser.add_argument(
+            '--stale-days', type=int, default=1,
+            help='With --current-only, refresh profiles calculated at least this many days ago'
+        )
+
+    def handle(self, *args, **options):
+        today = date.today()
+        profiles = ApplicantProfile.objects.all()
+        if options['current_only']:
+            cutoff = today - timedelta(days=options['stale_days'] - 1)
+            profiles = profiles.filter(
+                Q(work_experience__is_current=True) | Q(work_experience__end_date__isnull=True)
+            ).filter(
+                Q(experience_updated_on__isnull=True) | Q(experience_updated_on__lt=cutoff)
+            ).distinct()
+
+        batch_size = options['batch_size']
+        profile_ids = list(profiles.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+        for i in range(0, len(profile_ids), batch_size):
+            updated += ApplicantProfile.refresh_experience_for(profile_ids[i:i + batch_size], today)
+        if updated:
+            # bulk_update sends no signals: invalidate experience searches and match rankings here
+            bump_version('profiles')
+
+        self.stdout.write(self.style.SUCCESS(f'Recalculated experience for {updated} profiles'))
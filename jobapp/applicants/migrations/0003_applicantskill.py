@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0002_applicantprofile_city_applicantprofile_country_and_more'),
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='applicants.applicantprofile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applicant_links', to='skills.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'applicant'], name='applicants_skill_applicant_idx')],
+                'unique_together': {('applicant', 'skill')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0003_applicantskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='experience_months',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Total months of work experience (auto-calculated, overlaps merged)'),
+        ),
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='experience_updated_on',
+            field=models.DateField(blank=True, help_text='Date experience_months was last calculated', null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:36
+
+from django.db import migrations, models
+
+from applicants.education import highest_education_level
+
+
+def backfill_education_level(apps, schema_editor):
+    ApplicantProfile = apps.get_model('applicants', 'ApplicantProfile')
+    Education = apps.get_model('applicants', 'Education')
+    degrees = {}
+    for applicant_id, degree in Education.objects.values_list('applicant_id', 'degree'):
+        degrees.setdefault(applicant_id, []).append(degree)
+    profiles = [
+        ApplicantProfile(pk=applicant_id, education_level=highest_education_level(values))
+        for applicant_id, values in degrees.items()
+    ]
+    ApplicantProfile.objects.bulk_update(profiles, ['education_level'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0004_applicantprofile_experience_months'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='education_level',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'None listed'), (1, 'High School'), (2, 'Associate Degree'), (3, "Bachelor's Degree"), (4, "Master's Degree"), (5, 'Doctorate')], db_index=True, default=0, help_text='Highest education level (auto-calculated from education records)'),
+        ),
+        migrations.RunPython(backfill_education_level, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0005_applicantprofile_education_level'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(fields=['latitude', 'longitude'], name='applicants_profile_latlng_idx'),
+        ),
+    ]
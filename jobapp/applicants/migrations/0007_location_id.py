@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0006_applicantprofile_latlng_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='location_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Canonical location id', max_length=100),
+        ),
+    ]
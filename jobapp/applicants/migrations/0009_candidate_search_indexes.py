@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0008_jobrecommendation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-updated_at', '-id'], name='applicants_public_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(condition=models.Q(('is_public', True), ('is_seeking_jobs', True)), fields=['-updated_at', '-id'], name='applicants_seeking_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['remote_work_preference', '-updated_at', '-id'], name='applicants_public_remote_idx'),
+        ),
+    ]
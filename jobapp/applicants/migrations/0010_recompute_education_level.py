@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from applicants.education import highest_education_level
+
+
+def recompute_education_level(apps, schema_editor):
+    """Re-derive levels with the anchored degree patterns ("Same as above" was an associate degree)"""
+    ApplicantProfile = apps.get_model('applicants', 'ApplicantProfile')
+    Education = apps.get_model('applicants', 'Education')
+    degrees = {}
+    for applicant_id, degree in Education.objects.values_list('applicant_id', 'degree'):
+        degrees.setdefault(applicant_id, []).append(degree)
+    profiles = [
+        ApplicantProfile(pk=applicant_id, education_level=highest_education_level(values))
+        for applicant_id, values in degrees.items()
+    ]
+    ApplicantProfile.objects.bulk_update(profiles, ['education_level'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0009_candidate_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_education_level, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.contrib import admin
+from skills.models import Skill
+from skills.utils import split_skills, get_or_create_skills, sync_skill_links
+from geo.gazetteer import apply_geocode
+from .experience import total_experience_months
+from .education import EDUCATION_LEVEL_CHOICES, NO_EDUCATION, highest_education_level
+from datetime import date
 
 class ApplicantProfile(models.Model):
     """Extended profile for job applicants with professional information"""
@@ -33,6 +39,9 @@ class ApplicantProfile(models.Model):
         help_text="Longitude coordinate (auto-populated if possible)"
     )
 
+    # Canonical gazetteer place (e.g. "us-ca-san-francisco"), auto-populated on save
+    location_id = models.CharField(max_length=100, blank=True, db_index=True, help_text="Canonical location id")
+
     # Display location (for backward compatibility and display)
     location = models.CharField(max_length=200, blank=True, help_text="Full location display (auto-generated)")
 
@@ -68,6 +77,22 @@ class ApplicantProfile(models.Model):
     portfolio_url = models.URLField(blank=True, help_text="Your portfolio or personal website URL")
     other_url = models.URLField(blank=True, help_text="Any other relevant professional URL")
 
+    # Total work experience, materialized from WorkExperience for indexed filtering
+    experience_months = models.PositiveIntegerField(
+        default=0, db_index=True,
+        help_text="Total months of work experience (auto-calculated, overlaps merged)"
+    )
+    experience_updated_on = models.DateField(
+        null=True, blank=True,
+        help_text="Date experience_months was last calculated"
+    )
+
+    # Highest education level, materialized from Education for indexed filtering
+    education_level = models.PositiveSmallIntegerField(
+        choices=EDUCATION_LEVEL_CHOICES, default=NO_EDUCATION, db_index=True,
+        help_text="Highest education level (auto-calculated from education records)"
+    )
+
     # Profile visibility and status
     is_public = models.BooleanField(default=True, help_text="Make profile visible to recruiters")
     is_seeking_jobs = models.BooleanField(default=True, help_text="Currently looking for job opportunities")
@@ -81,9 +106,7 @@ class ApplicantProfile(models.Model):
 
     def get_skills_list(self):
         """Return skills as a list"""
-        if self.skills:
-            return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
-        return []
+        return split_skills(self.skills)
 
     def set_skills_list(self, skills_list):
         """Set skills from a list"""
@@ -119,15 +142,95 @@ class ApplicantProfile(models.Model):
             return (float(self.latitude), float(self.longitude))
         return None
 
+    @classmethod
+    def refresh_experience_for(cls, profile_ids, today=None):
+        """Recalculate experience_months for the given profile ids, returns profiles updated"""
+        today = today or date.today()
+        profile_ids = list(profile_ids)
+        periods = {profile_id: [] for profile_id in profile_ids}
+        rows = WorkExperience.objects.filter(applicant_id__in=profile_ids).values_list(
+            'applicant_id', 'start_date', 'end_date', 'is_current'
+        )
+        for applicant_id, start_date, end_date, is_current in rows:
+            periods[applicant_id].append((start_date, end_date, is_current))
+
+        profiles = [
+            cls(pk=profile_id, experience_months=total_experience_months(rows, today), experience_updated_on=today)
+            for profile_id, rows in periods.items()
+        ]
+        # bulk_update leaves updated_at alone; this is derived data, not a profile edit
+        return cls.objects.bulk_update(profiles, ['experience_months', 'experience_updated_on'])
+
+    def refresh_experience(self):
+        """Recalculate experience_months from this profile's work experience"""
+        self.refresh_experience_for([self.pk])
+        self.refresh_from_db(fields=['experience_months', 'experience_updated_on'])
+
+    @classmethod
+    def refresh_education_for(cls, profile_ids):
+        """Recalculate education_level for the given profile ids, returns profiles updated"""
+        degrees = {profile_id: [] for profile_id in profile_ids}
+        rows = Education.objects.filter(applicant_id__in=degrees).values_list('applicant_id', 'degree')
+        for applicant_id, degree in rows:
+            degrees[applicant_id].append(degree)
+
+        profiles = [
+            cls(pk=profile_id, education_level=highest_education_level(values))
+            for profile_id, values in degrees.items()
+        ]
+        return cls.objects.bulk_update(profiles, ['education_level'])
+
+    def sync_skills(self):
+        """Mirror the skills text into the indexed ApplicantSkill table"""
+        skills = get_or_create_skills(self.get_skills_list())
+        desired = {skill.pk: {} for skill in skills.values()}
+        sync_skill_links(self.skill_links, ApplicantSkill, 'applicant', self, desired)
+
     def save(self, *args, **kwargs):
-        """Override save to auto-generate location display"""
+        """Override save to auto-generate location display and coordinates"""
         # Auto-generate location display
         self.location = self.get_full_location()
+        # Canonical location and coordinates from the offline gazetteer
+        apply_geocode(self)
         super().save(*args, **kwargs)
 
     class Meta:
         verbose_name = "Applicant Profile"
         verbose_name_plural = "Applicant Profiles"
+        indexes = [
+            # Bounding-box prefilter for radius searches
+            models.Index(fields=['latitude', 'longitude'], name='applicants_profile_latlng_idx'),
+            # Candidate search only sees public profiles, most recently updated first
+            # (see recruiters.search.CandidateSearch)
+            models.Index(
+                fields=['-updated_at', '-id'], condition=models.Q(is_public=True),
+                name='applicants_public_recent_idx'
+            ),
+            models.Index(
+                fields=['-updated_at', '-id'], condition=models.Q(is_public=True, is_seeking_jobs=True),
+                name='applicants_seeking_recent_idx'
+            ),
+            models.Index(
+                fields=['remote_work_preference', '-updated_at', '-id'], condition=models.Q(is_public=True),
+                name='applicants_public_remote_idx'
+            ),
+        ]
+
+class ApplicantSkill(models.Model):
+    """Normalized link between an applicant profile and a canonical skill"""
+
+    applicant = models.ForeignKey(ApplicantProfile, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='applicant_links')
+
+    def __str__(self):
+        return f"{self.applicant_id} -> {self.skill_id}"
+
+    class Meta:
+        unique_together = ['applicant', 'skill']
+        indexes = [
+            # Skill-first index drives "candidates having all of these skills" lookups
+            models.Index(fields=['skill', 'applicant'], name='applicants_skill_applicant_idx'),
+        ]
 
 class Education(models.Model):
     """Educational background for applicants"""
@@ -186,13 +289,31 @@ class WorkExperience(models.Model):
         verbose_name = "Work Experience"
         verbose_name_plural = "Work Experience Records"
 
+class JobRecommendation(models.Model):
+    """Precomputed job recommendation for an applicant (see applicants/recommendations.py)"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_recommendations')
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField(help_text="Match score between 0 and 1")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.job_id} ({self.score:.2f})"
+
+    class Meta:
+        unique_together = ['user', 'job']
+        indexes = [
+            # The dashboard reads a user's best recommendations straight off this index
+            models.Index(fields=['user', '-score'], name='applicants_rec_user_score_idx'),
+        ]
+
 # Admin registration
 @admin.register(ApplicantProfile)
 class ApplicantProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'headline', 'location', 'is_public', 'is_seeking_jobs', 'created_at']
     list_filter = ['is_public', 'is_seeking_jobs', 'created_at']
     search_fields = ['user__username', 'user__email', 'headline', 'location']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['experience_months', 'experience_updated_on', 'education_level', 'created_at', 'updated_at']
 
 @admin.register(Education)
 class EducationAdmin(admin.ModelAdmin):
@@ -204,4 +325,10 @@ class EducationAdmin(admin.ModelAdmin):
 class WorkExperienceAdmin(admin.ModelAdmin):
     list_display = ['applicant', 'company', 'position', 'start_date', 'end_date', 'is_current']
     list_filter = ['is_current']
-    search_fields = ['company', 'position', 'applicant__user__username']
\ No newline at end of file
+    search_fields = ['company', 'position', 'applicant__user__username']
+
+@admin.register(JobRecommendation)
+class JobRecommendationAdmin(admin.ModelAdmin):
+    list_display = ['user', 'job', 'score', 'created_at']
+    search_fields = ['user__username', 'job__title']
+    raw_id_fields = ['user', 'job']
@@ -0,0 +1,275 @@
+"""
+Precomputed "recommended for you" jobs.
+
+Recommendations use the same factors as recruiter-side matching
+(recruiters/matching.py) plus an application-history factor: how much of
+a job's skill set overlaps with the jobs the applicant already applied to.
+
+Two paths keep the JobRecommendation table filled:
+
+* build_recommendations (management command) scores every applicant
+  against a JobPool of all active jobs, split across a process pool.
+* recommend_job() scores a single new or edited job against every
+  applicant and merges it into their existing top lists.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from scipy import sparse
+
+from jobs.models import Job, JobApplication, JobSkill
+from recruiters.matching import (
+    EXPERIENCE_TARGETS, PREFERRED_SKILL_WEIGHT, REMOTE_COMPATIBILITY, REMOTE_PREFERENCES,
+    distances_miles, experience_fit, get_candidate_pool, location_fit, score_candidates, weighted_score,
+)
+from .models import ApplicantProfile, ApplicantSkill, JobRecommendation
+
+HISTORY_WEIGHT = 0.2
+
+# Scores below this are not worth showing
+MIN_SCORE = 0.3
+
+# Users (or evicted rows) per query, well under SQLite's parameter limit
+STATS_BATCH_SIZE = 500
+
+REMOTE_TYPES = list(REMOTE_COMPATIBILITY)
+# remote type code x preference code
+REMOTE_MATRIX = np.stack([REMOTE_COMPATIBILITY[remote_type] for remote_type in REMOTE_TYPES])
+
+
+def recommendations_per_user():
+    return getattr(settings, 'RECOMMENDATIONS_PER_USER', 20)
+
+
+def combined_score(match, history):
+    return (1 - HISTORY_WEIGHT) * match + HISTORY_WEIGHT * history
+
+
+@dataclass
+class JobPool:
+    """Column-oriented snapshot of all active jobs"""
+
+    job_ids: np.ndarray
+    skills: sparse.csc_matrix
+    skill_totals: np.ndarray
+    remote_type: np.ndarray
+    experience_low: np.ndarray
+    experience_high: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def skill_overlap(self, skill_ids):
+        """Weighted fraction of each job's skills found in skill_ids"""
+        columns = [skill_id for skill_id in skill_ids if skill_id < self.skills.shape[1]]
+        if not columns:
+            return np.zeros(len(self), dtype=np.float32)
+        found = np.asarray(self.skills[:, columns].sum(axis=1)).ravel()
+        return np.divide(found, self.skill_totals, out=np.zeros(len(self), dtype=np.float32), where=self.skill_totals > 0)
+
+
+def build_job_pool():
+    """Load all active jobs into NumPy/SciPy structures (two queries)"""
+    rows = list(
+        Job.objects.filter(is_active=True).order_by('pk').values_list(
+            'pk', 'remote_type', 'experience_level', 'latitude', 'longitude'
+        )
+    )
+    count = len(rows)
+    remote_codes = {remote_type: i for i, remote_type in enumerate(REMOTE_TYPES)}
+    targets = [EXPERIENCE_TARGETS.get(row[2], EXPERIENCE_TARGETS['mid']) for row in rows]
+
+    job_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+    remote_type = np.fromiter(
+        (remote_codes.get(row[1], remote_codes['onsite']) for row in rows), dtype=np.int8, count=count
+    )
+    experience_low = np.fromiter((low for low, _ in targets), dtype=np.float32, count=count)
+    experience_high = np.fromiter((np.inf if high is None else high for _, high in targets), dtype=np.float32, count=count)
+    latitude = np.fromiter((np.nan if row[3] is None else float(row[3]) for row in rows), dtype=np.float64, count=count)
+    longitude = np.fromiter((np.nan if row[4] is None else float(row[4]) for row in rows), dtype=np.float64, count=count)
+
+    links = list(
+        JobSkill.objects.filter(job__is_active=True).values_list('job_id', 'skill_id', 'is_required')
+    )
+    job_index = np.searchsorted(job_ids, np.array([link[0] for link in links], dtype=np.int64))
+    skill_ids = np.array([link[1] for link in links], dtype=np.int64)
+    weights = np.array([1.0 if link[2] else PREFERRED_SKILL_WEIGHT for link in links], dtype=np.float32)
+    n_skills = int(skill_ids.max()) + 1 if len(links) else 1
+    skills = sparse.csc_matrix((weights, (job_index, skill_ids)), shape=(count, n_skills))
+    skill_totals = np.asarray(skills.sum(axis=1)).ravel().astype(np.float32)
+
+    return JobPool(
+        job_ids, skills, skill_totals, remote_type,
+        experience_low, experience_high, latitude, longitude
+    )
+
+
+def score_jobs(pool, profile, skill_ids, history_skill_ids):
+    """
+    Score every job in pool for one applicant.
+
+    profile is a (remote_work_preference, willing_to_relocate,
+    experience_months, latitude, longitude) tuple.
+    """
+    preference, willing_to_relocate, experience_months, latitude, longitude = profile
+    if preference not in REMOTE_PREFERENCES:
+        preference = 'flexible'
+    if latitude is None or longitude is None:
+        distance = np.full(len(pool), np.nan)
+    else:
+        distance = distances_miles(float(latitude), float(longitude), pool.latitude, pool.longitude)
+
+    factors = {
+        'skills': pool.skill_overlap(skill_ids),
+        'remote': REMOTE_MATRIX[pool.remote_type, REMOTE_PREFERENCES.index(preference)],
+        'location': location_fit(distance, willing_to_relocate, pool.remote_type == REMOTE_TYPES.index('remote')),
+        'experience': experience_fit(experience_months, pool.experience_low, pool.experience_high),
+    }
+    return combined_score(weighted_score(factors), pool.skill_overlap(history_skill_ids))
+
+
+def compute_recommendations(pool, profile_ids, limit=None):
+    """
+    Best jobs for each of the given applicant profiles.
+
+    Returns {user_id: [(job_id, score), ...]} with every profile present,
+    so callers can replace the stored lists wholesale.
+    """
+    limit = limit or recommendations_per_user()
+    profiles = list(
+        ApplicantProfile.objects.filter(pk__in=profile_ids).values_list(
+            'pk', 'user_id', 'remote_work_preference', 'willing_to_relocate',
+            'experience_months', 'latitude', 'longitude'
+        )
+    )
+    skills = {}
+    for applicant_id, skill_id in ApplicantSkill.objects.filter(applicant_id__in=profile_ids).values_list('applicant_id', 'skill_id'):
+        skills.setdefault(applicant_id, []).append(skill_id)
+
+    applied = {}
+    for user_id, job_id in JobApplication.objects.filter(applicant__applicant_profile__in=profile_ids).values_list('applicant_id', 'job_id'):
+        applied.setdefault(user_id, []).append(job_id)
+    job_skills = {}
+    applied_job_ids = {job_id for job_ids in applied.values() for job_id in job_ids}
+    for job_id, skill_id in JobSkill.objects.filter(job_id__in=applied_job_ids).values_list('job_id', 'skill_id'):
+        job_skills.setdefault(job_id, []).append(skill_id)
+
+    results = {}
+    for profile_id, user_id, *profile in profiles:
+        results[user_id] = []
+        if not len(pool):
+            continue
+        history_skill_ids = {
+            skill_id for job_id in applied.get(user_id, []) for skill_id in job_skills.get(job_id, [])
+        }
+        scores = score_jobs(pool, profile, skills.get(profile_id, []), history_skill_ids)
+        # Never recommend jobs the user already applied to
+        scores[np.isin(pool.job_ids, applied.get(user_id, []))] = -1
+
+        k = min(limit, len(pool))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        results[user_id] = [
+            (int(pool.job_ids[i]), float(scores[i])) for i in best if scores[i] >= MIN_SCORE
+        ]
+    return results
+
+
+def save_recommendations(results):
+    """Replace the stored recommendations for every user in results"""
+    rows = [
+        JobRecommendation(user_id=user_id, job_id=job_id, score=score)
+        for user_id, recommendations in results.items()
+        for job_id, score in recommendations
+    ]
+    with transaction.atomic():
+        JobRecommendation.objects.filter(user_id__in=list(results)).delete()
+        JobRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def history_overlap(job, user_ids):
+    """
+    Weighted fraction of job's skills each user has applied for before.
+
+    One aggregate query over applications to other jobs sharing the job's
+    skills; returns an array aligned with user_ids.
+    """
+    weights = dict(
+        (skill_id, 1.0 if is_required else PREFERRED_SKILL_WEIGHT)
+        for skill_id, is_required in JobSkill.objects.filter(job=job).values_list('skill_id', 'is_required')
+    )
+    total = sum(weights.values())
+    if not total:
+        return np.zeros(len(user_ids), dtype=np.float32)
+
+    pairs = JobApplication.objects.filter(
+        job__skill_links__skill_id__in=list(weights)
+    ).exclude(job=job).values_list('applicant_id', 'job__skill_links__skill_id').distinct()
+    found = {}
+    for user_id, skill_id in pairs:
+        found[user_id] = found.get(user_id, 0.0) + weights[skill_id]
+    return np.fromiter((found.get(user_id, 0.0) for user_id in user_ids), dtype=np.float32, count=len(user_ids)) / total
+
+
+def recommend_job(job):
+    """
+    Merge a new or edited job into every applicant's recommendations.
+
+    Scores the job against all applicants in one vectorized pass and only
+    writes rows for users whose top list it makes, evicting their current
+    lowest recommendation when the list is full. Inactive jobs are simply
+    removed from all lists.
+    """
+    limit = recommendations_per_user()
+    with transaction.atomic():
+        JobRecommendation.objects.filter(job=job).delete()
+        if not job.is_active:
+            return 0
+
+        pool = get_candidate_pool(public_only=False)
+        if not len(pool):
+            return 0
+        match, _ = score_candidates(pool, job)
+        scores = combined_score(match, history_overlap(job, pool.user_ids))
+        applied = set(JobApplication.objects.filter(job=job).values_list('applicant_id', flat=True))
+
+        candidates = {
+            int(user_id): float(score)
+            for user_id, score in zip(pool.user_ids, scores)
+            if score >= MIN_SCORE and user_id not in applied
+        }
+        if not candidates:
+            return 0
+
+        # Each list's lowest row, by (score, pk) so tied scores evict one row only
+        lowest = JobRecommendation.objects.filter(user_id=OuterRef('user_id')).order_by('score', 'pk')
+        evict = []
+        user_ids = list(candidates)
+        for i in range(0, len(user_ids), STATS_BATCH_SIZE):
+            stats = JobRecommendation.objects.filter(user_id__in=user_ids[i:i + STATS_BATCH_SIZE]).values(
+                'user_id'
+            ).annotate(
+                count=Count('pk'), lowest_pk=Subquery(lowest.values('pk')[:1]),
+                lowest_score=Subquery(lowest.values('score')[:1]),
+            )
+            for row in stats:
+                if row['count'] < limit:
+                    continue
+                if candidates[row['user_id']] > row['lowest_score']:
+                    evict.append(row['lowest_pk'])
+                else:
+                    del candidates[row['user_id']]
+        for i in range(0, len(evict), STATS_BATCH_SIZE):
+            JobRecommendation.objects.filter(pk__in=evict[i:i + STATS_BATCH_SIZE]).delete()
+
+        JobRecommendation.objects.bulk_create(
+            [JobRecommendation(user_id=user_id, job=job, score=score) for user_id, score in candidates.items()],
+            batch_size=1000
+        )
+    return len(candidates)
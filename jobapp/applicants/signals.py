@@ -0,0 +1,61 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+from jobapp.versions import bump_version
+from jobs.models import JobApplication
+from .models import ApplicantProfile, Education, JobRecommendation, WorkExperience
+
+
+@receiver(post_save, sender=ApplicantProfile)
+def sync_profile_skills(sender, instance, raw=False, **kwargs):
+    """Keep the normalized ApplicantSkill links in sync with the skills text"""
+    if raw:
+        return
+    instance.sync_skills()
+
+
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+def refresh_profile_experience(sender, instance, raw=False, **kwargs):
+    """Recalculate the profile's total experience when a role changes"""
+    if raw:
+        return
+    ApplicantProfile.refresh_experience_for([instance.applicant_id])
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+def refresh_profile_education(sender, instance, raw=False, **kwargs):
+    """Recalculate the profile's highest education level when a record changes"""
+    if raw:
+        return
+    ApplicantProfile.refresh_education_for([instance.applicant_id])
+
+
+@receiver(post_save, sender=ApplicantProfile)
+@receiver(post_delete, sender=ApplicantProfile)
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+def bump_profiles_version(sender, raw=False, **kwargs):
+    """Candidate data changed; invalidate rankings and searches derived from it"""
+    if raw:
+        return
+    bump_version('profiles')
+
+
+@receiver(post_save, sender=User)
+def bump_profiles_version_for_user(sender, update_fields=None, raw=False, **kwargs):
+    """Candidate names are searchable; logins only touch last_login and are ignored"""
+    if raw or (update_fields and set(update_fields) == {'last_login'}):
+        return
+    bump_version('profiles')
+
+
+@receiver(post_save, sender=JobApplication)
+def drop_applied_recommendation(sender, instance, created, raw=False, **kwargs):
+    """Stop recommending a job once the user has applied to it"""
+    if raw or not created:
+        return
+    JobRecommendation.objects.filter(user_id=instance.applicant_id, job_id=instance.job_id).delete()
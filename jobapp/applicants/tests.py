@@ -1,3 +1,221 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from perf.testing import QueryBudgetTestCase, apply_to, make_applicant, make_jobs, make_recruiter
+from recruiters import matching
+from recruiters.search import CandidateSearch
+from .education import (
+    ASSOCIATE, BACHELOR, DOCTORATE, HIGH_SCHOOL, MASTER, NO_EDUCATION, degree_level, highest_education_level,
+)
+from .experience import experience_bucket_filter, total_experience_months
+from .models import ApplicantProfile, Education, JobRecommendation, WorkExperience
+from .recommendations import build_job_pool, compute_recommendations, recommend_job
+
+
+class ApplicantViewQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.applicant = make_applicant('applicant', experience=1, education=1)
+        self.login(self.applicant)
+
+    def test_dashboard(self):
+        recruiter = make_recruiter('recruiter')
+        make_jobs(recruiter, 2)
+        self.assertQueryBudget(reverse('applicants:dashboard'))
+        self.assertQueriesConstant(reverse('applicants:dashboard'), lambda: make_jobs(recruiter, 5, start=2))
+
+    def test_profile(self):
+        self.assertQueryBudget(reverse('applicants:profile'))
+
+
+class ExperienceTests(SimpleTestCase):
+
+    today = date(2025, 1, 1)
+
+    def months(self, *periods):
+        return total_experience_months(periods, self.today)
+
+    def test_separate_roles_add_up(self):
+        self.assertEqual(self.months(
+            (date(2015, 1, 1), date(2016, 1, 1), False),
+            (date(2018, 1, 1), date(2019, 1, 1), False),
+        ), 24)
+
+    def test_overlapping_and_back_to_back_roles_merge(self):
+        self.assertEqual(self.months(
+            (date(2015, 1, 1), date(2017, 1, 1), False),
+            (date(2016, 1, 1), date(2016, 6, 1), False),
+            (date(2016, 6, 1), date(2018, 1, 1), False),
+            (date(2018, 1, 1), date(2019, 1, 1), False),
+        ), 48)
+
+    def test_whole_years_are_twelve_months(self):
+        # 1095 days, 35.97 "average" months: still the 3-5 year bucket
+        self.assertEqual(self.months((date(2017, 1, 1), date(2020, 1, 1), False)), 36)
+
+    def test_open_ended_roles_run_until_today(self):
+        self.assertEqual(self.months((date(2024, 1, 1), None, False)), 12)
+        self.assertEqual(self.months((date(2024, 1, 1), date(2020, 1, 1), True)), 12)
+        self.assertEqual(self.months((date(2024, 1, 1), date(2030, 1, 1), False)), 12)
+
+    def test_unusable_rows_are_ignored(self):
+        self.assertEqual(self.months(
+            (None, date(2020, 1, 1), False),
+            (date(2020, 1, 1), date(2019, 1, 1), False),
+            (date(2031, 1, 1), None, True),
+        ), 0)
+        self.assertEqual(self.months(), 0)
+
+    def test_bucket_edges(self):
+        self.assertEqual(experience_bucket_filter('0-2'), {'experience_months__gte': 0, 'experience_months__lt': 36})
+        self.assertEqual(experience_bucket_filter('3-5'), {'experience_months__gte': 36, 'experience_months__lt': 72})
+        self.assertEqual(experience_bucket_filter('10+'), {'experience_months__gte': 120})
+        self.assertIsNone(experience_bucket_filter('11-20'))
+        self.assertIsNone(experience_bucket_filter(None))
+
+
+class EducationLevelTests(SimpleTestCase):
+
+    LEVELS = {
+        'PhD': DOCTORATE,
+        'Ph. D. Physics': DOCTORATE,
+        'Doctor of Medicine': DOCTORATE,
+        'J.D.': DOCTORATE,
+        'MBA': MASTER,
+        'M.Sc. Statistics': MASTER,
+        "Master's": MASTER,
+        'B.S. Computer Science': BACHELOR,
+        'BS Computer Science': BACHELOR,
+        'Bachelor of Arts': BACHELOR,
+        'Graduate Diploma in Data Science': BACHELOR,
+        'Postgraduate Certificate in Education': BACHELOR,
+        'Associate of Science': ASSOCIATE,
+        'A.S.': ASSOCIATE,
+        'A.A.S. Nursing': ASSOCIATE,
+        'AAS': ASSOCIATE,
+        ' AS ': ASSOCIATE,
+        'High School Diploma': HIGH_SCHOOL,
+        'Diploma': HIGH_SCHOOL,
+        'GED': HIGH_SCHOOL,
+        'Same as above': NO_EDUCATION,
+        'As listed on my resume': NO_EDUCATION,
+        'Coursework': NO_EDUCATION,
+        '': NO_EDUCATION,
+    }
+
+    def test_degree_levels(self):
+        for degree, level in self.LEVELS.items():
+            with self.subTest(degree=degree):
+                self.assertEqual(degree_level(degree), level)
+
+    def test_highest_level(self):
+        self.assertEqual(highest_education_level(['GED', 'Same as above', 'B.A. History']), BACHELOR)
+        self.assertEqual(highest_education_level([]), NO_EDUCATION)
+
+
+class MaterializedExperienceTests(TestCase):
+
+    def test_experience_follows_work_history(self):
+        profile = ApplicantProfile.objects.get(user=make_applicant('applicant'))
+        self.assertEqual(profile.experience_months, 0)
+        role = WorkExperience.objects.create(
+            applicant=profile, position='Engineer', company='Acme',
+            description='Shipped things.', start_date=date(2010, 1, 1), end_date=date(2013, 1, 1)
+        )
+        profile.refresh_from_db()
+        self.assertEqual(profile.experience_months, 36)
+        self.assertEqual(
+            list(ApplicantProfile.objects.filter(**experience_bucket_filter('3-5')).values_list('pk', flat=True)),
+            [profile.pk]
+        )
+        role.delete()
+        profile.refresh_from_db()
+        self.assertEqual(profile.experience_months, 0)
+
+
+    def test_recompute_command_refreshes_cached_searches(self):
+        profile = ApplicantProfile.objects.get(user=make_applicant('applicant', experience=1))
+        WorkExperience.objects.filter(applicant=profile).update(start_date=date(2010, 1, 1), end_date=date(2014, 1, 1))
+        params = QueryDict('experience_years=3-5')
+        self.assertEqual(CandidateSearch().run(params)[0].count, 0)
+
+        call_command('recompute_experience', stdout=StringIO())
+        self.assertEqual(
+            [candidate.pk for candidate in CandidateSearch().run(params)[1]], [profile.pk]
+        )
+
+
+class MaterializedEducationTests(TestCase):
+
+    def test_education_level_follows_education(self):
+        profile = ApplicantProfile.objects.get(user=make_applicant('applicant'))
+        record = Education.objects.create(
+            applicant=profile, institution='State University', degree='Same as above',
+            field_of_study='History', start_date=date(2000, 9, 1)
+        )
+        profile.refresh_from_db()
+        self.assertEqual(profile.education_level, NO_EDUCATION)
+        record.degree = 'M.A.'
+        record.save()
+        profile.refresh_from_db()
+        self.assertEqual(profile.education_level, MASTER)
+
+
+class RecommendationTests(TestCase):
+
+    def setUp(self):
+        matching._pools.clear()
+        self.addCleanup(matching._pools.clear)
+        self.recruiter = make_recruiter('recruiter')
+        self.applicant = make_applicant('applicant', experience=3)
+        self.profile = self.applicant.applicant_profile
+
+    def stored(self, user):
+        return sorted(JobRecommendation.objects.filter(user=user).values_list('job_id', flat=True))
+
+    def test_best_unapplied_jobs_first(self):
+        good, applied = make_jobs(self.recruiter, 2, experience_level='entry')
+        poor, = make_jobs(self.recruiter, 1, start=2, required_skills='Cobol, Fortran', remote_type='remote')
+        apply_to(self.applicant, [applied])
+        results = compute_recommendations(build_job_pool(), [self.profile.pk], limit=5)
+        job_ids = [job_id for job_id, _ in results[self.applicant.pk]]
+        self.assertEqual(job_ids, [good.pk, poor.pk])
+        self.assertGreater(results[self.applicant.pk][0][1], results[self.applicant.pk][1][1])
+
+        results = compute_recommendations(build_job_pool(), [self.profile.pk], limit=1)
+        self.assertEqual(results, {self.applicant.pk: [(good.pk, results[self.applicant.pk][0][1])]})
+
+    @override_settings(RECOMMENDATIONS_PER_USER=2)
+    def test_new_job_evicts_one_lowest_recommendation(self):
+        first, second, job = make_jobs(self.recruiter, 3, experience_level='entry')
+        # Tied lowest scores: only one of them makes way
+        JobRecommendation.objects.bulk_create([
+            JobRecommendation(user=self.applicant, job=first, score=0.31),
+            JobRecommendation(user=self.applicant, job=second, score=0.31),
+        ])
+        self.assertEqual(recommend_job(job), 1)
+        self.assertEqual(self.stored(self.applicant), [second.pk, job.pk])
+
+    @override_settings(RECOMMENDATIONS_PER_USER=2)
+    def test_full_lists_of_better_jobs_are_kept(self):
+        first, second, job = make_jobs(self.recruiter, 3, experience_level='entry')
+        other = make_applicant('other')
+        JobRecommendation.objects.bulk_create([
+            JobRecommendation(user=self.applicant, job=first, score=0.99),
+            JobRecommendation(user=self.applicant, job=second, score=0.99),
+            JobRecommendation(user=other, job=first, score=0.99),
+        ])
+        self.assertEqual(recommend_job(job), 1)
+        self.assertEqual(self.stored(self.applicant), [first.pk, second.pk])
+        self.assertEqual(self.stored(other), [first.pk, job.pk])
+
+        job.is_active = False
+        job.save()
+        self.assertEqual(recommend_job(job), 0)
+        self.assertEqual(self.stored(other), [first.pk])
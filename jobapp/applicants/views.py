@@ -3,26 +3,35 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.forms import inlineformset_factory
 from accounts.decorators import applicant_required
-from .models import ApplicantProfile, Education, WorkExperience
+from perf.queries import query_budget
+from .models import ApplicantProfile, Education, JobRecommendation, WorkExperience
 from .forms import ApplicantProfileForm, EducationForm, WorkExperienceForm
 
+@query_budget(6)
 @applicant_required
 def dashboard(request):
     """Applicant dashboard - shows job search features"""
+    recommendations = JobRecommendation.objects.filter(
+        user=request.user, job__is_active=True
+    ).select_related('job').order_by('-score')[:10]
+
     template_data = {
         'title': 'Job Search Dashboard',
         'user_type': 'applicant'
     }
     return render(request, 'applicants/dashboard.html', {
-        'template_data': template_data
+        'template_data': template_data,
+        'recommendations': recommendations
     })
 
+@query_budget(8)
 @applicant_required
 def profile(request):
     """View applicant profile"""
-    try:
-        profile = request.user.applicant_profile
-    except ApplicantProfile.DoesNotExist:
+    profile = ApplicantProfile.objects.select_related('user').prefetch_related(
+        'education', 'work_experience'
+    ).filter(user=request.user).first()
+    if profile is None:
         # Create profile if it doesn't exist
         profile = ApplicantProfile.objects.create(user=request.user)
 
@@ -0,0 +1,76 @@
+import math
+import re
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
+
+POINT_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*[, ]\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+def parse_point(text):
+    """Parse "lat, lng" text into a (lat, lng) tuple, or None"""
+    match = POINT_RE.match(text or '')
+    if not match:
+        return None
+    lat, lng = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def haversine_miles(lat1, lng1, lat2, lng2):
+    """Great-circle distance in miles between two points"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat, lng, miles):
+    """
+    (min_lat, max_lat, min_lng, max_lng) enclosing a radius around a point.
+
+    The longitude bounds are None when the box reaches a pole or wraps
+    around the antimeridian; callers then only filter on latitude.
+    """
+    lat_delta = miles / MILES_PER_DEGREE_LATITUDE
+    min_lat, max_lat = lat - lat_delta, lat + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), None, None
+    lng_delta = lat_delta / math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    min_lng, max_lng = lng - lng_delta, lng + lng_delta
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def distance_expression(lat, lng, lat_field='latitude', lng_field='longitude'):
+    """ORM expression for the haversine distance in miles from a point to each row"""
+    row_lat = Radians(Cast(F(lat_field), FloatField()))
+    row_lng = Radians(Cast(F(lng_field), FloatField()))
+    point_lat = math.radians(lat)
+    a = (
+        Power(Sin((row_lat - Value(point_lat)) / 2), 2) +
+        Value(math.cos(point_lat)) * Cos(row_lat) *
+        Power(Sin((row_lng - Value(math.radians(lng))) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_MILES) * ASin(Sqrt(a))
+
+
+def within_radius(queryset, lat, lng, miles, lat_field='latitude', lng_field='longitude'):
+    """
+    Rows within miles of a point, annotated with ``distance`` in miles.
+
+    An indexable bounding-box range filter narrows the rows first; the
+    exact haversine distance is only evaluated for rows inside the box.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, miles)
+    queryset = queryset.filter(**{f'{lat_field}__gte': min_lat, f'{lat_field}__lte': max_lat})
+    if min_lng is not None:
+        queryset = queryset.filter(**{f'{lng_field}__gte': min_lng, f'{lng_field}__lte': max_lng})
+    return queryset.annotate(
+        distance=distance_expression(lat, lng, lat_field, lng_field)
+    ).filter(distance__lte=miles)
@@ -0,0 +1,210 @@
+"""
+Offline geocoder backed by the bundled city dataset in geo/data.
+
+The CSV files are loaded once per process into a compact in-memory index
+(coordinates in flat arrays, lookups through dicts keyed by normalized
+names), so geocoding on save never touches the network or the database.
+"""
+import csv
+import re
+import unicodedata
+from array import array
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from django.db.models import Q
+
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+US_ZIP_RE = re.compile(r'^(\d{3})\d{2}(?:-\d{4})?$')
+
+
+class Place(NamedTuple):
+    id: str
+    city: str
+    region: str
+    country: str
+    latitude: float
+    longitude: float
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation, expand "St." to "saint" """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"[.'’]", '', text)
+    text = ' '.join(re.sub(r'[^\w]+', ' ', text).split())
+    return re.sub(r'^st ', 'saint ', text)
+
+
+def slugify_place(*parts):
+    return '-'.join(normalize(part).replace(' ', '-') for part in parts if part)
+
+
+class Gazetteer:
+    """In-memory index over countries, regions and places"""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.countries = {}
+        self.regions = {}
+        self.ids = []
+        self.cities = []
+        self.region_codes = []
+        self.country_codes = []
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.by_city = {}
+        self.by_postal = {}
+        self._load(Path(data_dir))
+
+    def _load(self, data_dir):
+        with open(data_dir / 'countries.csv', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                names = [row['code'], row['name']] + [alias for alias in row['aliases'].split('|') if alias]
+                for name in names:
+                    self.countries[normalize(name)] = row['code']
+
+        with open(data_dir / 'regions.csv', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                for name in (row['code'], row['name']):
+                    self.regions[(row['country_code'], normalize(name))] = row['code']
+
+        with open(data_dir / 'places.csv', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                index = len(self.ids)
+                country, region, city = row['country_code'], row['region_code'], row['name']
+                self.ids.append(slugify_place(country, region, city))
+                self.cities.append(city)
+                self.region_codes.append(region)
+                self.country_codes.append(country)
+                self.latitudes.append(float(row['latitude']))
+                self.longitudes.append(float(row['longitude']))
+
+                names = [city] + [alias for alias in row['aliases'].split('|') if alias]
+                for name in names:
+                    # File order is priority order for ambiguous names (Portland, OR before ME)
+                    self.by_city.setdefault(normalize(name), []).append(index)
+                for prefix in row['postal_prefixes'].split():
+                    self.by_postal.setdefault((country, prefix), index)
+
+    def place(self, index):
+        return Place(
+            self.ids[index], self.cities[index], self.region_codes[index], self.country_codes[index],
+            self.latitudes[index], self.longitudes[index]
+        )
+
+    def country_code(self, country):
+        return self.countries.get(normalize(country))
+
+    def region_code(self, region, country_code=None):
+        key = normalize(region)
+        if country_code:
+            return self.regions.get((country_code, key))
+        for (code, name), region_code in self.regions.items():
+            if name == key:
+                return region_code
+        return None
+
+    def lookup_all(self, city='', state='', country='', postal_code=''):
+        """Every place matching structured address parts, best first"""
+        country_code = None
+        if country:
+            country_code = self.country_code(country)
+            if country_code is None:
+                return []
+        region_code = self.region_code(state, country_code) if state else None
+
+        places = []
+        for index in self.by_city.get(normalize(city), []) if city else []:
+            if country_code and self.country_codes[index] != country_code:
+                continue
+            if region_code and self.region_codes[index] != region_code:
+                continue
+            places.append(self.place(index))
+        if places:
+            return places
+
+        if postal_code and country_code in (None, 'US'):
+            match = US_ZIP_RE.match(postal_code.strip())
+            if match and ('US', match.group(1)) in self.by_postal:
+                return [self.place(self.by_postal[('US', match.group(1))])]
+        return []
+
+    def lookup(self, city='', state='', country='', postal_code=''):
+        """Best place for structured address parts, or None"""
+        places = self.lookup_all(city, state, country, postal_code)
+        return places[0] if places else None
+
+    def search_all(self, text):
+        """Every place free text such as "Portland" (Oregon or Maine) may mean, best first"""
+        parts = [part.strip() for part in (text or '').split(',') if part.strip()]
+        if not parts:
+            return []
+        if len(parts) == 1:
+            if US_ZIP_RE.match(parts[0]):
+                return self.lookup_all(postal_code=parts[0])
+            return self.lookup_all(city=parts[0])
+        if len(parts) == 2:
+            # Second part may be a region ("Austin, TX") or a country ("Toronto, Canada")
+            if self.country_code(parts[1]) and not self.region_code(parts[1]):
+                return self.lookup_all(city=parts[0], country=parts[1])
+            return self.lookup_all(city=parts[0], state=parts[1]) or self.lookup_all(city=parts[0], country=parts[1])
+        return self.lookup_all(city=parts[0], state=parts[1], country=parts[-1])
+
+    def search(self, text):
+        """Best place for free text such as "Austin, TX", "Toronto, Canada" or "94105" """
+        places = self.search_all(text)
+        return places[0] if places else None
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer():
+    return Gazetteer()
+
+
+def geocode(city='', state='', country='', postal_code=''):
+    """Geocode structured address parts against the bundled gazetteer"""
+    return get_gazetteer().lookup(city, state, country, postal_code)
+
+
+def geocode_text(text):
+    """Geocode a free-text location against the bundled gazetteer"""
+    return get_gazetteer().search(text)
+
+
+def place_filter(text):
+    """
+    Q for rows located at the place free text names, or None when the
+    gazetteer doesn't know it.
+
+    Rows geocoded to any place of that name match ("Portland" is in Oregon
+    and Maine), and so do rows without a location_id whose city matches:
+    they were never geocoded or lie outside the gazetteer.
+    """
+    places = get_gazetteer().search_all(text)
+    if not places:
+        return None
+    return Q(location_id__in=[place.id for place in places]) | Q(location_id='', city__icontains=places[0].city)
+
+
+def apply_geocode(instance):
+    """
+    Fill location_id and coordinates on a model with city/state/country/postal_code.
+
+    Coordinates are only filled in when they are missing or the row moved
+    from one known place to another, so hand-entered coordinates are kept.
+    """
+    place = geocode(instance.city, instance.state, instance.country, instance.postal_code)
+    location_id = place.id if place else ''
+    if place:
+        moved = instance.location_id and location_id != instance.location_id
+        if instance.latitude is None or instance.longitude is None or moved:
+            instance.latitude = Decimal(str(place.latitude))
+            instance.longitude = Decimal(str(place.longitude))
+    elif instance.location_id:
+        # The coordinates belonged to the previous place
+        instance.latitude = instance.longitude = None
+    instance.location_id = location_id
+    return place
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from applicants.models import ApplicantProfile
+from geo.gazetteer import apply_geocode
+from jobapp.versions import bump_version
+from jobs.models import Job
+
+# Data version derived from each model's locations (radius searches, rankings)
+DATA_VERSIONS = {ApplicantProfile: 'profiles', Job: 'jobs'}
+
+
+class Command(BaseCommand):
+    help = 'Fill canonical location ids and coordinates for applicant profiles and jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-geocode every row, not just rows without a location id'
+        )
+
+    def handle(self, *args, **options):
+        for model in (ApplicantProfile, Job):
+            queryset = model.objects.only(
+                'pk', 'city', 'state', 'country', 'postal_code', 'latitude', 'longitude', 'location_id'
+            )
+            if not options['all']:
+                queryset = queryset.filter(location_id='')
+            matched, changed, total = self.geocode(model, queryset, options['batch_size'])
+            if changed:
+                # The bulk writes sent no save signals, so invalidate cached results once here
+                bump_version(DATA_VERSIONS[model])
+            self.stdout.write(
+                self.style.SUCCESS(f'{model._meta.verbose_name_plural}: geocoded {matched} of {total}')
+            )
+
+    def geocode(self, model, queryset, batch_size):
+        matched = changed = total = 0
+        batch = []
+        # Iterate by primary key so updated rows never shift the remaining batches
+        for obj in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            total += 1
+            before = (obj.latitude, obj.longitude, obj.location_id)
+            if apply_geocode(obj):
+                matched += 1
+            if (obj.latitude, obj.longitude, obj.location_id) != before:
+                changed += 1
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                self.write_batch(model, batch)
+                batch = []
+        if batch:
+            self.write_batch(model, batch)
+        return matched, changed, total
+
+    @transaction.atomic
+    def write_batch(self, model, batch):
+        # bulk_update skips save(), so updated_at and the save signals are untouched
+        model.objects.bulk_update(batch, ['latitude', 'longitude', 'location_id'])
@@ -0,0 +1,165 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+
+from applicants.models import ApplicantProfile
+from jobapp.versions import get_version
+from jobs.models import Job
+from perf.testing import make_applicant, make_jobs, make_recruiter
+from recruiters.search import CandidateSearch
+from .distance import bounding_box, haversine_miles, parse_point, within_radius
+from .gazetteer import geocode, geocode_text, get_gazetteer, place_filter
+
+AUSTIN = (30.2672, -97.7431)
+SAN_ANTONIO = (29.4241, -98.4936)
+
+
+class DistanceTests(SimpleTestCase):
+
+    def test_parse_point(self):
+        self.assertEqual(parse_point(' 30.27, -97.74 '), (30.27, -97.74))
+        self.assertEqual(parse_point('30 -97'), (30.0, -97.0))
+        self.assertIsNone(parse_point('91, 0'))
+        self.assertIsNone(parse_point('0, 181'))
+        self.assertIsNone(parse_point('Austin, TX'))
+        self.assertIsNone(parse_point(None))
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_miles(*AUSTIN, *SAN_ANTONIO), 74.0, delta=1)
+        self.assertEqual(haversine_miles(*AUSTIN, *AUSTIN), 0)
+        # Half the Earth's circumference between antipodes
+        self.assertAlmostEqual(haversine_miles(0, 0, 0, 180), 12436.8, delta=1)
+
+    def test_bounding_box_contains_the_circle(self):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(*AUSTIN, 74.5)
+        self.assertTrue(min_lat <= SAN_ANTONIO[0] <= max_lat)
+        self.assertTrue(min_lng <= SAN_ANTONIO[1] <= max_lng)
+        self.assertAlmostEqual(max_lat - AUSTIN[0], 74.5 / 69.0)
+
+    def test_bounding_box_near_poles_and_the_antimeridian(self):
+        self.assertEqual(bounding_box(89.5, 0, 100)[2:], (None, None))
+        self.assertEqual(bounding_box(89.5, 0, 100)[1], 90)
+        self.assertEqual(bounding_box(0, 179.9, 100)[2:], (None, None))
+
+
+class RadiusFilterTests(TestCase):
+
+    def setUp(self):
+        self.austin = make_applicant('austin', city='Austin', state='TX').applicant_profile
+        self.san_antonio = make_applicant('san-antonio', city='San Antonio', state='TX').applicant_profile
+        make_applicant('nowhere', city='', state='', country='')
+
+    def within(self, miles):
+        return list(within_radius(ApplicantProfile.objects.all(), *AUSTIN, miles).order_by('distance'))
+
+    def test_rows_inside_the_radius_with_their_distance(self):
+        self.assertEqual(self.within(10), [self.austin])
+        austin, san_antonio = self.within(100)
+        self.assertEqual((austin, san_antonio), (self.austin, self.san_antonio))
+        self.assertAlmostEqual(austin.distance, 0, places=3)
+        self.assertAlmostEqual(san_antonio.distance, haversine_miles(*AUSTIN, *SAN_ANTONIO), places=3)
+
+
+class GazetteerTests(SimpleTestCase):
+
+    def ids(self, text):
+        return [place.id for place in get_gazetteer().search_all(text)]
+
+    def test_free_text(self):
+        self.assertEqual(geocode_text('Austin, TX').id, 'us-tx-austin')
+        self.assertEqual(geocode_text('  austin ,  texas ').id, 'us-tx-austin')
+        self.assertEqual(geocode_text('NYC').id, 'us-ny-new-york')
+        self.assertEqual(geocode_text('St. Louis, MO').id, 'us-mo-saint-louis')
+        self.assertEqual(geocode_text('Montréal').id, 'ca-qc-montreal')
+        self.assertEqual(geocode_text('Toronto, Canada').id, 'ca-on-toronto')
+        self.assertEqual(geocode_text('Toronto, ON, Canada').id, 'ca-on-toronto')
+        self.assertEqual(geocode_text('94105').id, 'us-ca-san-francisco')
+        self.assertIsNone(geocode_text('Smallville'))
+        self.assertIsNone(geocode_text(''))
+
+    def test_ambiguous_names(self):
+        self.assertEqual(self.ids('Portland'), ['us-or-portland', 'us-me-portland'])
+        self.assertEqual(geocode_text('Portland').id, 'us-or-portland')
+        self.assertEqual(self.ids('Portland, ME'), ['us-me-portland'])
+
+    def test_structured_parts(self):
+        self.assertEqual(geocode('Portland', 'Maine', 'USA').id, 'us-me-portland')
+        self.assertEqual(geocode('', '', '', '78701-1234').id, 'us-tx-austin')
+        self.assertIsNone(geocode('Austin', 'MN', 'United States'))
+
+
+class GeocodeOnSaveTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+
+    def test_location_and_coordinates_are_filled(self):
+        profile = make_applicant('applicant', city='Austin', state='TX').applicant_profile
+        self.assertEqual(profile.location_id, 'us-tx-austin')
+        self.assertEqual((profile.latitude, profile.longitude), (Decimal('30.2672'), Decimal('-97.7431')))
+
+        profile.city, profile.state = 'Smallville', 'KS'
+        profile.save()
+        self.assertEqual((profile.location_id, profile.latitude, profile.longitude), ('', None, None))
+
+    def test_hand_entered_coordinates_are_kept(self):
+        job, = make_jobs(self.recruiter, 1, city='Smallville', state='KS', latitude=39.0, longitude=-98.0)
+        self.assertEqual(job.location_id, '')
+        job.city = 'Austin'
+        job.state = 'TX'
+        job.latitude, job.longitude = Decimal('30.2500'), Decimal('-97.7500')
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual(job.location_id, 'us-tx-austin')
+        self.assertEqual((job.latitude, job.longitude), (Decimal('30.2500'), Decimal('-97.7500')))
+
+        # Moving to another known place replaces them
+        job.city = 'San Antonio'
+        job.save()
+        self.assertEqual((job.latitude, job.longitude), (Decimal('29.4241'), Decimal('-98.4936')))
+
+    def test_place_filter_keeps_rows_the_gazetteer_did_not_place(self):
+        oregon, maine, minnesota, dallas = make_jobs(self.recruiter, 4)
+        for job, (city, state) in zip(
+            (oregon, maine, minnesota, dallas),
+            [('Portland', 'OR'), ('Portland', 'ME'), ('Portland', 'MN'), ('Dallas', 'TX')]
+        ):
+            job.city, job.state = city, state
+            job.save()
+        # Not geocoded yet
+        Job.objects.filter(pk=dallas.pk).update(location_id='')
+
+        def matches(text):
+            return set(Job.objects.filter(place_filter(text)))
+
+        self.assertEqual(matches('Portland'), {oregon, maine, minnesota})
+        self.assertEqual(matches('Portland, ME'), {maine, minnesota})
+        self.assertEqual(matches('Dallas, TX'), {dallas})
+        self.assertIsNone(place_filter('Smallville'))
+
+
+class GeocodeCommandTests(TestCase):
+
+    def test_backfill_refreshes_cached_searches(self):
+        profile = make_applicant('applicant').applicant_profile
+        job, = make_jobs(make_recruiter('recruiter'), 1)
+        # Rows from before geocoding existed
+        for model in (ApplicantProfile, Job):
+            model.objects.update(location_id='', latitude=None, longitude=None)
+        near = QueryDict('near=Austin, TX&radius=25')
+        self.assertEqual(CandidateSearch().run(near)[0].count, 0)
+        jobs_version = get_version('jobs')
+
+        call_command('geocode_locations', stdout=StringIO())
+        self.assertEqual([candidate.pk for candidate in CandidateSearch().run(near)[1]], [profile.pk])
+        self.assertNotEqual(get_version('jobs'), jobs_version)
+        job.refresh_from_db()
+        self.assertEqual(job.location_id, 'us-tx-austin')
+
+        # Nothing left to geocode: cached results stay valid
+        versions = get_version('profiles'), get_version('jobs')
+        call_command('geocode_locations', stdout=StringIO())
+        self.assertEqual((get_version('profiles'), get_version('jobs')), versions)
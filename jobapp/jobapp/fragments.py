@@ -0,0 +1,49 @@
+"""
+Per-object template fragment cache.
+
+List pages render each card (job, candidate) through its own small
+template. render_cached_fragments() fetches every card on a page with one
+cache get_many, renders only the missing ones and stores them with one
+set_many. Callers key each card by everything it shows that can change:
+normally pk and updated_at, plus display values such as "posted 3 days
+ago" that move on their own.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+
+def get_fragment_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def fragment_key(template_name, *parts):
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'fragment:{template_name}:{digest}'
+
+
+def render_cached_fragments(template_name, objects, context_name, key_parts):
+    """
+    Render template_name once per object, reusing cached HTML.
+
+    key_parts(obj) returns the values the fragment depends on. Returns the
+    HTML for each object, in order.
+    """
+    objects = list(objects)
+    keys = [fragment_key(template_name, *key_parts(obj)) for obj in objects]
+    cache = get_fragment_cache()
+    cached = cache.get_many(keys)
+
+    missing = {}
+    template = None
+    for key, obj in zip(keys, objects):
+        if key not in cached and key not in missing:
+            template = template or get_template(template_name)
+            missing[key] = template.render({context_name: obj})
+    if missing:
+        cache.set_many(missing, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 86400))
+        cached.update(missing)
+    return [mark_safe(cached[key]) for key in keys]
@@ -0,0 +1,206 @@
+"""
+Keyset (cursor) pagination for the job and candidate listings.
+
+Pages are fetched with ``WHERE (ordering columns) after <cursor>`` instead of
+OFFSET, so deep pages cost the same as the first one as long as the ordering
+is backed by an index. Cursors are opaque signed tokens.
+"""
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_SALT = 'jobapp.pagination.cursor'
+
+COUNT_EXACT = 'exact'
+COUNT_CAPPED = 'capped'
+COUNT_APPROXIMATE = 'approximate'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    """One page of results plus the tokens needed to move around it"""
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginate a queryset by keyset on ``ordering``.
+
+    ordering is a sequence of field names (``-`` prefix for descending) that
+    must end with a unique field such as ``id``; annotations are allowed. The
+    ordering columns must not contain NULLs.
+
+    count_mode controls how the total is reported: ``exact`` runs a single
+    COUNT, ``capped`` stops counting at count_cap (shown as "1000+"), and
+    ``approximate`` caches the exact count for count_timeout seconds.
+    """
+
+    def __init__(self, queryset, per_page, ordering, count_mode=None, count_cap=None, count_timeout=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.count_mode = count_mode or getattr(settings, 'LISTING_COUNT_MODE', COUNT_EXACT)
+        self.count_cap = count_cap or getattr(settings, 'LISTING_COUNT_CAP', 1000)
+        self.count_timeout = count_timeout or getattr(settings, 'LISTING_COUNT_CACHE_TIMEOUT', 300)
+        self.fields = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    # Cursor tokens
+
+    def encode_cursor(self, values, backwards=False):
+        return signing.dumps(
+            {'v': values, 'b': backwards}, salt=CURSOR_SALT, compress=True, serializer=CursorSerializer
+        )
+
+    def decode_cursor(self, token):
+        try:
+            data = signing.loads(token, salt=CURSOR_SALT, serializer=CursorSerializer)
+            values = data['v']
+            backwards = bool(data['b'])
+        except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+            raise InvalidCursor(str(e))
+        if len(values) != len(self.fields):
+            raise InvalidCursor('Cursor does not match this ordering')
+        return [self._to_python(name, value) for (name, _), value in zip(self.fields, values)], backwards
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def values_for(self, obj):
+        return [getattr(obj, 'pk' if name == 'id' else name) for name, _ in self.fields]
+
+    # Page fetching
+
+    def _keyset_filter(self, values, backwards):
+        """Rows strictly after values in the ordering (before them if backwards)"""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields, values):
+            lookup = 'gt' if descending == backwards else 'lt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _order_by(self, backwards):
+        if not backwards:
+            return self.ordering
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering)
+
+    def page(self, cursor=None):
+        """Return the page after (or before) cursor; bad cursors fall back to the first page"""
+        values, backwards = None, False
+        if cursor:
+            try:
+                values, backwards = self.decode_cursor(cursor)
+            except InvalidCursor:
+                values, backwards = None, False
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, backwards))
+        rows = list(queryset.order_by(*self._order_by(backwards))[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_next:
+                next_cursor = self.encode_cursor(self.values_for(rows[-1]))
+            if has_previous:
+                previous_cursor = self.encode_cursor(self.values_for(rows[0]), backwards=True)
+        elif values is not None:
+            # Ran off the end of the results (e.g. rows were deleted); offer a way back
+            if backwards:
+                next_cursor = self.encode_cursor(values)
+            else:
+                previous_cursor = self.encode_cursor(values, backwards=True)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    # Counting
+
+    @cached_property
+    def count(self):
+        return self.count_queryset()
+
+    def count_queryset(self):
+        """Count the queryset according to count_mode"""
+        queryset = self.queryset.order_by()
+        if self.count_mode == COUNT_CAPPED:
+            return queryset.values('pk')[:self.count_cap + 1].count()
+        if self.count_mode == COUNT_APPROXIMATE:
+            sql, params = queryset.query.sql_with_params()
+            key = 'listing-count:' + hashlib.md5(f'{sql}{params!r}'.encode()).hexdigest()
+            count = cache.get(key)
+            if count is None:
+                count = queryset.count()
+                cache.set(key, count, self.count_timeout)
+            return count
+        return queryset.count()
+
+    @property
+    def count_is_capped(self):
+        return self.count_mode == COUNT_CAPPED and self.count > self.count_cap
+
+    @property
+    def count_display(self):
+        if self.count_is_capped:
+            return f'{self.count_cap:,}+'
+        return f'{self.count:,}'
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Like DjangoJSONEncoder but keeps full microsecond precision on datetimes"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CursorSerializer:
+    """JSON serializer that understands dates and decimals in cursor values"""
+
+    def dumps(self, obj):
+        return CursorEncoder(separators=(',', ':')).encode(obj).encode('latin-1')
+
+    def loads(self, data):
+        return signing.JSONSerializer().loads(data)
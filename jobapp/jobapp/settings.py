@@ -42,23 +42,40 @@ INSTALLED_APPS = [
     'applicants',
     'recruiters',
     'jobs',
+    'skills',
+    'geo',
+    'searches',
+    'perf',
+    'tasks',
+    'notifications',
 ]
 
 MIDDLEWARE = [
+    'perf.middleware.ProfilingMiddleware',
+    'perf.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.UserTypeMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'perf.middleware.ViewTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'jobapp.urls'
 
+# ProfileModelBackend joins UserProfile when loading request.user; ModelBackend
+# stays listed so sessions created before it was added remain valid
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'perf.templating.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR,
                               'jobapp/templates')],
         'APP_DIRS': True,
@@ -67,6 +84,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.user_type',
             ],
         },
     },
@@ -82,6 +100,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Seconds to wait for a lock. Task workers also open their
+            # transactions IMMEDIATE (see the runworkers command)
+            'timeout': 20,
+        },
     }
 }
 
@@ -128,4 +151,101 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 STATICFILES_DIRS = [
     BASE_DIR / 'jobapp/static/',
-]
\ No newline at end of file
+]
+
+# Listing pagination: report 'exact', 'capped' (e.g. "1,000+") or cached
+# 'approximate' result counts
+LISTING_COUNT_MODE = 'capped'
+LISTING_COUNT_CAP = 1000
+LISTING_COUNT_CACHE_TIMEOUT = 300
+
+# Candidate matching: how often a stale candidate pool may be rebuilt, and
+# how long per-job match lists are cached
+MATCHING_POOL_REFRESH_SECONDS = 60
+MATCHING_CACHE_TIMEOUT = 3600
+
+# Precomputed job recommendations kept per applicant
+RECOMMENDATIONS_PER_USER = 20
+
+# Nearest neighbours kept per job for the "Similar jobs" panel
+SIMILAR_JOBS_PER_JOB = 10
+
+# Data-version counters (jobapp/versions.py) and cached listing searches
+# (searches/cache.py) are files under CACHE_DIR, shared by every process on
+# the host, so a bump from a task worker or management command reaches the web
+# server. Search results larger than SEARCH_CACHE_MAX_RESULTS only cache their
+# count; entries also expire after an hour. Deployments spread over several
+# hosts should point both aliases at a shared cache (e.g. Redis) instead.
+CACHE_DIR = BASE_DIR / 'cache'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'versions',
+        'TIMEOUT': None,
+    },
+    'search': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'search',
+        'TIMEOUT': 3600,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+SEARCH_CACHE_MAX_RESULTS = 1000
+
+# Tests keep every cache alias in local memory
+TEST_RUNNER = 'jobapp.test_runner.TestRunner'
+
+# Anonymous job_list/job_detail responses (jobs/caching.py); entries are also
+# invalidated by the "jobs" data version
+PAGE_CACHE_TIMEOUT = 600
+
+# Rendered job/candidate cards (jobapp/fragments.py)
+FRAGMENT_CACHE_TIMEOUT = 86400
+
+# Per-request SQL accounting (perf/middleware.py): warn when a view runs more
+# queries than its @query_budget
+QUERY_BUDGET_WARNINGS = DEBUG
+
+# Request profiling (perf/middleware.py): Server-Timing headers, rolling
+# per-view latency percentiles at /__perf__/ and signed ?__profile= captures.
+# Template rendering and session time are measured by the perf template
+# backend and session store.
+PERF_PROFILING = DEBUG
+PERF_HISTOGRAM_WINDOW = 600
+PERF_PROFILE_TOKEN_MAX_AGE = 300
+SESSION_ENGINE = 'perf.sessions'
+
+# Query log (perf/querylog.py): statements slower than SLOW_QUERY_MS are logged
+# with their EXPLAIN plan; per-fingerprint statistics are written to
+# QueryFingerprint in batches (see the slow_queries command)
+QUERY_LOG_ENABLED = True
+SLOW_QUERY_MS = 100
+# Debugging only: log and store slow statements with their parameters, which
+# can include password hashes, e-mail addresses and profile text
+SLOW_QUERY_LOG_PARAMS = False
+QUERY_STATS_FLUSH_SIZE = 500
+QUERY_STATS_FLUSH_SECONDS = 60
+
+# Background tasks (tasks/queue.py), run by `manage.py runworkers`, which must
+# be running next to the web server (see README.md): without it recommendation
+# and similar-job refreshes and notification emails just queue up. With
+# TASKS_EAGER they run inline when queued instead, without a worker
+TASKS_EAGER = False
+TASK_BATCH_SIZE = 10
+TASK_LEASE_SECONDS = 300
+TASK_POLL_SECONDS = 1.0
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_BACKOFF_SECONDS = 10
+TASK_RETRY_BACKOFF_MAX_SECONDS = 3600
+
+# Notification emails (notifications/delivery.py): application events are
+# collected for NOTIFICATION_DELAY_SECONDS, then mailed by a background task,
+# one email per recipient and one mail server connection per batch
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'Job Board <noreply@localhost>'
+SITE_URL = 'http://localhost:8000'
+NOTIFICATION_DELAY_SECONDS = 60
+NOTIFICATION_BATCH_SIZE = 500
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from perf.querylog import query_log
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that keeps every cache alias in local memory.
+
+    The shared file-based caches would otherwise leak data versions and
+    search results between test runs and into the development server.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        local_caches = {
+            alias: {**config, 'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+            for alias, config in settings.CACHES.items()
+        }
+        self.local_caches = override_settings(CACHES=local_caches)
+        self.local_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        # Statistics of test queries belong to the test database, which is gone by now
+        query_log.take_pending(force=True)
+        self.local_caches.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,165 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import CacheHandler, cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.views import job_card_key
+from perf.testing import make_applicant, make_jobs, make_recruiter
+from recruiters.views import candidate_card_key
+from .fragments import fragment_key, render_cached_fragments
+from .pagination import COUNT_APPROXIMATE, COUNT_CAPPED, COUNT_EXACT, CursorPaginator, InvalidCursor
+from .versions import bump_version, get_version, get_version_cache
+
+ORDERING = ('-created_at', '-id')
+
+
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter('recruiter')
+        self.jobs = make_jobs(self.recruiter, 7)
+        # Two jobs share a timestamp so the id tie-breaker matters
+        now = timezone.now()
+        for i, job in enumerate(self.jobs):
+            Job.objects.filter(pk=job.pk).update(created_at=now - timedelta(microseconds=i // 2))
+        self.expected = list(Job.objects.order_by(*ORDERING).values_list('pk', flat=True))
+
+    def paginator(self, **kwargs):
+        return CursorPaginator(Job.objects.all(), 3, ORDERING, **kwargs)
+
+    def test_forward_and_back(self):
+        paginator = self.paginator()
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([[job.pk for job in page] for page in pages], [
+            self.expected[:3], self.expected[3:6], self.expected[6:]
+        ])
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+        back = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual([job.pk for job in back], self.expected[3:6])
+        self.assertEqual([job.pk for job in paginator.page(back.previous_cursor)], self.expected[:3])
+
+    def test_tampered_cursors_fall_back_to_the_first_page(self):
+        paginator = self.paginator()
+        token = paginator.page().next_cursor
+        self.assertEqual([job.pk for job in paginator.page(token[:-2] + 'xx')], self.expected[:3])
+        with self.assertRaises(InvalidCursor):
+            paginator.decode_cursor(token[:-2] + 'xx')
+        # A cursor for another ordering isn't accepted either
+        with self.assertRaises(InvalidCursor):
+            CursorPaginator(Job.objects.all(), 3, ('-id',)).decode_cursor(token)
+
+    def test_cursor_values_keep_microseconds(self):
+        paginator = self.paginator()
+        job = Job.objects.order_by(*ORDERING).first()
+        values, backwards = paginator.decode_cursor(paginator.encode_cursor(paginator.values_for(job)))
+        self.assertEqual(values, [job.created_at, job.pk])
+        self.assertFalse(backwards)
+
+    def test_past_the_end_offers_a_way_back(self):
+        paginator = self.paginator()
+        last = paginator.page(paginator.page(paginator.page().next_cursor).next_cursor)
+        cursor = paginator.encode_cursor(paginator.values_for(last.object_list[-1]))
+        page = paginator.page(cursor)
+        self.assertEqual(list(page), [])
+        self.assertEqual([job.pk for job in paginator.page(page.previous_cursor)], self.expected[3:6])
+
+    def test_exact_count(self):
+        paginator = self.paginator(count_mode=COUNT_EXACT)
+        self.assertEqual((paginator.count, paginator.count_display, paginator.count_is_capped), (7, '7', False))
+
+    def test_capped_count(self):
+        paginator = self.paginator(count_mode=COUNT_CAPPED, count_cap=5)
+        self.assertEqual((paginator.count_display, paginator.count_is_capped), ('5+', True))
+        paginator = self.paginator(count_mode=COUNT_CAPPED, count_cap=7)
+        self.assertEqual((paginator.count_display, paginator.count_is_capped), ('7', False))
+
+    def test_approximate_count_is_cached(self):
+        self.assertEqual(self.paginator(count_mode=COUNT_APPROXIMATE).count, 7)
+        make_jobs(self.recruiter, 2, start=7)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.paginator(count_mode=COUNT_APPROXIMATE).count, 7)
+        self.assertEqual(self.paginator(count_mode=COUNT_EXACT).count, 9)
+
+
+class DataVersionTests(SimpleTestCase):
+
+    def setUp(self):
+        self.versions = get_version_cache()
+        self.versions.clear()
+        self.addCleanup(self.versions.clear)
+
+    def test_bumps_change_the_version(self):
+        version = get_version('things')
+        self.assertEqual(get_version('things'), version)
+        self.assertEqual(bump_version('things'), version + 1)
+        self.assertEqual(get_version('things'), version + 1)
+        self.assertEqual(get_version('others'), get_version('others'))
+
+    def test_versions_never_repeat_after_eviction(self):
+        seen = [get_version('things'), bump_version('things'), bump_version('things')]
+        self.versions.clear()
+        self.assertGreater(bump_version('things'), max(seen))
+        self.versions.clear()
+        self.assertGreater(get_version('things'), max(seen))
+
+    def test_bumps_reach_other_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # Each handler stands for another process opening the shared cache
+        shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+        with self.settings(CACHES={**settings.CACHES, 'versions': shared}):
+            version = get_version('things')
+            other = CacheHandler()
+            self.assertEqual(other['versions'].get('data-version:things'), version)
+            other['versions'].incr('data-version:things')
+            self.assertEqual(get_version('things'), version + 1)
+
+
+class FragmentCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.recruiter = make_recruiter('recruiter')
+        self.jobs = make_jobs(self.recruiter, 2)
+
+    def render(self, jobs):
+        return render_cached_fragments('jobs/_job_card.html', jobs, 'job', job_card_key)
+
+    def test_keys(self):
+        self.assertEqual(fragment_key('card.html', 1, 'a'), fragment_key('card.html', 1, 'a'))
+        self.assertNotEqual(fragment_key('card.html', 1, 'a'), fragment_key('card.html', 1, 'b'))
+        self.assertNotEqual(fragment_key('card.html', 1), fragment_key('other.html', 1))
+
+    def test_cards_are_reused_until_the_job_changes(self):
+        first, second = self.jobs
+        cards = self.render([first, second, first])
+        self.assertIn(first.title, cards[0])
+        self.assertEqual(cards[2], cards[0])
+        self.assertIn(second.title, cards[1])
+
+        cache.set(fragment_key('jobs/_job_card.html', *job_card_key(first)), 'cached card')
+        self.assertEqual(self.render([first])[0], 'cached card')
+
+        first.title = 'Rust Developer'
+        first.save()
+        self.assertIn('Rust Developer', self.render([first])[0])
+
+    def test_candidate_keys_follow_the_name_and_distance(self):
+        profile = make_applicant('applicant').applicant_profile
+        key = candidate_card_key(profile)
+        profile.distance = 12.4
+        self.assertNotEqual(candidate_card_key(profile), key)
+        del profile.distance
+        profile.user.first_name = 'Renamed'
+        self.assertNotEqual(candidate_card_key(profile), key)
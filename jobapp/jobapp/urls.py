@@ -24,4 +24,5 @@ urlpatterns = [
     path('applicants/', include('applicants.urls')),
     path('recruiters/', include('recruiters.urls')),
     path('jobs/', include('jobs.urls')),  # Add this line
+    path('__perf__/', include('perf.urls')),
 ]
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Global data-version counters kept in the "versions" cache.
+
+Derived data (match rankings, cached search results) is keyed by these
+versions instead of expiring on a timer; bumping a version on save/delete
+makes every dependent cache entry unreachable at once. The "versions"
+alias must be shared by every process that writes data (web server, task
+workers, management commands), or their bumps go unseen.
+
+Counters start from the current time in microseconds rather than 1, so a
+counter that was evicted (or lost with a restart) comes back above every
+value it had before, and entries keyed by an old version are never served
+again.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_version_cache():
+    return caches[getattr(settings, 'DATA_VERSION_CACHE_ALIAS', 'versions')]
+
+
+def _key(name):
+    return f'data-version:{name}'
+
+
+def _seed():
+    return time.time_ns() // 1000
+
+
+def get_version(name):
+    """Current version number for a named data set"""
+    return get_version_cache().get_or_set(_key(name), _seed, None)
+
+
+def bump_version(name):
+    """Invalidate everything derived from a named data set"""
+    cache = get_version_cache()
+    # A file-based incr is a read and a write: concurrent bumps may both land
+    # on the same number, which still invalidates everything derived before
+    try:
+        return cache.incr(_key(name))
+    except ValueError:
+        # Counter was evicted (or never set); a fresh seed is newer than any old value
+        cache.add(_key(name), _seed(), None)
+        return cache.incr(_key(name))
@@ -0,0 +1,113 @@
+"""
+HTTP caching for the public job pages.
+
+Anonymous visitors (crawlers, aggregators) get the same page for the same
+URL, so their responses carry ETag/Last-Modified validators and are kept
+whole in the page cache. Both are keyed by the "jobs" data version
+(jobapp/versions.py), which any job save or delete bumps. Logged-in users
+see personalized pages (role navigation, "Already Applied") and bypass
+both.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.db.models import Max
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+
+from jobapp.versions import get_version
+from .models import Job
+
+# Response headers replayed from the page cache
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Vary')
+
+
+def get_page_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def is_anonymous(request):
+    return not request.user.is_authenticated
+
+
+def _validators_key(*parts):
+    return 'jobs-validators:' + ':'.join(str(part) for part in parts)
+
+
+def job_list_etag(request):
+    if not is_anonymous(request):
+        return None
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'jobs-{get_version("jobs")}-{digest}'
+
+
+def job_list_last_modified(request):
+    """Newest updated_at among active jobs, computed once per data version"""
+    if not is_anonymous(request):
+        return None
+    return get_page_cache().get_or_set(
+        _validators_key('list', get_version('jobs')),
+        lambda: Job.objects.filter(is_active=True).aggregate(latest=Max('updated_at'))['latest'],
+        None
+    )
+
+
+def job_detail_etag(request, pk):
+    if not is_anonymous(request):
+        return None
+    return f'job-{pk}-{get_version("jobs")}'
+
+
+def job_detail_last_modified(request, pk):
+    if not is_anonymous(request):
+        return None
+    return get_page_cache().get_or_set(
+        _validators_key('detail', pk, get_version('jobs')),
+        lambda: Job.objects.filter(pk=pk, is_active=True).values_list('updated_at', flat=True).first(),
+        None
+    )
+
+
+def cache_anonymous_page(view_func):
+    """
+    Serve anonymous GET/HEAD requests from a full-response cache.
+
+    Requests with pending flash messages are never cached or served from
+    the cache, and only plain 200 responses that set no cookies are stored.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD') or not is_anonymous(request) or
+                len(messages.get_messages(request))):
+            return view_func(request, *args, **kwargs)
+
+        cache = get_page_cache()
+        digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        key = f'page:{view_func.__module__}.{view_func.__name__}:{get_version("jobs")}:{digest}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content)
+            for name, value in headers.items():
+                response[name] = value
+            return response
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming and not response.cookies:
+            headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+            cache.set(key, (response.content, headers), getattr(settings, 'PAGE_CACHE_TIMEOUT', 600))
+        return response
+    return wrapper
+
+
+def anonymous_job_list_cache(view_func):
+    """Conditional GET plus the anonymous page cache for job_list"""
+    return condition(job_list_etag, job_list_last_modified)(cache_anonymous_page(view_func))
+
+
+def anonymous_job_detail_cache(view_func):
+    """Conditional GET plus the anonymous page cache for job_detail"""
+    return condition(job_detail_etag, job_detail_last_modified)(cache_anonymous_page(view_func))
@@ -1,5 +1,6 @@
 from django import forms
 from .models import Job, JobApplication
+from .transitions import target_statuses
 
 class JobForm(forms.ModelForm):
     """Form for creating and editing job postings"""
@@ -203,4 +204,32 @@ class JobApplicationForm(forms.ModelForm):
                 'rows': 6,
                 'placeholder': 'Write a personalized note or cover letter (optional)...'
             })
-        }
\ No newline at end of file
+        }
+
+class ApplicationIdsField(forms.Field):
+    """Checked application ids, as a sorted list of ints"""
+    widget = forms.MultipleHiddenInput
+    
+    def to_python(self, value):
+        try:
+            return sorted({int(pk) for pk in value or []})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Invalid application selection.")
+
+class BulkTransitionForm(forms.Form):
+    """Move the checked applications, or a whole pipeline tab, to a new status"""
+    
+    status = forms.ChoiceField(
+        choices=target_statuses,
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'})
+    )
+    applications = ApplicationIdsField(required=False)
+    select_all = forms.BooleanField(required=False)
+    # The pipeline tab the form was sent from ('' for all statuses)
+    tab = forms.ChoiceField(choices=[('', 'All')] + JobApplication.STATUS_CHOICES, required=False)
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('select_all') and not cleaned_data.get('applications'):
+            raise forms.ValidationError("Select the applications to move.")
+        return cleaned_data
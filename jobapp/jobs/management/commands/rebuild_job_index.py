@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the keyword search index for job postings'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        count = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {count} jobs with {backend.__class__.__name__}')
+        )
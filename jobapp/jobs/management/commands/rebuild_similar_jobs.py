@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from jobs.similarity import rebuild_similar_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the TF-IDF terms and similar-jobs table for every job posting. '
+        'Saving a job keeps it up to date incrementally; run this periodically '
+        'to refresh scores as document frequencies drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = rebuild_similar_jobs(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} similar-job links'))
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_application_counts(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    counts = {}
+    rows = JobApplication.objects.order_by().values_list('job_id', 'status').annotate(total=Count('pk'))
+    for job_id, status, total in rows:
+        counts.setdefault(job_id, {})[f'{status}_count'] = total
+    fields = [
+        'applied_count', 'review_count', 'interview_count', 'offer_count',
+        'accepted_count', 'rejected_count', 'withdrawn_count',
+    ]
+    jobs = [
+        Job(pk=job_id, **{field: job_counts.get(field, 0) for field in fields})
+        for job_id, job_counts in counts.items()
+    ]
+    Job.objects.bulk_update(jobs, fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applied_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='interview_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='offer_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='withdrawn_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-applied_at', '-id'], name='jobs_app_job_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', 'status', '-applied_at', '-id'], name='jobs_app_job_status_idx'),
+        ),
+        migrations.RunPython(backfill_application_counts, migrations.RunPython.noop),
+    ]
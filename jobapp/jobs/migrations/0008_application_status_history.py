@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+
+def backfill_status_history(apps, schema_editor):
+    """
+    Earlier status changes were not recorded, so each application gets its
+    creation and, unless still applied, one move to its current status at
+    updated_at.
+    """
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    ApplicationStatusEvent = apps.get_model('jobs', 'ApplicationStatusEvent')
+    JobApplication.objects.filter(status='applied').update(status_changed_at=F('applied_at'))
+    JobApplication.objects.exclude(status='applied').update(status_changed_at=F('updated_at'))
+
+    rows = JobApplication.objects.order_by('pk').values_list('pk', 'status', 'applied_at', 'updated_at')
+    events = []
+    for pk, status, applied_at, updated_at in rows.iterator(chunk_size=2000):
+        events.append(ApplicationStatusEvent(
+            application_id=pk, from_status='', to_status='applied', created_at=applied_at
+        ))
+        if status != 'applied':
+            events.append(ApplicationStatusEvent(
+                application_id=pk, from_status='applied', to_status=status, created_at=updated_at,
+                stage_seconds=max(0, int((updated_at - applied_at).total_seconds())),
+            ))
+        if len(events) >= 2000:
+            ApplicationStatusEvent.objects.bulk_create(events)
+            events = []
+    ApplicationStatusEvent.objects.bulk_create(events)
+
+    for model_name, owner, path in (
+        ('JobStageTime', 'job_id', 'application__job'),
+        ('RecruiterStageTime', 'recruiter_id', 'application__job__posted_by'),
+    ):
+        StageTime = apps.get_model('jobs', model_name)
+        totals = ApplicationStatusEvent.objects.filter(stage_seconds__isnull=False).order_by().values_list(
+            path, 'from_status'
+        ).annotate(exits=Count('pk'), seconds=Sum('stage_seconds'))
+        StageTime.objects.bulk_create([
+            StageTime(**{owner: owner_id}, status=status, exits=exits, total_seconds=seconds)
+            for owner_id, status, exits, seconds in totals
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_application_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('applied', 'Applied'), ('review', 'Under Review'), ('interview', 'Interview'), ('offer', 'Offer Extended'), ('accepted', 'Offer Accepted'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], max_length=20)),
+                ('to_status', models.CharField(choices=[('applied', 'Applied'), ('review', 'Under Review'), ('interview', 'Interview'), ('offer', 'Offer Extended'), ('accepted', 'Offer Accepted'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('stage_seconds', models.PositiveIntegerField(blank=True, null=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='jobs.jobapplication')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['application', 'created_at', 'id'], name='jobs_event_app_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobStageTime',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('applied', 'Applied'), ('review', 'Under Review'), ('interview', 'Interview'), ('offer', 'Offer Extended'), ('accepted', 'Offer Accepted'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], max_length=20)),
+                ('exits', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.PositiveBigIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_times', to='jobs.job')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'status'), name='jobs_stagetime_job_status_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RecruiterStageTime',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('applied', 'Applied'), ('review', 'Under Review'), ('interview', 'Interview'), ('offer', 'Offer Extended'), ('accepted', 'Offer Accepted'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], max_length=20)),
+                ('exits', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.PositiveBigIntegerField(default=0)),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_times', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('recruiter', 'status'), name='jobs_stagetime_recruiter_status_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_status_history, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,14 @@
-from django.db import models
+from collections import defaultdict
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum
+from django.dispatch import Signal
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from decimal import Decimal
+from geo.gazetteer import apply_geocode
+from skills.models import Skill
+from skills.utils import split_skills, normalize_skill, get_or_create_skills, sync_skill_links
 
 class Job(models.Model):
     """Main job posting model"""
@@ -58,6 +65,10 @@ class Job(models.Model):
     country = models.CharField(max_length=100, default='United States')
     postal_code = models.CharField(max_length=20, blank=True)
     
+    # Coordinates and canonical place, auto-populated from the offline gazetteer
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    location_id = models.CharField(max_length=100, blank=True, db_index=True, help_text="Canonical location id")
     
     # Skills (comma-separated for simplicity)
     required_skills = models.TextField(blank=True, help_text="Required skills, separated by commas")
@@ -73,14 +84,113 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Applications per status, kept in step by JobApplication.save() and deletes
+    # (see adjust_application_counts); never written by Job.save()
+    applied_count = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    interview_count = models.PositiveIntegerField(default=0, editable=False)
+    offer_count = models.PositiveIntegerField(default=0, editable=False)
+    accepted_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+    withdrawn_count = models.PositiveIntegerField(default=0, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Job Posting'
         verbose_name_plural = 'Job Postings'
+        # Listing filters always include is_active and page newest first, so the
+        # hot indexes only cover active jobs (see jobs.search.JobListingSearch)
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_active=True),
+                name='jobs_active_recent_idx'
+            ),
+            models.Index(
+                fields=['remote_type', '-created_at', '-id'], condition=models.Q(is_active=True),
+                name='jobs_active_remote_idx'
+            ),
+            models.Index(
+                fields=['job_type', '-created_at', '-id'], condition=models.Q(is_active=True),
+                name='jobs_active_type_idx'
+            ),
+            models.Index(
+                fields=['experience_level', '-created_at', '-id'], condition=models.Q(is_active=True),
+                name='jobs_active_level_idx'
+            ),
+            models.Index(
+                fields=['salary_min'], condition=models.Q(is_active=True),
+                name='jobs_active_salary_idx'
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_active=True, visa_sponsorship=True),
+                name='jobs_active_visa_idx'
+            ),
+            # Recruiter's own postings, newest first (recruiter_jobs)
+            models.Index(fields=['posted_by', '-created_at', '-id'], name='jobs_posted_by_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.company}"
     
+    def save(self, *args, **kwargs):
+        """Override save to fill canonical location and coordinates"""
+        apply_geocode(self)
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # A job loaded before an application arrived must not overwrite its counters
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in APPLICATION_COUNT_FIELDS.values()
+            ]
+        super().save(*args, **kwargs)
+    
+    @property
+    def application_counts(self):
+        """[(status, label, count)] in pipeline order"""
+        return [
+            (status, label, getattr(self, APPLICATION_COUNT_FIELDS[status]))
+            for status, label in JobApplication.STATUS_CHOICES
+        ]
+    
+    @property
+    def total_applications(self):
+        return sum(getattr(self, field) for field in APPLICATION_COUNT_FIELDS.values())
+    
+    @classmethod
+    def adjust_application_counts(cls, job_id, changes):
+        """Apply {status: delta} to a job's counters in one atomic UPDATE"""
+        updates = {
+            APPLICATION_COUNT_FIELDS[status]: F(APPLICATION_COUNT_FIELDS[status]) + delta
+            for status, delta in changes.items() if delta
+        }
+        if updates:
+            cls.objects.filter(pk=job_id).update(**updates)
+    
+    @classmethod
+    def recount_applications(cls, job_ids=None, batch_size=1000):
+        """Rebuild the counters from JobApplication (after bulk loads or repairs); returns jobs updated"""
+        jobs = cls.objects.order_by('pk')
+        if job_ids is not None:
+            jobs = jobs.filter(pk__in=job_ids)
+        counts = {}
+        applications = JobApplication.objects.order_by().values_list('job_id', 'status').annotate(total=Count('pk'))
+        if job_ids is not None:
+            applications = applications.filter(job_id__in=job_ids)
+        for job_id, status, total in applications:
+            counts.setdefault(job_id, {})[status] = total
+        
+        updated = 0
+        ids = list(jobs.values_list('pk', flat=True))
+        for start in range(0, len(ids), batch_size):
+            batch = [
+                cls(pk=job_id, **{
+                    field: counts.get(job_id, {}).get(status, 0)
+                    for status, field in APPLICATION_COUNT_FIELDS.items()
+                })
+                for job_id in ids[start:start + batch_size]
+            ]
+            updated += cls.objects.bulk_update(batch, list(APPLICATION_COUNT_FIELDS.values()))
+        return updated
+    
     def get_absolute_url(self):
         return reverse('jobs:detail', kwargs={'pk': self.pk})
     
@@ -98,15 +208,74 @@ class Job(models.Model):
     
     def get_required_skills_list(self):
         """Return required skills as a list"""
-        if self.required_skills:
-            return [skill.strip() for skill in self.required_skills.split(',') if skill.strip()]
-        return []
+        return split_skills(self.required_skills)
     
     def get_preferred_skills_list(self):
         """Return preferred skills as a list"""
-        if self.preferred_skills:
-            return [skill.strip() for skill in self.preferred_skills.split(',') if skill.strip()]
-        return []
+        return split_skills(self.preferred_skills)
+    
+    def sync_skills(self):
+        """Mirror required/preferred skills into the indexed JobSkill table"""
+        required = self.get_required_skills_list()
+        preferred = self.get_preferred_skills_list()
+        skills = get_or_create_skills(required + preferred)
+        required_keys = {normalize_skill(name) for name in required}
+        desired = {
+            skill.pk: {'is_required': key in required_keys}
+            for key, skill in skills.items()
+        }
+        sync_skill_links(self.skill_links, JobSkill, 'job', self, desired)
+
+class JobSkill(models.Model):
+    """Normalized link between a job posting and a canonical skill"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+    is_required = models.BooleanField(default=True, help_text="Required (vs. preferred) skill")
+    
+    class Meta:
+        unique_together = ['job', 'skill']
+        indexes = [
+            # Skill-first index drives "jobs having all of these skills" lookups
+            models.Index(fields=['skill', 'job'], name='jobs_jobskill_skill_job_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} -> {self.skill_id}"
+
+class JobTerm(models.Model):
+    """Weighted term count for a job, the postings list behind similar-job lookups"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=50)
+    count = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ['job', 'term']
+        indexes = [
+            # Term-first index drives document frequency and candidate lookups
+            models.Index(fields=['term', 'job'], name='jobs_jobterm_term_job_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id}: {self.term} x{self.count}"
+
+class SimilarJob(models.Model):
+    """Precomputed nearest neighbour of a job by TF-IDF cosine similarity"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='similar_links')
+    similar = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    
+    class Meta:
+        unique_together = ['job', 'similar']
+        indexes = [
+            # job_detail reads a job's best neighbours straight off this index
+            models.Index(fields=['job', '-score'], name='jobs_similarjob_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} ~ {self.similar_id} ({self.score:.2f})"
 
 class JobApplication(models.Model):
     """Track job applications from applicants"""
@@ -121,6 +290,18 @@ class JobApplication(models.Model):
         ('withdrawn', 'Withdrawn'),
     ]
     
+    # Statuses a recruiter can move an application to from each status;
+    # accepted, rejected and withdrawn applications are closed
+    TRANSITIONS = {
+        'applied': ('review', 'interview', 'rejected'),
+        'review': ('interview', 'offer', 'rejected'),
+        'interview': ('review', 'offer', 'rejected'),
+        'offer': ('accepted', 'rejected'),
+        'accepted': (),
+        'rejected': (),
+        'withdrawn': (),
+    }
+    
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_applications')
     
@@ -131,10 +312,205 @@ class JobApplication(models.Model):
     # Timestamps
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # When the application entered its current status
+    status_changed_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         unique_together = ['job', 'applicant']  # Prevent duplicate applications
         ordering = ['-applied_at']
+        indexes = [
+            # An applicant's applications, newest first (my_applications)
+            models.Index(fields=['applicant', '-applied_at'], name='jobs_app_applicant_recent_idx'),
+            # A job's applicant pipeline, all statuses or one tab (job_pipeline)
+            models.Index(fields=['job', '-applied_at', '-id'], name='jobs_app_job_recent_idx'),
+            models.Index(fields=['job', 'status', '-applied_at', '-id'], name='jobs_app_job_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.applicant.username} -> {self.job.title}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as stored, so save() knows which counter to move from and since when
+        instance._stored_status = instance.__dict__.get('status')
+        instance._stored_status_changed_at = instance.__dict__.get('status_changed_at')
+        return instance
+    
+    @classmethod
+    def sources_of(cls, status):
+        """Statuses an application can be moved to status from"""
+        return [source for source, targets in cls.TRANSITIONS.items() if status in targets]
+    
+    def can_transition(self, status):
+        return status in self.TRANSITIONS.get(self.status, ())
+    
+    def save(self, *args, **kwargs):
+        """Save and, in the same transaction, move the job's counters and record the status change"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' not in update_fields:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous, since = None, None
+            if not self._state.adding:
+                if getattr(self, '_stored_status', None):
+                    previous, since = self._stored_status, self._stored_status_changed_at
+                else:
+                    previous, since = JobApplication.objects.filter(pk=self.pk).values_list(
+                        'status', 'status_changed_at'
+                    ).first() or (None, None)
+            changed = previous != self.status
+            now = timezone.now()
+            if changed:
+                self.status_changed_at = now
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'status_changed_at'}
+            super().save(*args, **kwargs)
+            if changed:
+                changes = {self.status: 1}
+                if previous:
+                    changes[previous] = -1
+                Job.adjust_application_counts(self.job_id, changes)
+                ApplicationStatusEvent.record(
+                    self.job_id, self.job.posted_by_id if previous else None,
+                    [(self.pk, previous, self.status, since)], now
+                )
+        self._stored_status, self._stored_status_changed_at = self.status, self.status_changed_at
+
+
+# Sent by ApplicationStatusEvent.record(), in the transaction making the
+# changes, with job_id and the new events (status changes and new applications)
+status_events_recorded = Signal()
+
+
+class ApplicationStatusEvent(models.Model):
+    """One status change of an application; rows are only ever added"""
+    
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_events')
+    # Blank for the event that created the application
+    from_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Seconds the application spent in from_status
+    stage_seconds = models.PositiveIntegerField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            # An application's timeline, oldest first (application_detail)
+            models.Index(fields=['application', 'created_at', 'id'], name='jobs_event_app_time_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.applicant.username} -> {self.job.title}"
\ No newline at end of file
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status}"
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Application status events are append-only")
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        raise ValueError("Application status events are append-only")
+    
+    @classmethod
+    def record(cls, job_id, recruiter_id, changes, at):
+        """
+        Append events for [(application_id, from_status, to_status, since)]
+        of one job, and add the time spent in each from_status to the job's
+        and the recruiter's stage times.
+        """
+        events, stages = [], defaultdict(lambda: [0, 0])
+        for application_id, from_status, to_status, since in changes:
+            seconds = None
+            if from_status and since:
+                seconds = max(0, int((at - since).total_seconds()))
+                stages[from_status][0] += 1
+                stages[from_status][1] += seconds
+            events.append(cls(
+                application_id=application_id, from_status=from_status or '', to_status=to_status,
+                created_at=at, stage_seconds=seconds,
+            ))
+        cls.objects.bulk_create(events)
+        if stages:
+            JobStageTime.add(stages, job_id=job_id)
+            RecruiterStageTime.add(stages, recruiter_id=recruiter_id)
+        status_events_recorded.send(sender=cls, job_id=job_id, events=events)
+
+
+class StageTime(models.Model):
+    """Time applications spent in a status before leaving it, summed (hiring funnel analytics)"""
+    
+    status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    exits = models.PositiveIntegerField(default=0)
+    total_seconds = models.PositiveBigIntegerField(default=0)
+    
+    # Owner foreign key, and the path to it from ApplicationStatusEvent
+    owner_field = None
+    event_path = None
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def mean_days(self):
+        return self.total_seconds / self.exits / 86400 if self.exits else None
+    
+    @staticmethod
+    def in_status_order(rows):
+        """Rows sorted like the pipeline, applied first"""
+        order = [status for status, _ in JobApplication.STATUS_CHOICES]
+        return sorted(rows, key=lambda row: order.index(row.status))
+    
+    @classmethod
+    def add(cls, stages, **owner):
+        """Add {status: (exits, seconds)} to an owner's rows, creating missing ones"""
+        for status, (exits, seconds) in stages.items():
+            rows = cls.objects.filter(status=status, **owner)
+            increments = {'exits': F('exits') + exits, 'total_seconds': F('total_seconds') + seconds}
+            if rows.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(status=status, exits=exits, total_seconds=seconds, **owner)
+            except IntegrityError:
+                # Created concurrently
+                rows.update(**increments)
+    
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """Recompute every row from the events (after bulk loads or repairs)"""
+        totals = ApplicationStatusEvent.objects.filter(stage_seconds__isnull=False).order_by().values_list(
+            cls.event_path, 'from_status'
+        ).annotate(exits=Count('pk'), seconds=Sum('stage_seconds'))
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([
+                cls(**{f'{cls.owner_field}_id': owner_id}, status=status, exits=exits, total_seconds=seconds)
+                for owner_id, status, exits, seconds in totals
+            ], batch_size=batch_size)
+
+
+class JobStageTime(StageTime):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='stage_times')
+    
+    owner_field = 'job'
+    event_path = 'application__job'
+    
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['job', 'status'], name='jobs_stagetime_job_status_uniq')]
+
+
+class RecruiterStageTime(StageTime):
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stage_times')
+    
+    owner_field = 'recruiter'
+    event_path = 'application__job__posted_by'
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['recruiter', 'status'], name='jobs_stagetime_recruiter_status_uniq')
+        ]
+
+
+# Job counter field per application status
+APPLICATION_COUNT_FIELDS = {status: f'{status}_count' for status, _ in JobApplication.STATUS_CHOICES}
@@ -0,0 +1,235 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from geo.gazetteer import place_filter
+from searches.cache import CHOICES, FLAG, NUMBER, SKILLS, TEXT, Search, register
+from skills.utils import split_skills, owners_with_all_skills
+
+# Matches the words we hand to the full-text engine; punctuation is dropped so
+# user input can never be interpreted as FTS query syntax.
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Split free text into lowercase search tokens"""
+    return [token.lower() for token in TOKEN_RE.findall(text or '')]
+
+
+class SearchBackend:
+    """
+    Interface for job keyword search.
+
+    Backends keep an index in sync with Job rows (update/remove/rebuild) and
+    turn a keyword string into a filtered, relevance-ordered queryset.
+    """
+
+    def update(self, job):
+        """Add or refresh a single job in the index"""
+        raise NotImplementedError
+
+    def remove(self, job_id):
+        """Drop a single job from the index"""
+        raise NotImplementedError
+
+    def rebuild(self, queryset=None):
+        """Rebuild the whole index, returns the number of indexed jobs"""
+        raise NotImplementedError
+
+    def search(self, queryset, keywords):
+        """
+        Restrict queryset to jobs matching keywords.
+
+        The result is annotated with ``search_rank`` (lower is better) and
+        ordered by relevance, newest first for ties.
+        """
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """Fallback backend for databases without a full-text index (substring match)"""
+
+    def update(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+    def rebuild(self, queryset=None):
+        return 0
+
+    def search(self, queryset, keywords):
+        for token in tokenize(keywords):
+            queryset = queryset.filter(
+                Q(title__icontains=token) |
+                Q(company__icontains=token) |
+                Q(description__icontains=token) |
+                Q(required_skills__icontains=token)
+            )
+        return queryset.annotate(search_rank=RawSQL('0', ())).order_by('-created_at', '-id')
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """SQLite FTS5 index ranked with BM25 (see jobs/migrations/0002_job_search_index.py)"""
+
+    table = 'jobs_job_fts'
+    # BM25 column weights: title, company, skills, description
+    weights = (10.0, 5.0, 4.0, 1.0)
+    batch_size = 1000
+
+    def _row(self, job):
+        skills = ' '.join([job.required_skills or '', job.preferred_skills or ''])
+        return (job.pk, job.title, job.company, skills, job.description)
+
+    def update(self, job):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, company, skills, description) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                self._row(job)
+            )
+
+    def remove(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job_id])
+
+    def rebuild(self, queryset=None):
+        from .models import Job
+
+        if queryset is None:
+            queryset = Job.objects.all()
+        queryset = queryset.only(
+            'pk', 'title', 'company', 'required_skills', 'preferred_skills', 'description'
+        ).order_by('pk')
+
+        count = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            batch = []
+            for job in queryset.iterator(chunk_size=self.batch_size):
+                batch.append(self._row(job))
+                if len(batch) >= self.batch_size:
+                    self._insert_many(cursor, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self._insert_many(cursor, batch)
+                count += len(batch)
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return count
+
+    def _insert_many(self, cursor, rows):
+        cursor.executemany(
+            f'INSERT INTO {self.table} (rowid, title, company, skills, description) '
+            'VALUES (%s, %s, %s, %s, %s)',
+            rows
+        )
+
+    def match_expression(self, keywords):
+        """Build a safe FTS5 query: every token must match, as a prefix"""
+        return ' '.join(f'"{token}"*' for token in tokenize(keywords))
+
+    def search(self, queryset, keywords):
+        expression = self.match_expression(keywords)
+        if not expression:
+            return queryset.annotate(search_rank=RawSQL('0', ())).order_by('-created_at', '-id')
+
+        table = queryset.model._meta.db_table
+        weights = ', '.join(str(weight) for weight in self.weights)
+        matches = RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            (expression,)
+        )
+        rank = RawSQL(
+            f'SELECT bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = {table}.id',
+            (expression,)
+        )
+        return queryset.filter(pk__in=matches).annotate(
+            search_rank=rank
+        ).order_by('search_rank', '-created_at', '-id')
+
+
+def get_search_backend():
+    """Return the configured search backend, picking one for the database if unset"""
+    backend_path = getattr(settings, 'JOB_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    return DatabaseSearchBackend()
+
+
+@register
+class JobListingSearch(Search):
+    """Public job listing search (jobs.views.job_list)"""
+
+    name = 'jobs'
+    version = 'jobs'
+    per_page = 10
+    params = {
+        'keywords': TEXT,
+        'location': TEXT,
+        'job_type': CHOICES,
+        'remote_type': CHOICES,
+        'experience_level': CHOICES,
+        'salary_min': NUMBER,
+        'visa_sponsorship': FLAG,
+        'skills': SKILLS,
+    }
+
+    def canonicalize(self, data):
+        # Any value ticks the visa checkbox on this form
+        if data.get('visa_sponsorship'):
+            data = data.copy()
+            data['visa_sponsorship'] = 'on'
+        return super().canonicalize(data)
+
+    def build(self, params):
+        from .models import Job, JobSkill
+
+        jobs = Job.objects.filter(is_active=True)
+
+        # Keywords search (full-text index, ordered by relevance)
+        keywords = params.get('keywords')
+        if keywords:
+            jobs = get_search_backend().search(jobs, keywords)
+
+        # Location search: canonical place ids when the gazetteer knows the place
+        location = params.get('location')
+        if location:
+            at_place = place_filter(location)
+            if at_place is not None:
+                jobs = jobs.filter(at_place)
+            else:
+                jobs = jobs.filter(
+                    Q(city__icontains=location) |
+                    Q(state__icontains=location) |
+                    Q(country__icontains=location)
+                )
+
+        # Multi-value filters
+        for field in ('job_type', 'remote_type', 'experience_level'):
+            values = params.getlist(field)
+            if values:
+                jobs = jobs.filter(**{f'{field}__in': values})
+
+        if params.get('salary_min'):
+            jobs = jobs.filter(salary_min__gte=float(params['salary_min']))
+
+        if params.get('visa_sponsorship'):
+            jobs = jobs.filter(visa_sponsorship=True)
+
+        # Skills search (exact skill matches, required or preferred)
+        skill_list = split_skills(params.get('skills', ''))
+        if skill_list:
+            jobs = jobs.filter(pk__in=owners_with_all_skills(JobSkill, 'job_id', skill_list))
+
+        # Keyword searches are ordered by relevance first
+        if keywords:
+            return jobs, ('search_rank', '-created_at', '-id')
+        return jobs, ('-created_at', '-id')
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from jobapp.versions import bump_version
+from tasks.queue import enqueue
+from . import tasks
+from .models import Job, JobApplication
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, raw=False, **kwargs):
+    """Keep the keyword search index in sync with saved jobs"""
+    if raw:
+        return
+    get_search_backend().update(instance)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    """Drop deleted jobs from the keyword search index"""
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def sync_job_skills(sender, instance, raw=False, **kwargs):
+    """Keep the normalized JobSkill links in sync with the skills text"""
+    if raw:
+        return
+    instance.sync_skills()
+
+
+@receiver(post_save, sender=Job)
+def update_job_recommendations(sender, instance, raw=False, **kwargs):
+    """Queue merging a new or edited job into applicants' recommendations"""
+    if raw:
+        return
+    enqueue(tasks.refresh_job_recommendations, {'job_id': instance.pk}, key=f'job-recommendations:{instance.pk}')
+
+
+@receiver(post_save, sender=Job)
+def refresh_similar_jobs(sender, instance, raw=False, **kwargs):
+    """Queue refreshing the job's nearest neighbours"""
+    if raw:
+        return
+    enqueue(tasks.refresh_similar_jobs, {'job_id': instance.pk}, key=f'similar-jobs:{instance.pk}')
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_jobs_version(sender, raw=False, **kwargs):
+    """Job data changed; invalidate cached job searches"""
+    if raw:
+        return
+    bump_version('jobs')
+
+
+@receiver(post_delete, sender=JobApplication)
+def uncount_application(sender, instance, origin=None, **kwargs):
+    """Take a deleted application off its job's counters"""
+    if isinstance(origin, Job) or getattr(origin, 'model', None) is Job:
+        # The job is being deleted along with it
+        return
+    Job.adjust_application_counts(instance.job_id, {instance.status: -1})
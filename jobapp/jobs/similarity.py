@@ -0,0 +1,228 @@
+"""
+"Similar jobs" from TF-IDF cosine similarity.
+
+Each job's weighted term counts are stored in JobTerm (title and skills
+count extra). A bounded list of at most SIMILAR_JOBS_PER_JOB neighbours
+per job is kept in SimilarJob:
+
+* update_similar_jobs() refreshes one new or edited job. Only jobs that
+  share one of its strongest terms are compared, and the job is merged
+  into those neighbours' lists too, so the cost does not grow with the
+  total number of jobs.
+* rebuild_similar_jobs() recomputes everything with a sparse matrix
+  product (rebuild_similar_jobs management command).
+
+Scores written incrementally use document frequencies as of the update,
+so a periodic rebuild keeps them from drifting.
+"""
+import math
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from scipy import sparse
+
+from .models import Job, JobTerm, SimilarJob
+from .search import tokenize
+
+TITLE_WEIGHT = 3
+SKILLS_WEIGHT = 2
+
+MAX_TERM_LENGTH = 50
+
+# Strongest terms of a job used to find comparison candidates
+QUERY_TERMS = 20
+MAX_CANDIDATES = 500
+
+MIN_SIMILARITY = 0.1
+
+STOP_WORDS = frozenset('''
+    a about above after all also an and any are as at be been being but by can could do does
+    for from has have how if in into is it its may more most must no not of on or our out over
+    per so such than that the their them then there these they this to under up us we were what
+    when where which while who will with within would you your
+'''.split())
+
+
+def neighbours_per_job():
+    return getattr(settings, 'SIMILAR_JOBS_PER_JOB', 10)
+
+
+def job_terms(job):
+    """Weighted term counts for a job's title, skills and description"""
+    counts = Counter()
+    for text, weight in (
+        (job.title, TITLE_WEIGHT),
+        (f'{job.required_skills} {job.preferred_skills}', SKILLS_WEIGHT),
+        (job.description, 1),
+    ):
+        for token in tokenize(text):
+            if len(token) > 1 and len(token) <= MAX_TERM_LENGTH and token not in STOP_WORDS and not token.isdigit():
+                counts[token] += weight
+    return counts
+
+
+def idf(document_frequency, document_count):
+    """Smoothed inverse document frequency"""
+    return math.log((1 + document_count) / (1 + document_frequency)) + 1
+
+
+def tfidf_vector(counts, frequencies, document_count):
+    """L2-normalized {term: weight} for weighted term counts"""
+    vector = {
+        term: (1 + math.log(count)) * idf(frequencies.get(term, 0), document_count)
+        for term, count in counts.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def _replace_neighbours(job_id, neighbours):
+    SimilarJob.objects.filter(job_id=job_id).delete()
+    SimilarJob.objects.bulk_create([
+        SimilarJob(job_id=job_id, similar_id=similar_id, score=score) for similar_id, score in neighbours
+    ])
+
+
+def update_similar_jobs(job):
+    """
+    Refresh a single job's terms and neighbours, and merge it into its
+    neighbours' lists (replacing their weakest entry when full).
+    """
+    limit = neighbours_per_job()
+    counts = job_terms(job)
+    with transaction.atomic():
+        JobTerm.objects.filter(job=job).delete()
+        JobTerm.objects.bulk_create([JobTerm(job=job, term=term, count=count) for term, count in counts.items()])
+        # Drop stale links in both directions; they are recomputed below
+        SimilarJob.objects.filter(job=job).delete()
+        SimilarJob.objects.filter(similar=job).delete()
+        if not job.is_active or not counts:
+            return []
+
+        document_count = Job.objects.count()
+        frequencies = dict(
+            JobTerm.objects.filter(term__in=list(counts)).values_list('term').annotate(Count('job'))
+        )
+        vector = tfidf_vector(counts, frequencies, document_count)
+        query_terms = sorted(vector, key=vector.get, reverse=True)[:QUERY_TERMS]
+
+        candidate_ids = [
+            job_id for job_id, _ in
+            JobTerm.objects.filter(term__in=query_terms, job__is_active=True).exclude(job=job)
+            .values_list('job_id').annotate(shared=Count('term')).order_by('-shared', '-job_id')[:MAX_CANDIDATES]
+        ]
+        candidate_counts = {}
+        for job_id, term, count in JobTerm.objects.filter(job_id__in=candidate_ids).values_list('job_id', 'term', 'count'):
+            candidate_counts.setdefault(job_id, {})[term] = count
+
+        missing = {term for terms in candidate_counts.values() for term in terms} - set(frequencies)
+        frequencies.update(
+            JobTerm.objects.filter(term__in=list(missing)).values_list('term').annotate(Count('job'))
+        )
+        scores = {}
+        for job_id, terms in candidate_counts.items():
+            score = cosine(vector, tfidf_vector(terms, frequencies, document_count))
+            if score >= MIN_SIMILARITY:
+                scores[job_id] = score
+
+        neighbours = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:limit]
+        _replace_neighbours(job.pk, neighbours)
+
+        # Symmetric update: this job may now belong in the candidates' own lists
+        stats = SimilarJob.objects.filter(job_id__in=list(scores)).values('job_id').annotate(
+            count=Count('pk'), lowest=Min('score')
+        )
+        full = {row['job_id']: row['lowest'] for row in stats if row['count'] >= limit}
+        additions = []
+        for job_id, score in scores.items():
+            if job_id in full:
+                if score <= full[job_id]:
+                    continue
+                weakest = SimilarJob.objects.filter(job_id=job_id).order_by('score', 'similar_id').first()
+                weakest.delete()
+            additions.append(SimilarJob(job_id=job_id, similar=job, score=score))
+        SimilarJob.objects.bulk_create(additions)
+    return neighbours
+
+
+def rebuild_similar_jobs(batch_size=500):
+    """Recompute terms and neighbour lists for every job, returns the number of links stored"""
+    limit = neighbours_per_job()
+    job_ids = []
+    vocabulary = {}
+    rows, columns, values = [], [], []
+    active = []
+
+    with transaction.atomic():
+        JobTerm.objects.all().delete()
+        terms = []
+        jobs = Job.objects.only(
+            'pk', 'title', 'description', 'required_skills', 'preferred_skills', 'is_active'
+        ).order_by('pk')
+        for job in jobs.iterator(chunk_size=batch_size):
+            counts = job_terms(job)
+            row = len(job_ids)
+            job_ids.append(job.pk)
+            active.append(job.is_active)
+            for term, count in counts.items():
+                terms.append(JobTerm(job_id=job.pk, term=term, count=count))
+                rows.append(row)
+                columns.append(vocabulary.setdefault(term, len(vocabulary)))
+                values.append(count)
+            if len(terms) >= batch_size * 20:
+                JobTerm.objects.bulk_create(terms, batch_size=batch_size)
+                terms = []
+        JobTerm.objects.bulk_create(terms, batch_size=batch_size)
+
+        SimilarJob.objects.all().delete()
+        if not job_ids:
+            return 0
+
+        counts = sparse.csr_matrix(
+            (np.array(values, dtype=np.float64), (rows, columns)), shape=(len(job_ids), len(vocabulary))
+        )
+        frequencies = np.bincount(counts.indices, minlength=len(vocabulary))
+        weights = np.log((1 + len(job_ids)) / (1 + frequencies)) + 1
+        matrix = counts.copy()
+        matrix.data = 1 + np.log(matrix.data)
+        matrix = matrix @ sparse.diags(weights)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        matrix = sparse.diags(np.divide(1, norms, out=np.zeros_like(norms), where=norms > 0)) @ matrix
+        matrix = sparse.csr_matrix(matrix)
+
+        ids = np.array(job_ids)
+        active = np.array(active)
+        # Only active jobs are worth recommending
+        active_matrix = matrix[active].T.tocsc()
+        active_ids = ids[active]
+
+        links = []
+        ids = ids.tolist()
+        for start in range(0, len(job_ids), batch_size):
+            block = (matrix[start:start + batch_size] @ active_matrix).tocsr()
+            for offset in range(block.shape[0]):
+                row = start + offset
+                if not active[row]:
+                    continue
+                similar = block.indices[block.indptr[offset]:block.indptr[offset + 1]]
+                scores = block.data[block.indptr[offset]:block.indptr[offset + 1]]
+                keep = (active_ids[similar] != ids[row]) & (scores >= MIN_SIMILARITY)
+                similar, scores = active_ids[similar[keep]], scores[keep]
+                if len(scores) > limit:
+                    best = np.argpartition(-scores, limit - 1)[:limit]
+                    similar, scores = similar[best], scores[best]
+                links.extend(
+                    SimilarJob(job_id=ids[row], similar_id=similar_id, score=score)
+                    for similar_id, score in zip(similar.tolist(), scores.tolist())
+                )
+        SimilarJob.objects.bulk_create(links, batch_size=batch_size)
+    return len(links)
@@ -0,0 +1,21 @@
+"""Background work derived from job postings (see tasks/queue.py)"""
+from applicants.recommendations import recommend_job
+from tasks.queue import task
+from .models import Job
+from .similarity import update_similar_jobs
+
+
+@task
+def refresh_job_recommendations(job_id):
+    """Merge a new or edited job into applicants' recommendations"""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is not None:
+        recommend_job(job)
+
+
+@task
+def refresh_similar_jobs(job_id):
+    """Refresh the job's nearest neighbours (and its place in theirs)"""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is not None:
+        update_similar_jobs(job)
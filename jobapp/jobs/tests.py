@@ -1,3 +1,589 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.queue import run_pending
+from perf.testing import (
+    QueryBudgetTestCase, QueryPlanTestCase, apply_to, make_applicant, make_jobs, make_recruiter,
+)
+from .models import ApplicationStatusEvent, Job, JobApplication, JobStageTime, RecruiterStageTime, SimilarJob
+from .search import DatabaseSearchBackend, JobListingSearch, SQLiteFTSBackend
+from .similarity import job_terms, rebuild_similar_jobs, tfidf_vector, update_similar_jobs
+from .transitions import applications_transitioned, bulk_transition
+
+
+class JobViewQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter('recruiter')
+        self.applicant = make_applicant('applicant')
+        self.jobs = make_jobs(self.recruiter, 3)
+
+    def grow_jobs(self):
+        make_jobs(self.recruiter, 5, start=len(self.jobs))
+
+    def test_job_list(self):
+        self.assertQueryBudget(reverse('jobs:list'))
+        self.assertQueriesConstant(reverse('jobs:list'), self.grow_jobs)
+
+    def test_job_list_logged_in(self):
+        self.login(self.applicant)
+        self.assertQueryBudget(reverse('jobs:list') + '?search=python')
+
+    def test_job_detail(self):
+        self.login(self.applicant)
+        self.assertQueryBudget(reverse('jobs:detail', args=[self.jobs[0].pk]))
+
+    def test_recruiter_jobs(self):
+        self.login(self.recruiter)
+        self.assertQueryBudget(reverse('jobs:recruiter_jobs'))
+        self.assertQueriesConstant(reverse('jobs:recruiter_jobs'), self.grow_jobs)
+
+    def test_my_applications(self):
+        self.login(self.applicant)
+        apply_to(self.applicant, self.jobs[:1])
+        self.assertQueryBudget(reverse('jobs:my_applications'))
+        self.assertQueriesConstant(
+            reverse('jobs:my_applications'), lambda: apply_to(self.applicant, self.jobs[1:])
+        )
+
+    def test_application_detail(self):
+        self.login(self.applicant)
+        application, = apply_to(self.applicant, self.jobs[:1])
+        self.assertQueryBudget(reverse('jobs:application_detail', args=[application.pk]))
+
+    def test_job_pipeline(self):
+        self.login(self.recruiter)
+        job = self.jobs[0]
+        apply_to(self.applicant, [job])
+        url = reverse('jobs:pipeline', args=[job.pk])
+        applicants = iter(range(10))
+
+        def more_applicants():
+            for _ in range(3):
+                apply_to(make_applicant(f'pipeline-{next(applicants)}'), [job])
+
+        self.assertQueryBudget(url)
+        self.assertQueriesConstant(url, more_applicants)
+        self.assertQueriesConstant(url + '?status=applied', more_applicants)
+
+
+class JobSearchBackendTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+        self.backend = SQLiteFTSBackend()
+
+    def ids(self, keywords, backend=None):
+        return list((backend or self.backend).search(Job.objects.all(), keywords).values_list('pk', flat=True))
+
+    def test_match_expression_quotes_every_token(self):
+        self.assertEqual(self.backend.match_expression('Python OR "dev*" -(ops)'), '"python"* "or"* "dev"* "ops"*')
+        self.assertEqual(self.backend.match_expression('  --  '), '')
+
+    def test_every_token_must_match_as_a_prefix(self):
+        python, = make_jobs(self.recruiter, 1, title='Python Developer', description='Services.')
+        data, = make_jobs(self.recruiter, 1, start=1, title='Data Engineer', description='Pipelines in Python.')
+        self.assertEqual(sorted(self.ids('pyth')), sorted([python.pk, data.pk]))
+        self.assertEqual(self.ids('python pipe'), [data.pk])
+        self.assertEqual(self.ids('rust'), [])
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_description, = make_jobs(self.recruiter, 1, title='Data Engineer', description='Python pipelines.')
+        in_title, = make_jobs(self.recruiter, 1, start=1, title='Python Developer', description='Services.')
+        ranked = self.backend.search(Job.objects.all(), 'python')
+        self.assertEqual([job.pk for job in ranked], [in_title.pk, in_description.pk])
+        self.assertLess(ranked[0].search_rank, ranked[1].search_rank)
+
+    def test_index_follows_saves_and_deletes(self):
+        job, = make_jobs(self.recruiter, 1, title='Kotlin Developer')
+        job.title = 'Golang Developer'
+        job.save()
+        self.assertEqual(self.ids('golang'), [job.pk])
+        self.assertEqual(self.ids('kotlin'), [])
+        job.delete()
+        self.assertEqual(self.ids('golang'), [])
+
+    def test_rebuild(self):
+        jobs = make_jobs(self.recruiter, 3, title='Golang Developer')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.backend.table}')
+        self.assertEqual(self.ids('golang'), [])
+        self.assertEqual(self.backend.rebuild(), 3)
+        self.assertEqual(sorted(self.ids('golang')), sorted(job.pk for job in jobs))
+
+    def test_fallback_backend_matches_substrings(self):
+        job, = make_jobs(self.recruiter, 1, title='Python Developer', description='Services.')
+        make_jobs(self.recruiter, 1, start=1, title='Data Engineer', description='Pipelines.')
+        self.assertEqual(self.ids('ytho servi', DatabaseSearchBackend()), [job.pk])
+
+
+class JobTermTests(SimpleTestCase):
+
+    def test_weighted_terms(self):
+        job = Job(
+            title='Python Developer', required_skills='Python, SQL', preferred_skills='',
+            description='Write the Python services for 2 teams.'
+        )
+        self.assertEqual(
+            job_terms(job),
+            {'python': 6, 'developer': 3, 'sql': 2, 'write': 1, 'services': 1, 'teams': 1}
+        )
+
+    def test_vectors_are_normalized(self):
+        vector = tfidf_vector({'python': 6, 'sql': 2}, {'python': 10, 'sql': 1}, 10)
+        self.assertAlmostEqual(sum(weight * weight for weight in vector.values()), 1.0)
+        self.assertEqual(tfidf_vector({}, {}, 10), {})
+
+
+class SimilarJobTests(TestCase):
+
+    def setUp(self):
+        recruiter = make_recruiter('recruiter')
+        self.python, self.django, self.other = make_jobs(recruiter, 3)
+        for job, title, skills in (
+            (self.python, 'Python Developer', 'Python, Django, SQL'),
+            (self.django, 'Django Developer', 'Python, Django'),
+            (self.other, 'Payroll Clerk', 'Excel, Accounting'),
+        ):
+            job.title, job.required_skills = title, skills
+        self.other.description = 'Prepare monthly payroll reports.'
+        for job in (self.python, self.django, self.other):
+            job.save()
+
+    def neighbours(self, job):
+        return dict(SimilarJob.objects.filter(job=job).values_list('similar_id', 'score'))
+
+    def test_update_links_both_ways(self):
+        self.assertEqual(update_similar_jobs(self.python), [])
+        self.assertEqual(update_similar_jobs(self.other), [])
+        (similar_id, score), = update_similar_jobs(self.django)
+        self.assertEqual(similar_id, self.python.pk)
+        self.assertEqual(self.neighbours(self.python), {self.django.pk: score})
+        self.assertEqual(self.neighbours(self.other), {})
+
+        self.django.is_active = False
+        self.django.save()
+        self.assertEqual(update_similar_jobs(self.django), [])
+        self.assertEqual(self.neighbours(self.python), {})
+
+    @override_settings(SIMILAR_JOBS_PER_JOB=1)
+    def test_full_lists_keep_the_closest_jobs(self):
+        rebuild_similar_jobs()
+        self.assertEqual(list(self.neighbours(self.django)), [self.python.pk])
+        self.other.title, self.other.required_skills = 'Django Developer', 'Python, Django'
+        self.other.description = self.django.description
+        self.other.save()
+        update_similar_jobs(self.other)
+        # An identical job replaces the weaker neighbour
+        self.assertEqual(list(self.neighbours(self.django)), [self.other.pk])
+        self.assertEqual(list(self.neighbours(self.other)), [self.django.pk])
+
+    def test_rebuild_agrees_with_updates(self):
+        for job in (self.python, self.django, self.other):
+            update_similar_jobs(job)
+        self.assertEqual(rebuild_similar_jobs(), 2)
+        score = self.neighbours(self.python)[self.django.pk]
+        self.assertAlmostEqual(self.neighbours(self.django)[self.python.pk], score)
+        self.assertEqual(self.neighbours(self.other), {})
+        # Once every job is indexed, an update scores like the rebuild
+        (similar_id, updated), = update_similar_jobs(self.django)
+        self.assertEqual(similar_id, self.python.pk)
+        self.assertAlmostEqual(updated, score)
+
+
+class AnonymousPageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.recruiter = make_recruiter('recruiter')
+        self.job, = make_jobs(self.recruiter, 1)
+
+    def test_list_revalidates_until_a_job_changes(self):
+        url = reverse('jobs:list') + '?keywords=python'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        # Another URL is another page
+        other = self.client.get(reverse('jobs:list'), headers={'If-None-Match': etag})
+        self.assertEqual(other.status_code, 200)
+
+        self.job.title = 'Rust Developer'
+        self.job.save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_repeat_views_come_from_the_cache(self):
+        url = reverse('jobs:detail', args=[self.job.pk])
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': first['ETag']}).status_code, 304)
+
+        self.job.title = 'Rust Developer'
+        self.job.save()
+        self.assertContains(self.client.get(url), 'Rust Developer')
+
+    def test_logged_in_users_bypass_both(self):
+        self.client.force_login(make_applicant('applicant'))
+        url = reverse('jobs:detail', args=[self.job.pk])
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': '*'}).status_code, 200)
+
+
+class JobBackgroundWorkTests(TestCase):
+
+    def test_saving_a_job_queues_one_refresh(self):
+        recruiter = make_recruiter('recruiter')
+        first, second = make_jobs(recruiter, 2, description='Build and run Django services in Python.')
+        first.title = 'Senior Python Developer'
+        first.save()
+        self.assertEqual(
+            sorted(Task.objects.values_list('key', flat=True)),
+            sorted(f'{kind}:{job.pk}' for kind in ('job-recommendations', 'similar-jobs') for job in (first, second))
+        )
+        self.assertFalse(SimilarJob.objects.exists())
+
+        self.assertEqual(run_pending(), (4, 0))
+        self.assertTrue(SimilarJob.objects.filter(job=first, similar=second).exists())
+
+
+class ApplicationCounterTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+        self.job, self.other_job = make_jobs(self.recruiter, 2)
+        self.applicants = [make_applicant(f'applicant-{i}') for i in range(3)]
+
+    def counts(self, job=None):
+        job = Job.objects.get(pk=(job or self.job).pk)
+        return {status: count for status, _, count in job.application_counts if count}
+
+    def test_counters_follow_status_changes(self):
+        applications = [apply_to(applicant, [self.job])[0] for applicant in self.applicants]
+        self.assertEqual(self.counts(), {'applied': 3})
+
+        applications[0].status = 'interview'
+        applications[0].save()
+        applications[0].save()
+        self.assertEqual(self.counts(), {'applied': 2, 'interview': 1})
+
+        application = JobApplication.objects.get(pk=applications[1].pk)
+        application.status = 'withdrawn'
+        application.save(update_fields=['status', 'updated_at'])
+        application.cover_letter = 'Withdrawn by email'
+        application.save(update_fields=['cover_letter'])
+        self.assertEqual(self.counts(), {'applied': 1, 'interview': 1, 'withdrawn': 1})
+        self.assertEqual(Job.objects.get(pk=self.job.pk).total_applications, 3)
+        self.assertEqual(self.counts(self.other_job), {})
+
+    def test_deleting_an_application(self):
+        application, = apply_to(self.applicants[0], [self.job])
+        apply_to(self.applicants[1], [self.job])
+        application.delete()
+        self.assertEqual(self.counts(), {'applied': 1})
+        JobApplication.objects.filter(job=self.job).delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_deleting_the_job(self):
+        apply_to(self.applicants[0], [self.job])
+        self.job.delete()
+        self.assertFalse(JobApplication.objects.exists())
+
+    def test_saving_a_stale_job_keeps_its_counters(self):
+        job = Job.objects.get(pk=self.job.pk)
+        apply_to(self.applicants[0], [self.job])
+        job.title = 'Senior Python Developer'
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual((job.title, job.applied_count), ('Senior Python Developer', 1))
+
+    def test_recount(self):
+        apply_to(self.applicants[0], [self.job, self.other_job])
+        apply_to(self.applicants[1], [self.job])
+        JobApplication.objects.filter(applicant=self.applicants[1]).update(status='offer')
+        Job.objects.update(applied_count=0, offer_count=5)
+
+        self.assertEqual(Job.recount_applications([self.job.pk]), 1)
+        self.assertEqual(self.counts(), {'applied': 1, 'offer': 1})
+        self.assertEqual(self.counts(self.other_job), {'offer': 5})
+        Job.recount_applications(batch_size=1)
+        self.assertEqual(self.counts(self.other_job), {'applied': 1})
+
+
+class JobPipelineViewTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+        self.job, = make_jobs(self.recruiter, 1)
+        self.applicants = [make_applicant(f'applicant-{i}') for i in range(3)]
+        self.applications = [apply_to(applicant, [self.job])[0] for applicant in self.applicants]
+        self.applications[0].status = 'interview'
+        self.applications[0].save()
+        self.client.force_login(self.recruiter)
+
+    def test_tabs(self):
+        url = reverse('jobs:pipeline', args=[self.job.pk])
+        response = self.client.get(url)
+        self.assertEqual(len(response.context['applications']), 3)
+        self.assertContains(response, 'Interview <span class="badge bg-secondary">1</span>', html=False)
+
+        response = self.client.get(url, {'status': 'interview'})
+        self.assertEqual([app.pk for app in response.context['applications']], [self.applications[0].pk])
+        self.assertEqual(response.context['status'], 'interview')
+
+        response = self.client.get(url, {'status': 'bogus'})
+        self.assertEqual(response.context['status'], '')
+        self.assertEqual(len(response.context['applications']), 3)
+
+    def test_other_recruiters_job(self):
+        self.client.force_login(make_recruiter('other'))
+        response = self.client.get(reverse('jobs:pipeline', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class BulkTransitionTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+        self.job, self.other_job = make_jobs(self.recruiter, 2)
+        self.applications = [
+            apply_to(make_applicant(f'applicant-{i}'), [self.job])[0] for i in range(6)
+        ]
+        apply_to(make_applicant('elsewhere'), [self.other_job])
+        JobApplication.objects.filter(pk=self.applications[0].pk).update(status='withdrawn')
+        JobApplication.objects.filter(pk=self.applications[1].pk).update(status='interview')
+        Job.recount_applications()
+
+    def statuses(self):
+        return dict(JobApplication.objects.filter(job=self.job).values_list('pk', 'status'))
+
+    def counts(self, job):
+        job.refresh_from_db()
+        return {status: count for status, _, count in job.application_counts if count}
+
+    def test_rejects_everyone_still_open(self):
+        sent = []
+
+        def receiver(**kwargs):
+            sent.append(kwargs)
+        applications_transitioned.connect(receiver)
+        self.addCleanup(applications_transitioned.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = bulk_transition(self.job, 'rejected', chunk_size=2)
+
+        self.assertEqual(moved, {'applied': 4, 'interview': 1})
+        self.assertEqual(list(self.statuses().values()).count('rejected'), 5)
+        self.assertEqual(self.statuses()[self.applications[0].pk], 'withdrawn')
+        self.assertEqual(self.counts(self.job), {'rejected': 5, 'withdrawn': 1})
+        self.assertEqual(self.counts(self.other_job), {'applied': 1})
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(sorted(sent[0]['application_ids']), sorted(a.pk for a in self.applications[1:]))
+
+    def test_selected_applications_and_tabs(self):
+        chosen = [a.pk for a in self.applications[:3]]
+        self.assertEqual(bulk_transition(self.job, 'review', chosen), {'applied': 1, 'interview': 1})
+        self.assertEqual(self.counts(self.job), {'applied': 3, 'review': 2, 'withdrawn': 1})
+
+        self.assertEqual(bulk_transition(self.job, 'interview', from_statuses=['review']), {'review': 2})
+        self.assertEqual(bulk_transition(self.job, 'offer', from_statuses=['applied']), {})
+        self.assertEqual(self.counts(self.job), {'applied': 3, 'interview': 2, 'withdrawn': 1})
+
+    def test_no_per_row_queries(self):
+        # Creates the job's and recruiter's stage time rows for 'applied'
+        bulk_transition(self.job, 'review', [self.applications[2].pk])
+        with self.assertNumQueries(1 + 9):
+            # The chunk's ids, then a savepoint, the UPDATE, the counters, the events, the job's
+            # and recruiter's stage times, the notifications, the queued delivery check and the release
+            bulk_transition(self.job, 'review', [a.pk for a in self.applications[3:]])
+
+    def test_status_without_transitions(self):
+        with self.assertRaises(ValueError):
+            bulk_transition(self.job, 'applied')
+
+    def test_pipeline_action(self):
+        self.client.force_login(self.recruiter)
+        url = reverse('jobs:pipeline_transition', args=[self.job.pk])
+        response = self.client.post(url, {
+            'status': 'review', 'tab': '',
+            'applications': [self.applications[0].pk, self.applications[2].pk],
+        })
+        self.assertRedirects(response, reverse('jobs:pipeline', args=[self.job.pk]), fetch_redirect_response=False)
+        self.assertEqual(self.statuses()[self.applications[2].pk], 'review')
+        self.assertEqual(self.statuses()[self.applications[0].pk], 'withdrawn')
+
+        response = self.client.post(url, {'status': 'rejected', 'tab': 'applied', 'select_all': 'on'})
+        self.assertRedirects(
+            response, reverse('jobs:pipeline', args=[self.job.pk]) + '?status=applied', fetch_redirect_response=False
+        )
+        self.assertEqual(self.counts(self.job), {'review': 1, 'interview': 1, 'rejected': 3, 'withdrawn': 1})
+
+        self.client.post(url, {'status': 'review', 'tab': ''})
+        self.assertEqual(self.counts(self.job)['review'], 1)
+
+        self.client.force_login(make_recruiter('other'))
+        self.assertEqual(self.client.post(url, {'status': 'rejected', 'select_all': 'on'}).status_code, 404)
+
+
+class StatusHistoryTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+        self.job, self.other_job = make_jobs(self.recruiter, 2)
+        self.applicant = make_applicant('applicant')
+        self.application, = apply_to(self.applicant, [self.job])
+
+    def history(self, application=None):
+        events = (application or self.application).status_events.all()
+        return [(event.from_status, event.to_status, event.stage_seconds) for event in events]
+
+    def stage_times(self, rows):
+        return {row.status: (row.exits, row.total_seconds) for row in rows}
+
+    def age(self, application, days):
+        """Pretend the application entered its current status days ago"""
+        JobApplication.objects.filter(pk=application.pk).update(
+            status_changed_at=application.status_changed_at - timedelta(days=days)
+        )
+        return JobApplication.objects.get(pk=application.pk)
+
+    def test_status_changes_are_recorded(self):
+        application = self.age(self.application, 2)
+        application.status = 'review'
+        application.save()
+        application.cover_letter = 'Updated note'
+        application.save(update_fields=['cover_letter'])
+        application.save()
+        self.assertEqual(self.history(), [('', 'applied', None), ('applied', 'review', 2 * 86400)])
+
+        application = self.age(application, 1)
+        application.status = 'interview'
+        application.save(update_fields=['status'])
+        self.assertEqual(self.history()[-1], ('review', 'interview', 86400))
+        application.refresh_from_db()
+        self.assertEqual(application.status_changed_at, application.status_events.last().created_at)
+
+        expected = {'applied': (1, 2 * 86400), 'review': (1, 86400)}
+        self.assertEqual(self.stage_times(self.job.stage_times.all()), expected)
+        self.assertEqual(self.stage_times(self.recruiter.stage_times.all()), expected)
+
+    def test_bulk_transitions_and_withdrawals_are_recorded(self):
+        other, = apply_to(self.applicant, [self.other_job])
+        self.age(self.application, 3)
+        self.age(other, 1)
+        bulk_transition(self.job, 'review')
+        bulk_transition(self.other_job, 'review')
+        self.assertEqual(self.history()[-1], ('applied', 'review', 3 * 86400))
+
+        self.client.force_login(self.applicant)
+        self.client.post(reverse('jobs:application_withdraw', args=[self.application.pk]))
+        self.assertEqual(self.history()[-1][:2], ('review', 'withdrawn'))
+
+        self.assertEqual(self.stage_times(self.job.stage_times.all())['applied'], (1, 3 * 86400))
+        self.assertEqual(self.stage_times(self.recruiter.stage_times.all())['applied'], (2, 4 * 86400))
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.age(self.application, 3)
+        bulk_transition(self.job, 'interview')
+        applications = apply_to(make_applicant('second'), [self.job, self.other_job])
+        self.age(applications[1], 5)
+        bulk_transition(self.other_job, 'rejected')
+        for model in (JobStageTime, RecruiterStageTime):
+            incremental = sorted(model.objects.values_list(model.owner_field, 'status', 'exits', 'total_seconds'))
+            model.rebuild()
+            rebuilt = sorted(model.objects.values_list(model.owner_field, 'status', 'exits', 'total_seconds'))
+            self.assertEqual(rebuilt, incremental)
+
+    def test_events_are_append_only(self):
+        event = self.application.status_events.get()
+        event.to_status = 'offer'
+        with self.assertRaises(ValueError):
+            event.save()
+        with self.assertRaises(ValueError):
+            event.delete()
+        self.application.delete()
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+
+    def test_timeline(self):
+        bulk_transition(self.job, 'review')
+        self.client.force_login(self.applicant)
+        response = self.client.get(reverse('jobs:application_detail', args=[self.application.pk]))
+        self.assertEqual([event.to_status for event in response.context['events']], ['applied', 'review'])
+        steps = dict(response.context['steps'])
+        self.assertIsNotNone(steps['review'])
+        self.assertIsNone(steps['interview'])
+
+    def test_dashboard(self):
+        self.age(self.application, 2)
+        bulk_transition(self.job, 'review')
+        self.client.force_login(self.recruiter)
+        response = self.client.get(reverse('recruiters:dashboard'))
+        self.assertEqual([stage.status for stage in response.context['stage_times']], ['applied'])
+        self.assertContains(response, '2.0')
+
+
+class JobQueryPlanTests(QueryPlanTestCase):
+
+    FILTER_MIXES = [
+        '',
+        'remote_type=remote',
+        'remote_type=remote&remote_type=hybrid',
+        'job_type=contract',
+        'experience_level=senior',
+        'salary_min=150000',
+        'visa_sponsorship=on',
+        'remote_type=remote&experience_level=mid&salary_min=100000',
+        'job_type=full_time&remote_type=hybrid&visa_sponsorship=on',
+        'skills=python,django',
+        'keywords=job',
+        'location=Austin, TX',
+    ]
+
+    def test_listing_filters(self):
+        search = JobListingSearch()
+        for query_string in self.FILTER_MIXES:
+            with self.subTest(query_string=query_string):
+                keys, count = self.search_querysets(search, query_string)
+                self.assertNoFullScan(keys)
+                if query_string:
+                    self.assertNoFullScan(count)
+
+    def test_default_listing_is_read_in_index_order(self):
+        keys, _ = self.search_querysets(JobListingSearch(), '')
+        self.assertOrderedByIndex(keys)
+
+    def test_recruiter_jobs(self):
+        self.assertOrderedByIndex(Job.objects.filter(posted_by=self.recruiter).order_by('-created_at', '-id')[:21])
+
+    def test_my_applications(self):
+        applicant = make_applicant('plan-applicant')
+        self.assertOrderedByIndex(
+            JobApplication.objects.filter(applicant=applicant).select_related('job').order_by('-applied_at')
+        )
+
+    def test_job_pipeline(self):
+        job = Job.objects.first()
+        applications = JobApplication.objects.filter(job=job).select_related('applicant__applicant_profile')
+        self.assertOrderedByIndex(applications.order_by('-applied_at', '-id')[:26])
+        self.assertOrderedByIndex(applications.filter(status='review').order_by('-applied_at', '-id')[:26])
+
+    def test_application_timeline(self):
+        application, = apply_to(make_applicant('plan-applicant'), [Job.objects.first()])
+        self.assertOrderedByIndex(ApplicationStatusEvent.objects.filter(application=application))
+
+    def test_similar_jobs(self):
+        job = Job.objects.filter(is_active=True).first()
+        self.assertOrderedByIndex(
+            SimilarJob.objects.filter(job=job, similar__is_active=True).select_related('similar').order_by('-score')[:5]
+        )
@@ -0,0 +1,103 @@
+"""
+Bulk application status changes for recruiters.
+
+bulk_transition() moves many of a job's applications to one status, for
+example rejecting everyone left when a requisition closes. Only the moves
+allowed by JobApplication.TRANSITIONS are made; other applications are
+left alone and reported as skipped.
+
+The applications are read in chunks of ids. Each chunk is one
+transaction with a set-based UPDATE per previous status, guarded on that
+status so a concurrent change is never counted twice, a single UPDATE of
+the job's per-status counters, and one INSERT of status events (plus the
+stage time rollups they feed). save() and its per-row signals are not
+involved. Instead applications_transitioned is sent once, after commit,
+with the ids of every moved application.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import ApplicationStatusEvent, Job, JobApplication
+
+CHUNK_SIZE = 500
+
+# Sent once per bulk_transition() with job, status, and application_ids
+applications_transitioned = Signal()
+
+
+def target_statuses():
+    """Statuses applications can be moved to, in pipeline order"""
+    targets = {target for targets in JobApplication.TRANSITIONS.values() for target in targets}
+    return [(status, label) for status, label in JobApplication.STATUS_CHOICES if status in targets]
+
+
+def _chunks(applications, application_ids, chunk_size):
+    """[(pk, status, status_changed_at)] lists of applications to move, chunk by chunk"""
+    fields = ('pk', 'status', 'status_changed_at')
+    if application_ids is not None:
+        ids = sorted(set(application_ids))
+        for start in range(0, len(ids), chunk_size):
+            rows = list(applications.filter(pk__in=ids[start:start + chunk_size]).values_list(*fields))
+            if rows:
+                yield rows
+        return
+    last = 0
+    while True:
+        rows = list(applications.filter(pk__gt=last).order_by('pk').values_list(*fields)[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def bulk_transition(job, status, application_ids=None, from_statuses=None, chunk_size=CHUNK_SIZE):
+    """
+    Move a job's applications to status: the given ids, or all of them
+    (optionally only those in from_statuses). Returns {previous status: moved}.
+    """
+    sources = JobApplication.sources_of(status)
+    if not sources:
+        raise ValueError(f'Applications cannot be moved to "{status}"')
+    if from_statuses is not None:
+        sources = [source for source in sources if source in from_statuses]
+    moved, moved_ids = defaultdict(int), []
+    if not sources:
+        return {}
+
+    applications = JobApplication.objects.filter(job=job, status__in=sources).order_by()
+    now = timezone.now()
+    for rows in _chunks(applications, application_ids, chunk_size):
+        by_status, since = defaultdict(list), {}
+        for pk, source, changed_at in rows:
+            by_status[source].append(pk)
+            since[pk] = changed_at
+        with transaction.atomic():
+            changes, chunk_ids = defaultdict(int), []
+            for source, pks in by_status.items():
+                updated = JobApplication.objects.filter(pk__in=pks, status=source).update(
+                    status=status, status_changed_at=now, updated_at=now
+                )
+                changes[source] -= updated
+                changes[status] += updated
+                moved[source] += updated
+                if updated == len(pks):
+                    chunk_ids.extend((pk, source) for pk in pks)
+                elif updated:
+                    # Some changed status under us; only record the ones moved here
+                    chunk_ids.extend((pk, source) for pk in JobApplication.objects.filter(
+                        pk__in=pks, status=status, status_changed_at=now
+                    ).values_list('pk', flat=True))
+            Job.adjust_application_counts(job.pk, changes)
+            ApplicationStatusEvent.record(
+                job.pk, job.posted_by_id, [(pk, source, status, since[pk]) for pk, source in chunk_ids], now
+            )
+        moved_ids.extend(pk for pk, _ in chunk_ids)
+
+    if moved_ids:
+        transaction.on_commit(lambda: applications_transitioned.send(
+            sender=JobApplication, job=job, status=status, application_ids=moved_ids
+        ))
+    return dict(moved)
@@ -16,4 +16,6 @@ urlpatterns = [
     path('post/', views.job_create, name='create'),
     path('<int:pk>/edit/', views.job_edit, name='edit'),
     path('my-jobs/', views.recruiter_jobs, name='recruiter_jobs'),
+    path('<int:pk>/applicants/', views.job_pipeline, name='pipeline'),
+    path('<int:pk>/applicants/move/', views.job_pipeline_transition, name='pipeline_transition'),
 ]
\ No newline at end of file
@@ -1,118 +1,72 @@
+from urllib.parse import urlencode
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
-from django.core.paginator import Paginator
+from django.utils.timesince import timesince
 from accounts.decorators import recruiter_required, applicant_required
-from .models import Job, JobApplication
-from .forms import JobForm, JobSearchForm, JobApplicationForm
+from jobapp.fragments import render_cached_fragments
+from jobapp.pagination import CursorPaginator
+from perf.queries import query_budget
+from .models import Job, JobApplication, SimilarJob, StageTime
+from .forms import JobForm, JobSearchForm, JobApplicationForm, BulkTransitionForm
+from .search import JobListingSearch
+from .transitions import bulk_transition
+from .caching import anonymous_job_list_cache, anonymous_job_detail_cache
 
 # Job Listing and Search Views
+def job_card_key(job):
+    """Everything a cached job card depends on"""
+    return (job.pk, job.updated_at.timestamp(), timesince(job.created_at))
+
+@query_budget(8)
+@anonymous_job_list_cache
 def job_list(request):
     """Public job listing with search functionality"""
     form = JobSearchForm(request.GET or None)
-    jobs = Job.objects.filter(is_active=True)
-    
-    # Process search filters from GET parameters directly
-    # This handles cases where form validation might fail due to format issues
-    if request.GET:
-        # Keywords search
-        keywords = request.GET.get('keywords', '').strip()
-        if keywords:
-            jobs = jobs.filter(
-                Q(title__icontains=keywords) |
-                Q(company__icontains=keywords) |
-                Q(description__icontains=keywords) |
-                Q(required_skills__icontains=keywords)
-            )
-        
-        # Location search
-        location = request.GET.get('location', '').strip()
-        if location:
-            jobs = jobs.filter(
-                Q(city__icontains=location) |
-                Q(state__icontains=location) |
-                Q(country__icontains=location)
-            )
-        
-        # Job type filter (handle multiple values)
-        job_types = request.GET.getlist('job_type')
-        if job_types:
-            jobs = jobs.filter(job_type__in=job_types)
-        
-        # Remote type filter (handle multiple values)
-        remote_types = request.GET.getlist('remote_type')
-        if remote_types:
-            jobs = jobs.filter(remote_type__in=remote_types)
-        
-        # Experience level filter (handle multiple values)
-        experience_levels = request.GET.getlist('experience_level')
-        if experience_levels:
-            jobs = jobs.filter(experience_level__in=experience_levels)
-        
-        # Salary filter
-        salary_min = request.GET.get('salary_min', '').strip()
-        if salary_min:
-            try:
-                salary_min_val = float(salary_min)
-                jobs = jobs.filter(salary_min__gte=salary_min_val)
-            except (ValueError, TypeError):
-                pass
-        
-        # Visa sponsorship filter
-        visa_sponsorship = request.GET.get('visa_sponsorship')
-        if visa_sponsorship:
-            jobs = jobs.filter(visa_sponsorship=True)
-        
-        # Skills search
-        skills = request.GET.get('skills', '').strip()
-        if skills:
-            skill_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-            for skill in skill_list:
-                jobs = jobs.filter(
-                    Q(required_skills__icontains=skill) |
-                    Q(preferred_skills__icontains=skill)
-                )
     
-    # Pagination
-    paginator = Paginator(jobs, 10)  # Show 10 jobs per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Filters, ordering and result caching live in JobListingSearch
+    paginator, page_obj = JobListingSearch().run(request.GET, request.GET.get('cursor'))
+    job_cards = render_cached_fragments('jobs/_job_card.html', page_obj, 'job', job_card_key)
     
     context = {
         'template_data': {
             'title': 'Find Jobs',
-            'user_type': getattr(request.user.userprofile, 'user_type', None) if request.user.is_authenticated else None
+            'user_type': request.user_type
         },
         'form': form,
         'page_obj': page_obj,
-        'jobs_count': jobs.count()
+        'job_cards': job_cards,
+        'jobs_count': paginator.count_display
     }
     
     return render(request, 'jobs/job_list.html', context)
 
+@query_budget(8)
+@anonymous_job_detail_cache
 def job_detail(request, pk):
     """Job detail view"""
     job = get_object_or_404(Job, pk=pk, is_active=True)
     
     # Check if user has already applied (for applicants)
     has_applied = False
-    if request.user.is_authenticated:
-        try:
-            if request.user.userprofile.user_type == 'applicant':
-                has_applied = JobApplication.objects.filter(
-                    job=job, applicant=request.user
-                ).exists()
-        except:
-            pass
+    if request.user_type == 'applicant':
+        has_applied = JobApplication.objects.filter(
+            job=job, applicant=request.user
+        ).exists()
+    
+    similar_jobs = SimilarJob.objects.filter(
+        job=job, similar__is_active=True
+    ).select_related('similar').order_by('-score')[:5]
     
     context = {
         'template_data': {
             'title': job.title,
-            'user_type': getattr(request.user.userprofile, 'user_type', None) if request.user.is_authenticated else None
+            'user_type': request.user_type
         },
         'job': job,
-        'has_applied': has_applied
+        'has_applied': has_applied,
+        'similar_jobs': similar_jobs
     }
     
     return render(request, 'jobs/job_detail.html', context)
@@ -178,21 +132,88 @@ def job_edit(request, pk):
     
     return render(request, 'jobs/job_form.html', context)
 
+@query_budget(7)
 @recruiter_required
 def recruiter_jobs(request):
     """List recruiter's job postings"""
-    jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')
+    paginator = CursorPaginator(
+        Job.objects.filter(posted_by=request.user), 20, ('-created_at', '-id'), count_mode='exact'
+    )
+    page_obj = paginator.page(request.GET.get('cursor'))
     
     context = {
         'template_data': {
             'title': 'My Job Postings',
             'user_type': 'recruiter'
         },
-        'jobs': jobs
+        'jobs': page_obj,
+        'page_obj': page_obj,
+        'jobs_count': paginator.count_display
     }
     
     return render(request, 'jobs/recruiter_jobs.html', context)
 
+@query_budget(8)
+@recruiter_required
+def job_pipeline(request, pk):
+    """Applicants to one of the recruiter's jobs, tabbed by status"""
+    job = get_object_or_404(Job, pk=pk, posted_by=request.user)
+    statuses = dict(JobApplication.STATUS_CHOICES)
+    status = request.GET.get('status')
+    if status not in statuses:
+        status = ''
+    
+    applications = JobApplication.objects.filter(job=job).select_related('applicant__applicant_profile')
+    if status:
+        applications = applications.filter(status=status)
+    # Tab counts come from the job's counters, so there is no COUNT query
+    paginator = CursorPaginator(applications, 25, ('-applied_at', '-id'))
+    page_obj = paginator.page(request.GET.get('cursor'))
+    
+    context = {
+        'template_data': {
+            'title': f'Applicants - {job.title}',
+            'user_type': 'recruiter'
+        },
+        'job': job,
+        'status': status,
+        'status_label': statuses.get(status, 'All'),
+        'tab_count': getattr(job, f'{status}_count') if status else job.total_applications,
+        # Average time in each stage, from the precomputed rollup
+        'stage_times': StageTime.in_status_order(job.stage_times.all()),
+        'applications': page_obj,
+        'page_obj': page_obj,
+        'transition_form': BulkTransitionForm(initial={'tab': status}),
+    }
+    
+    return render(request, 'jobs/job_pipeline.html', context)
+
+@recruiter_required
+def job_pipeline_transition(request, pk):
+    """Move the checked applications, or a whole tab, to another status"""
+    job = get_object_or_404(Job, pk=pk, posted_by=request.user)
+    statuses = dict(JobApplication.STATUS_CHOICES)
+    tab = request.POST.get('tab')
+    if tab not in statuses:
+        tab = ''
+    if request.method == 'POST':
+        form = BulkTransitionForm(request.POST)
+        if form.is_valid():
+            status = form.cleaned_data['status']
+            ids = None if form.cleaned_data['select_all'] else form.cleaned_data['applications']
+            moved = sum(bulk_transition(job, status, ids, [tab] if tab else None).values())
+            messages.success(request, f'Moved {moved} application{"s" if moved != 1 else ""} to {statuses[status]}.')
+            if ids is not None and moved < len(ids):
+                messages.warning(
+                    request, f'{len(ids) - moved} could not be moved to {statuses[status]} from their current status.'
+                )
+        else:
+            for error in form.non_field_errors() or ['Choose a status to move the applications to.']:
+                messages.error(request, error)
+    
+    url = reverse('jobs:pipeline', args=[job.pk])
+    return redirect(f'{url}?{urlencode({"status": tab})}' if tab else url)
+
 # Applicant Views
 @applicant_required
 def job_apply(request, pk):
@@ -227,10 +248,13 @@ def job_apply(request, pk):
     
     return render(request, 'jobs/job_apply.html', context)
 
+@query_budget(6)
 @applicant_required
 def my_applications(request):
     """View applicant's job applications"""
-    applications = JobApplication.objects.filter(applicant=request.user).order_by('-applied_at')
+    applications = JobApplication.objects.filter(
+        applicant=request.user
+    ).select_related('job').order_by('-applied_at')
     
     context = {
         'template_data': {
@@ -242,12 +266,20 @@ def my_applications(request):
     
     return render(request, 'jobs/my_applications.html', context)
 
+@query_budget(7)
 @applicant_required
 def application_detail(request, pk):
     """View a specific application with status timeline"""
-    application = get_object_or_404(JobApplication, pk=pk, applicant=request.user)
+    application = get_object_or_404(JobApplication.objects.select_related('job'), pk=pk, applicant=request.user)
     job = application.job
     
+    # One query, oldest first, for both the progress steps and the full history
+    events = list(application.status_events.all())
+    reached = {}
+    for event in events:
+        step = 'closed' if event.to_status in ('accepted', 'rejected', 'withdrawn') else event.to_status
+        reached[step] = event.created_at
+    
     # Define canonical steps for UI
     steps = ['applied', 'review', 'interview', 'offer', 'closed']
     # Map terminal statuses to 'closed'
@@ -263,8 +295,9 @@ def application_detail(request, pk):
         },
         'application': application,
         'job': job,
-        'steps': steps,
-        'current_index': current_index
+        'steps': [(step, reached.get(step)) for step in steps],
+        'current_index': current_index,
+        'events': events,
     }
     return render(request, 'jobs/application_detail.html', context)
 
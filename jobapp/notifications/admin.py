@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['application', 'from_status', 'to_status', 'created_at']
+    list_filter = ['to_status']
+    list_select_related = ['application__job', 'application__applicant']
+    raw_id_fields = ['application']
@@ -0,0 +1,86 @@
+"""
+Notification emails for application events.
+
+ApplicationStatusEvent.record() reports every new application and status
+change, whether from save() or bulk_transition(), in the transaction that
+makes it. The notifications signal receiver adds a Notification row per
+event and queues the deliver_notifications task NOTIFICATION_DELAY_SECONDS
+ahead under one key. Later events in that window join the batch already
+waiting, so nothing is rendered or sent on the request path.
+
+deliver_pending() takes up to NOTIFICATION_BATCH_SIZE notifications and
+renders one email per recipient covering all their updates, with only the
+latest change kept for each application. It sends them all over a single
+get_connection() connection. The rows are deleted in the task's
+transaction. If the mail server fails, the batch rolls back and the queue
+retries it, so a recipient may get an email twice but never misses one.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection
+from django.template.loader import render_to_string
+
+from .models import Notification
+
+# Task key of the pending delivery
+DELIVERY_KEY = 'notifications'
+
+
+def delivery_delay():
+    """Seconds events are collected before they are mailed"""
+    return getattr(settings, 'NOTIFICATION_DELAY_SECONDS', 60)
+
+
+def _take(batch_size):
+    """The oldest pending notifications, locked against concurrent deliveries where the database can"""
+    pending = Notification.objects.order_by('id')
+    if connection.features.has_select_for_update_skip_locked:
+        pks = list(pending.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+    else:
+        # SQLite: the task's write transaction already excludes other workers
+        pks = list(pending.values_list('pk', flat=True)[:batch_size])
+    return list(Notification.objects.filter(pk__in=pks).select_related(
+        'application__job__posted_by', 'application__applicant'
+    ).order_by('id'))
+
+
+def build_message(recipient, notifications):
+    """One email telling recipient about notifications"""
+    if len(notifications) == 1:
+        subject = notifications[0].summary
+    elif notifications[0].for_recruiter:
+        subject = f"{len(notifications)} updates on your job postings"
+    else:
+        subject = f"{len(notifications)} updates on your job applications"
+    body = render_to_string('notifications/email.txt', {
+        'recipient': recipient,
+        'notifications': notifications,
+        'site_url': getattr(settings, 'SITE_URL', ''),
+    })
+    return EmailMessage(subject, body, to=[recipient.email])
+
+
+def deliver_pending(batch_size=None):
+    """Email a batch of pending notifications; True if more are waiting"""
+    batch_size = batch_size or getattr(settings, 'NOTIFICATION_BATCH_SIZE', 500)
+    notifications = _take(batch_size)
+    if not notifications:
+        return False
+    # recipient -> application -> its latest notification
+    by_recipient = defaultdict(dict)
+    recipients = {}
+    for notification in notifications:
+        recipient = notification.recipient
+        if recipient.email:
+            recipients[recipient.pk] = recipient
+            by_recipient[recipient.pk][notification.application_id, notification.for_recruiter] = notification
+    messages = [
+        build_message(recipients[pk], list(latest.values())) for pk, latest in by_recipient.items()
+    ]
+    if messages:
+        with get_connection() as mail:
+            mail.send_messages(messages)
+    Notification.objects.filter(pk__in=[n.pk for n in notifications]).delete()
+    return len(notifications) == batch_size and Notification.objects.exists()
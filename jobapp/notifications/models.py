@@ -0,0 +1,53 @@
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+from jobs.models import JobApplication
+
+
+class Notification(models.Model):
+    """
+    An application event waiting to be emailed (see notifications/delivery.py).
+    The applicant hears about the recruiter's moves; the recruiter hears about
+    new and withdrawn applications. Rows are deleted once mailed.
+    """
+
+    # Statuses the applicant moves to themselves
+    APPLICANT_ACTIONS = ('applied', 'withdrawn')
+
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='notifications')
+    from_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status}"
+
+    @property
+    def for_recruiter(self):
+        return self.to_status in self.APPLICANT_ACTIONS
+
+    @property
+    def recipient(self):
+        """Who is told: the other side of the application from whoever acted"""
+        return self.application.job.posted_by if self.for_recruiter else self.application.applicant
+
+    @property
+    def summary(self):
+        job = self.application.job
+        if self.for_recruiter:
+            applicant = self.application.applicant
+            name = applicant.get_full_name() or applicant.username
+            if self.to_status == 'withdrawn':
+                return f"{name} withdrew their application for {job.title}"
+            return f"{name} applied for {job.title}"
+        return f"Your application for {job.title} at {job.company}: {self.get_to_status_display()}"
+
+    @property
+    def path(self):
+        """Where the recipient can follow up"""
+        if self.for_recruiter:
+            return reverse('jobs:pipeline', args=[self.application.job_id])
+        return reverse('jobs:application_detail', args=[self.application_id])
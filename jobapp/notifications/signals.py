@@ -0,0 +1,19 @@
+from django.dispatch import receiver
+from jobs.models import status_events_recorded
+from tasks.queue import enqueue
+from . import tasks
+from .delivery import DELIVERY_KEY, delivery_delay
+from .models import Notification
+
+
+@receiver(status_events_recorded)
+def queue_notifications(sender, events, **kwargs):
+    """Store emails to send about new applications and status changes, and queue their delivery"""
+    Notification.objects.bulk_create([
+        Notification(
+            application_id=event.application_id, from_status=event.from_status,
+            to_status=event.to_status, created_at=event.created_at,
+        )
+        for event in events
+    ])
+    enqueue(tasks.deliver_notifications, delay=delivery_delay(), key=DELIVERY_KEY)
@@ -0,0 +1,10 @@
+"""Background delivery of notification emails (see notifications/delivery.py)"""
+from tasks.queue import enqueue, task
+from .delivery import DELIVERY_KEY, deliver_pending
+
+
+@task
+def deliver_notifications():
+    """Email a batch of pending notifications, then queue the next if more are waiting"""
+    if deliver_pending():
+        enqueue(deliver_notifications, key=DELIVERY_KEY)
@@ -0,0 +1,127 @@
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import JobApplication
+from jobs.transitions import bulk_transition
+from perf.testing import apply_to, make_applicant, make_jobs, make_recruiter
+from tasks.models import Task
+from tasks.queue import run_pending
+from .delivery import deliver_pending
+from .models import Notification
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that counts the connections made"""
+    connections = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingBackend.connections += 1
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionRefusedError('mail server down')
+
+
+class NotificationTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+        self.job, self.other_job = make_jobs(self.recruiter, 2)
+        self.applicant = make_applicant('applicant')
+        # Leave only notification deliveries in the queue
+        Task.objects.all().delete()
+
+    def deliver(self):
+        """Run the queued delivery now instead of after the coalescing window"""
+        Task.objects.update(run_after=timezone.now())
+        return run_pending()
+
+    def test_apply_queues_the_recruiter_email(self):
+        self.client.force_login(self.applicant)
+        response = self.client.post(reverse('jobs:apply', args=[self.job.pk]), {'cover_letter': 'Hello'})
+        self.assertRedirects(response, reverse('jobs:detail', args=[self.job.pk]), fetch_redirect_response=False)
+        # Nothing is sent during the request; delivery waits for the window
+        self.assertEqual(mail.outbox, [])
+        delivery = Task.objects.get()
+        self.assertGreater(delivery.run_after, timezone.now())
+        self.assertEqual(run_pending(), (0, 0))
+
+        self.assertEqual(self.deliver(), (1, 0))
+        message, = mail.outbox
+        self.assertEqual(message.to, ['recruiter@example.com'])
+        self.assertEqual(message.subject, f'Applicant Tester applied for {self.job.title}')
+        self.assertIn(reverse('jobs:pipeline', args=[self.job.pk]), message.body)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_events_coalesce_per_recipient(self):
+        other = make_applicant('other')
+        application, _ = apply_to(self.applicant, [self.job, self.other_job])
+        apply_to(other, [self.job])
+        bulk_transition(self.job, 'review')
+        application = JobApplication.objects.get(pk=application.pk)
+        application.status = 'interview'
+        application.save()
+        bulk_transition(self.other_job, 'rejected')
+        # One delivery task however many events
+        self.assertEqual(Task.objects.count(), 1)
+
+        CountingBackend.connections = 0
+        with override_settings(EMAIL_BACKEND='notifications.tests.CountingBackend'):
+            self.assertEqual(self.deliver(), (1, 0))
+        self.assertEqual(CountingBackend.connections, 1)
+        sent = {tuple(message.to): message for message in mail.outbox}
+        self.assertEqual(
+            sorted(sent), [('applicant@example.com',), ('other@example.com',), ('recruiter@example.com',)]
+        )
+        self.assertEqual(sent['recruiter@example.com',].subject, '3 updates on your job postings')
+        body = sent['applicant@example.com',].body
+        self.assertEqual(sent['applicant@example.com',].subject, '2 updates on your job applications')
+        # Only the application's latest status
+        self.assertIn(f'Your application for {self.job.title} at {self.job.company}: Interview', body)
+        self.assertNotIn('Under Review', body)
+        self.assertIn(f'{self.other_job.title} at {self.other_job.company}: Rejected', body)
+        self.assertEqual(
+            sent['other@example.com',].subject,
+            f'Your application for {self.job.title} at {self.job.company}: Under Review'
+        )
+
+    def test_withdrawal_goes_to_the_recruiter(self):
+        application, = apply_to(self.applicant, [self.job])
+        deliver_pending()
+        mail.outbox.clear()
+        application.status = 'withdrawn'
+        application.save()
+        deliver_pending()
+        message, = mail.outbox
+        self.assertEqual(message.to, ['recruiter@example.com'])
+        self.assertEqual(message.subject, f'Applicant Tester withdrew their application for {self.job.title}')
+
+    def test_batches_and_recipients_without_email(self):
+        applicants = [make_applicant(f'applicant-{i}') for i in range(3)]
+        applicants[0].email = ''
+        applicants[0].save()
+        for applicant in applicants:
+            apply_to(applicant, [self.job])
+        bulk_transition(self.job, 'review')
+        Notification.objects.filter(to_status='applied').delete()
+
+        self.assertTrue(deliver_pending(batch_size=2))
+        self.assertEqual([m.to for m in mail.outbox], [['applicant-1@example.com']])
+        self.assertFalse(deliver_pending(batch_size=2))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(Notification.objects.exists())
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingBackend')
+    def test_failed_delivery_is_retried(self):
+        apply_to(self.applicant, [self.job])
+        self.assertEqual(self.deliver(), (0, 1))
+        self.assertEqual(Notification.objects.count(), 1)
+        delivery = Task.objects.get()
+        self.assertEqual((delivery.status, delivery.attempts), ('queued', 1))
+        self.assertIn('mail server down', delivery.last_error)
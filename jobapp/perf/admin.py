@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import QueryFingerprint
+
+
+@admin.register(QueryFingerprint)
+class QueryFingerprintAdmin(admin.ModelAdmin):
+    list_display = ['view', 'fingerprint', 'count', 'total_time', 'max_time', 'last_seen']
+    list_filter = ['view']
+    search_fields = ['fingerprint']
+    readonly_fields = ['fingerprint_hash']
@@ -0,0 +1,250 @@
+"""
+Benchmarks of the hot request paths against seeded datasets.
+
+Each scenario sends a series of requests through the Django test client,
+as an anonymous visitor, an applicant or a recruiter. It measures:
+
+- latency percentiles, plus the first request after clearing the caches;
+- queries per request;
+- the Server-Timing phases when PERF_PROFILING is on;
+- peak Python memory per request (tracemalloc).
+
+Memory is measured in a separate, shorter pass, because tracing
+allocations slows every request down.
+
+run_benchmark() measures whatever database is configured. The benchmark
+command seeds a fresh test database per dataset size with
+generate_load_data and saves the results as JSON tagged with the commit.
+"""
+import math
+import random
+import re
+import statistics
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from applicants.models import ApplicantProfile
+from jobs.models import Job, JobApplication
+from .queries import track_queries
+
+PERCENTILES = (50, 90, 95, 99)
+
+JOB_FILTERS = {
+    'unfiltered': {},
+    'remote': {'remote_type': 'remote'},
+    'type_level': {'job_type': 'full_time', 'experience_level': 'senior'},
+    'location': {'location': 'New York, NY'},
+    'keywords': {'keywords': 'python developer'},
+    'skills': {'skills': 'Python, SQL'},
+    'salary_hybrid': {'salary_min': '120000', 'remote_type': 'hybrid'},
+    'visa': {'visa_sponsorship': 'on'},
+}
+CANDIDATE_FILTERS = {
+    'unfiltered': {},
+    'skills': {'skills': 'Python, Django'},
+    'location': {'location': 'San Francisco, CA'},
+    'experience_education': {'experience_years': '3-5', 'education_level': 'bachelor'},
+    'keywords': {'keywords': 'engineer'},
+    'near': {'near': 'Austin, TX', 'radius': '50'},
+    'remote_seeking': {'remote_preference': 'remote_only', 'is_seeking_jobs': 'on'},
+}
+
+SERVER_TIMING = re.compile(r'(\w+);dur=([\d.]+)')
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Who sends the requests: 'anonymous', 'applicant' or 'recruiter'
+    role: str
+    # (fixtures, count) -> [(method, path, POST data or None)]
+    requests: Callable
+
+
+def with_query(path, params):
+    return f'{path}?{urlencode(params)}' if params else path
+
+
+def rotate(items, count):
+    return [items[i % len(items)] for i in range(count)] if items else []
+
+
+def _job_list(params):
+    return lambda fixtures, count: [('get', with_query(reverse('jobs:list'), params), None)] * count
+
+
+def _candidates(params):
+    return lambda fixtures, count: [('get', with_query(reverse('recruiters:candidates'), params), None)] * count
+
+
+def _job_detail(fixtures, count):
+    return [('get', reverse('jobs:detail', args=[pk]), None) for pk in rotate(fixtures['job_ids'], count)]
+
+
+def _job_apply(fixtures, count):
+    # Each POST applies to a new job; the fixtures hold jobs the applicant hasn't applied to
+    jobs, fixtures['apply_job_ids'] = fixtures['apply_job_ids'][:count], fixtures['apply_job_ids'][count:]
+    return [('post', reverse('jobs:apply', args=[pk]), {'cover_letter': 'Benchmark application.'}) for pk in jobs]
+
+
+def _candidate_detail(fixtures, count):
+    return [
+        ('get', reverse('recruiters:candidate_detail', args=[pk]), None)
+        for pk in rotate(fixtures['candidate_ids'], count)
+    ]
+
+
+def _my_applications(fixtures, count):
+    return [('get', reverse('jobs:my_applications'), None)] * count
+
+
+SCENARIOS = [
+    Scenario('job_list:anonymous', 'anonymous', _job_list({})),
+    *(Scenario(f'job_list:{name}', 'applicant', _job_list(params)) for name, params in JOB_FILTERS.items()),
+    Scenario('job_detail', 'applicant', _job_detail),
+    Scenario('job_apply', 'applicant', _job_apply),
+    *(Scenario(f'candidates:{name}', 'recruiter', _candidates(params)) for name, params in CANDIDATE_FILTERS.items()),
+    Scenario('candidate_detail', 'recruiter', _candidate_detail),
+    Scenario('my_applications', 'applicant', _my_applications),
+]
+
+
+def load_fixtures(sample=200, seed=0):
+    """The users and object ids the scenarios request, picked from the current database"""
+    rng = random.Random(seed)
+    # The busiest applicant and recruiter make for the heaviest pages
+    applicant = JobApplication.objects.values('applicant').annotate(total=Count('pk')).order_by('-total').first()
+    if applicant is None:
+        applicant = {'applicant': ApplicantProfile.objects.values_list('user_id', flat=True).first()}
+    recruiter = Job.objects.values('posted_by').annotate(total=Count('pk')).order_by('-total').first()
+    if applicant['applicant'] is None or recruiter is None:
+        raise ValueError('The database needs at least one applicant and one job to benchmark')
+
+    # Traffic favours recent postings and recently updated candidates
+    recent_jobs = list(
+        Job.objects.filter(is_active=True).order_by('-created_at', '-id').values_list('pk', flat=True)[:sample * 10]
+    )
+    recent_candidates = list(
+        ApplicantProfile.objects.filter(is_public=True).order_by('-updated_at', '-id')
+        .values_list('pk', flat=True)[:sample * 10]
+    )
+    applied = set(
+        JobApplication.objects.filter(applicant_id=applicant['applicant'], job_id__in=recent_jobs)
+        .values_list('job_id', flat=True)
+    )
+    job_ids = rng.sample(recent_jobs, min(sample, len(recent_jobs)))
+    return {
+        'applicant_id': applicant['applicant'],
+        'recruiter_id': recruiter['posted_by'],
+        'job_ids': job_ids,
+        'apply_job_ids': [pk for pk in recent_jobs if pk not in applied],
+        'candidate_ids': rng.sample(recent_candidates, min(sample, len(recent_candidates))),
+    }
+
+
+def percentile(ordered, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(cold_ms, latencies, queries, phases, errors):
+    """Results of a scenario; cold_ms is its first request, made right after clearing the caches"""
+    ordered = sorted(latencies)
+    result = {'requests': len(latencies), 'errors': errors}
+    if not ordered:
+        return result
+    result.update({'cold_ms': round(cold_ms, 2), 'mean_ms': round(statistics.fmean(latencies), 2)})
+    for percent in PERCENTILES:
+        result[f'p{percent}_ms'] = round(percentile(ordered, percent), 2)
+    result['max_ms'] = round(ordered[-1], 2)
+    result['queries'] = {'min': min(queries), 'max': max(queries), 'mean': round(statistics.fmean(queries), 1)}
+    if phases:
+        result['server_timing_ms'] = {phase: round(statistics.fmean(values), 2) for phase, values in phases.items()}
+    return result
+
+
+class Runner:
+    """Sends scenario requests with one logged-in client per role"""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.clients = {'anonymous': Client(), 'applicant': Client(), 'recruiter': Client()}
+        self.clients['applicant'].force_login(User.objects.get(pk=fixtures['applicant_id']))
+        self.clients['recruiter'].force_login(User.objects.get(pk=fixtures['recruiter_id']))
+
+    def send(self, client, method, path, data):
+        return getattr(client, method)(path, data)
+
+    def timed(self, client, request):
+        """(milliseconds, queries, response) for one request"""
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = self.send(client, *request)
+        return (time.perf_counter() - start) * 1000, stats.count, response
+
+    def run(self, scenario, requests, warmup=0, memory_requests=0):
+        client = self.clients[scenario.role]
+        planned = scenario.requests(self.fixtures, 1 + warmup + requests + memory_requests)
+        if not planned:
+            return summarize(None, [], [], {}, 0)
+        cold, planned = planned[0], planned[1:]
+        warmup_requests, timed, traced = (
+            planned[:warmup], planned[warmup:warmup + requests], planned[warmup + requests:]
+        )
+
+        for cache in caches.all():
+            cache.clear()
+        cold_ms = self.timed(client, cold)[0]
+        for request in warmup_requests:
+            self.send(client, *request)
+
+        latencies, queries, phases, errors = [], [], {}, 0
+        for request in timed:
+            ms, count, response = self.timed(client, request)
+            latencies.append(ms)
+            queries.append(count)
+            if response.status_code not in (200, 302):
+                errors += 1
+            for phase, duration in SERVER_TIMING.findall(response.get('Server-Timing', '')):
+                phases.setdefault(phase, []).append(float(duration))
+        result = summarize(cold_ms, latencies, queries, phases, errors)
+
+        if traced:
+            peaks = []
+            tracemalloc.start()
+            try:
+                for request in traced:
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    self.send(client, *request)
+                    peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            finally:
+                tracemalloc.stop()
+            result['peak_kb'] = round(max(peaks) / 1024, 1)
+        return result
+
+
+def run_benchmark(requests=30, warmup=3, memory_requests=5, scenarios=None, log=None):
+    """{scenario name: results} for the scenarios (default: all) against the current database"""
+    log = log or (lambda message: None)
+    runner = Runner(load_fixtures())
+    results = {}
+    for scenario in scenarios or SCENARIOS:
+        results[scenario.name] = result = runner.run(scenario, requests, warmup, memory_requests)
+        if result['requests']:
+            log(
+                f'{scenario.name:<34} p50 {result["p50_ms"]:>8.1f} ms  p95 {result["p95_ms"]:>8.1f} ms  '
+                f'queries {result["queries"]["mean"]:>5}  peak {result.get("peak_kb", 0):>8.1f} KB'
+                + (f'  {result["errors"]} errors' if result['errors'] else '')
+            )
+        else:
+            log(f'{scenario.name:<34} skipped: nothing to request')
+    return results
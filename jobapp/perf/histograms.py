@@ -0,0 +1,109 @@
+"""
+Rolling per-view latency histograms.
+
+Latencies are counted in log-spaced buckets (about 10% wide), so a
+histogram is a fixed-size list of integers no matter how many requests it
+sees and percentiles are accurate to one bucket. The window is split into
+slices that are recycled as they age out, so reports cover roughly the
+last PERF_HISTOGRAM_WINDOW seconds. Histograms are per process: with
+several workers each one reports its own traffic.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+
+# Bucket i holds latencies up to MIN_MS * GROWTH ** (i + 1)
+MIN_MS = 0.1
+GROWTH = 1.1
+BUCKETS = int(math.log(100_000 / MIN_MS, GROWTH)) + 1
+
+SLICES = 10
+
+
+def bucket_for(ms):
+    if ms <= MIN_MS:
+        return 0
+    return min(int(math.log(ms / MIN_MS, GROWTH)), BUCKETS - 1)
+
+
+def bucket_upper_ms(index):
+    return MIN_MS * GROWTH ** (index + 1)
+
+
+class LatencyHistogram:
+    """Bucketed latencies over a rolling window of window seconds"""
+
+    def __init__(self, window):
+        self.slice_seconds = window / SLICES
+        # [(slice start, bucket counts)], oldest first
+        self.slices = []
+
+    def _current_slice(self, now):
+        if not self.slices or now - self.slices[-1][0] >= self.slice_seconds:
+            self.slices.append((now, [0] * BUCKETS))
+            del self.slices[:-SLICES]
+        return self.slices[-1][1]
+
+    def record(self, ms, now=None):
+        now = time.monotonic() if now is None else now
+        self._current_slice(now)[bucket_for(ms)] += 1
+
+    def counts(self, now=None):
+        """Bucket counts summed over the slices still inside the window"""
+        now = time.monotonic() if now is None else now
+        horizon = now - self.slice_seconds * SLICES
+        totals = [0] * BUCKETS
+        for start, counts in self.slices:
+            if start >= horizon:
+                totals = [a + b for a, b in zip(totals, counts)]
+        return totals
+
+    def summary(self, percentiles=(50, 95, 99), now=None):
+        """{'count': n, 'p50': ms, ...}; percentiles are bucket upper bounds"""
+        counts = self.counts(now)
+        total = sum(counts)
+        summary = {'count': total}
+        for percentile in percentiles:
+            summary[f'p{percentile}'] = None
+        if not total:
+            return summary
+        targets = sorted((math.ceil(total * percentile / 100), percentile) for percentile in percentiles)
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            while targets and seen >= targets[0][0]:
+                summary[f'p{targets.pop(0)[1]}'] = round(bucket_upper_ms(index), 1)
+            if not targets:
+                break
+        return summary
+
+
+_lock = threading.Lock()
+_histograms = {}
+
+
+def window_seconds():
+    return getattr(settings, 'PERF_HISTOGRAM_WINDOW', 600)
+
+
+def record_latency(view_name, ms):
+    with _lock:
+        histogram = _histograms.get(view_name)
+        if histogram is None:
+            histogram = _histograms[view_name] = LatencyHistogram(window_seconds())
+        histogram.record(ms)
+
+
+def latency_report():
+    """{view name: summary} for every view seen in the window, busiest first"""
+    with _lock:
+        summaries = {name: histogram.summary() for name, histogram in _histograms.items()}
+    summaries = {name: summary for name, summary in summaries.items() if summary['count']}
+    return dict(sorted(summaries.items(), key=lambda item: -item[1]['count']))
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
@@ -0,0 +1,178 @@
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from perf.benchmark import SCENARIOS, run_benchmark
+from perf.synthetic import generate_load_data
+
+# Dataset size name -> applicants; jobs and recruiters scale with it
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+PREFIX = 'bench'
+
+
+def dataset(applicants):
+    return {'applicants': applicants, 'jobs': applicants // 2, 'recruiters': max(10, applicants // 500)}
+
+
+def git_commit():
+    try:
+        head = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{head}-dirty' if dirty else head
+
+
+@contextmanager
+def benchmark_database(label, data_dir, keepdb):
+    """Switch to a dedicated test database for one dataset size"""
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    saved_test_name = test_settings.get('NAME')
+    if connection.vendor == 'sqlite':
+        # On disk rather than in memory, so generator workers can share it
+        test_settings['NAME'] = str(Path(data_dir) / f'benchmark_{label}.sqlite3')
+    else:
+        test_settings['NAME'] = f'{connection.settings_dict["NAME"]}_benchmark_{label}'
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        test_settings['NAME'] = saved_test_name
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the hot request paths (job list filters, job detail, applying, candidate '
+        'search, candidate detail, my applications) against seeded datasets of each size, '
+        'reporting latency percentiles, queries and peak memory per scenario. Results are '
+        'saved as JSON for comparing commits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='10k',
+            help=f'Comma-separated dataset sizes in applicants ({", ".join(SIZES)} or a number); '
+                 'jobs are half that and recruiters one per 500'
+        )
+        parser.add_argument('--requests', type=int, default=30, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests before each scenario')
+        parser.add_argument('--memory-requests', type=int, default=5, help='Requests traced for peak memory')
+        parser.add_argument('--scenarios', default='*', help='Comma-separated name patterns, e.g. "job_list:*"')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Data generation processes')
+        parser.add_argument('--data-dir', default=tempfile.gettempdir(), help='Where SQLite datasets are kept')
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Keep the seeded databases and reuse them next time instead of seeding again'
+        )
+        parser.add_argument('--output', help='JSON results file (default: benchmark-<commit>.json)')
+        parser.add_argument('--compare', help='Earlier results file to compare against')
+
+    def handle(self, *args, **options):
+        sizes = {}
+        for label in options['sizes'].split(','):
+            label = label.strip().lower()
+            try:
+                sizes[label] = SIZES[label] if label in SIZES else int(label)
+            except ValueError:
+                raise CommandError(f'Unknown dataset size "{label}"')
+        patterns = [pattern.strip() for pattern in options['scenarios'].split(',')]
+        scenarios = [s for s in SCENARIOS if any(fnmatch.fnmatchcase(s.name, pattern) for pattern in patterns)]
+        if not scenarios:
+            raise CommandError(f'No scenarios match {options["scenarios"]!r}')
+        baseline = self.load(options['compare']) if options['compare'] else None
+
+        commit = git_commit()
+        report = {
+            'commit': commit,
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'settings': {'requests': options['requests'], 'warmup': options['warmup'], 'seed': options['seed']},
+            'sizes': {},
+        }
+        # Like the test runner: no DEBUG query logging, and the test client's host is allowed.
+        # Query counts are reported per scenario, so budget warnings would only add noise.
+        with override_settings(
+            DEBUG=False, QUERY_BUDGET_WARNINGS=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+        ):
+            for label, applicants in sizes.items():
+                report['sizes'][label] = self.benchmark_size(label, applicants, scenarios, options)
+
+        output = options['output'] or f'benchmark-{commit}.json'
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Saved results to {output}'))
+        if baseline:
+            self.compare(baseline, report)
+
+    def benchmark_size(self, label, applicants, scenarios, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Dataset {label} ({applicants} applicants)'))
+        with benchmark_database(label, options['data_dir'], options['keepdb']):
+            counts = dataset(applicants)
+            if User.objects.filter(username__startswith=f'{PREFIX}-').exists():
+                self.stdout.write('Reusing the seeded database')
+            else:
+                start = time.perf_counter()
+                generate_load_data(
+                    **counts, seed=options['seed'], prefix=PREFIX, processes=options['processes'],
+                    log=self.stdout.write,
+                )
+                counts['seed_seconds'] = round(time.perf_counter() - start, 1)
+            return {
+                'dataset': counts,
+                'scenarios': run_benchmark(
+                    options['requests'], options['warmup'], options['memory_requests'], scenarios,
+                    log=self.stdout.write,
+                ),
+            }
+
+    def load(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+    def compare(self, baseline, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Compared with {baseline.get("commit", "baseline")}'))
+        for label, size in report['sizes'].items():
+            before_size = baseline.get('sizes', {}).get(label)
+            if not before_size:
+                continue
+            for name, after in size['scenarios'].items():
+                before = before_size['scenarios'].get(name)
+                if not before or not before.get('requests') or not after.get('requests'):
+                    continue
+                changes = [
+                    self.change(f'{metric}', before[f'{metric}_ms'], after[f'{metric}_ms'], 'ms')
+                    for metric in ('p50', 'p95')
+                ]
+                changes.append(self.change('queries', before['queries']['mean'], after['queries']['mean'], ''))
+                self.stdout.write(f'{label:>5} {name:<34} ' + '  '.join(changes))
+
+    def change(self, metric, before, after, unit):
+        percent = f' ({(after - before) / before:+.0%})' if before else ''
+        return f'{metric} {before}{unit} -> {after}{unit}{percent}'
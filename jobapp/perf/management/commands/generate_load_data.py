@@ -0,0 +1,51 @@
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from perf.synthetic import generate_load_data
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic recruiters, jobs, applicants, work history, education and '
+        'applications at production scale for load tests and benchmarks. The same '
+        '--seed always produces the same data. Rows are split into chunks across a '
+        'process pool; each worker builds its chunk and bulk-inserts it in one '
+        'transaction (taking turns on SQLite). Run rebuild_similar_jobs and '
+        'build_recommendations afterwards if the views under test need them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applicants', type=int, default=10_000)
+        parser.add_argument('--recruiters', type=int, default=200)
+        parser.add_argument('--jobs', type=int, default=5_000)
+        parser.add_argument('--applications', type=float, default=4.0, help='Mean applications per applicant')
+        parser.add_argument('--experience', type=float, default=3.0, help='Mean roles per applicant')
+        parser.add_argument('--education', type=float, default=1.2, help='Mean education records per applicant')
+        parser.add_argument('--days', type=int, default=365, help='Days of history to spread postings over')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='load', help='Username prefix for generated users')
+        parser.add_argument('--password', default='load-test-password', help='Password of every generated user')
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per worker task and transaction')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(
+                f'Users named "{prefix}-..." already exist; pass another --prefix or use a fresh database'
+            )
+        if options['jobs'] and not options['recruiters']:
+            raise CommandError('Jobs need at least one recruiter')
+
+        created = generate_load_data(
+            applicants=options['applicants'], recruiters=options['recruiters'], jobs=options['jobs'],
+            applications=options['applications'], experience=options['experience'],
+            education=options['education'], days=options['days'], seed=options['seed'], prefix=prefix,
+            password=options['password'], processes=options['processes'],
+            chunk_size=options['chunk_size'], batch_size=options['batch_size'], log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Generated ' + ', '.join(f'{count} {label}' for label, count in created.items())
+        ))
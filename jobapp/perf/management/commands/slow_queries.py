@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from perf.models import QueryFingerprint
+from perf.querylog import query_log
+
+ORDERINGS = {
+    'total': '-total_time',
+    'max': '-max_time',
+    'count': '-count',
+    'avg': '-average',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'List the SQL fingerprints with the most database time, per view, '
+        'to decide which indexes to add.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Fingerprints to show')
+        parser.add_argument('--sort', choices=sorted(ORDERINGS), default='total', help='Ordering (default: total time)')
+        parser.add_argument('--view', help='Only fingerprints from this view (URL name, e.g. jobs:list)')
+        parser.add_argument('--plans', action='store_true', help='Show the slowest statement and its EXPLAIN plan')
+        parser.add_argument('--reset', action='store_true', help='Delete the collected statistics')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            query_log.take_pending(force=True)
+            deleted, _ = QueryFingerprint.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} fingerprints'))
+            return
+
+        query_log.flush(force=True)
+        fingerprints = QueryFingerprint.objects.annotate(average=F('total_time') / F('count'))
+        if options['view']:
+            fingerprints = fingerprints.filter(view=options['view'])
+        fingerprints = fingerprints.order_by(ORDERINGS[options['sort']], 'pk')[:options['top']]
+
+        for entry in fingerprints:
+            self.stdout.write(
+                f'{entry.count:>8}x  total {entry.total_time * 1000:>10.1f} ms  '
+                f'avg {entry.average_time * 1000:>8.2f} ms  max {entry.max_time * 1000:>8.1f} ms  '
+                f'{entry.view or "-"}'
+            )
+            self.stdout.write(f'    {entry.fingerprint}')
+            if options['plans'] and entry.slowest_sql:
+                self.stdout.write(f'    slowest: {entry.slowest_sql}')
+                for line in entry.slowest_plan.splitlines():
+                    self.stdout.write(f'      {line}')
@@ -0,0 +1,170 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+from .histograms import record_latency
+from .queries import track_queries
+from .querylog import set_current_view
+from .timing import current_timings, end_request, start_request
+
+logger = logging.getLogger('perf.queries')
+
+PROFILE_PARAM = '__profile'
+PROFILE_SALT = 'perf.profile'
+# Rows of cProfile output returned for a profiled request
+PROFILE_LINES = 60
+
+
+class QueryBudgetMiddleware:
+    """
+    Record SQL statistics for every request as request.query_stats.
+
+    When QUERY_BUDGET_WARNINGS is on (defaults to DEBUG), a request whose
+    view runs more queries than its @query_budget logs a warning listing
+    the most repeated statements. Also tags queries with the view name
+    for the query log (perf/querylog.py). Should come first in MIDDLEWARE
+    so session and user queries are counted too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.query_budget = None
+        try:
+            with track_queries() as stats:
+                request.query_stats = stats
+                response = self.get_response(request)
+        finally:
+            set_current_view('')
+        warn = getattr(settings, 'QUERY_BUDGET_WARNINGS', settings.DEBUG)
+        if warn and request.query_budget is not None and stats.count > request.query_budget:
+            self.log_overrun(request, stats)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, 'query_budget', None)
+        set_current_view(request.resolver_match.view_name)
+
+    def log_overrun(self, request, stats):
+        repeated = '\n'.join(
+            f'  {executions}x {sql[:200]}' for sql, executions in stats.duplicates()[:5]
+        )
+        logger.warning(
+            '%s %s ran %d queries (budget %d) in %.1f ms%s',
+            request.method, request.path, stats.count, request.query_budget, stats.duration * 1000,
+            f'\nRepeated statements:\n{repeated}' if repeated else ''
+        )
+
+
+def profiling_enabled():
+    return getattr(settings, 'PERF_PROFILING', False)
+
+
+def make_profile_token(path):
+    """Signed value for ?__profile= that allows profiling requests to path"""
+    return signing.dumps(path, salt=PROFILE_SALT)
+
+
+def valid_profile_token(token, path):
+    try:
+        signed_path = signing.loads(
+            token, salt=PROFILE_SALT, max_age=getattr(settings, 'PERF_PROFILE_TOKEN_MAX_AGE', 300)
+        )
+    except signing.BadSignature:
+        return False
+    return signed_path == path
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in (PERF_PROFILING) request profiling.
+
+    Every response gets a Server-Timing header with the time spent in SQL,
+    template rendering, session loading/saving, the view and the rest of
+    the middleware stack, and its total is added to the view's latency
+    histogram (reported at /__perf__/). Phases overlap: queries run while
+    rendering count towards both db and template.
+
+    A request carrying a valid ?__profile=<token> (see make_profile_token)
+    returns its cProfile statistics as plain text instead of the page.
+
+    Must come first in MIDDLEWARE, with ViewTimingMiddleware last. Both
+    are synchronous, so under ASGI Django runs them in the same thread as
+    the view and the profiler sees the whole request.
+    """
+
+    def __init__(self, get_response):
+        if not profiling_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request.GET.get(PROFILE_PARAM)
+        if token and valid_profile_token(token, request.path):
+            return self.profile(request)
+
+        timings, reset_token = start_request()
+        start = time.perf_counter()
+        try:
+            with track_queries() as stats:
+                response = self.get_response(request)
+        finally:
+            end_request(reset_token)
+        total = time.perf_counter() - start
+
+        timings['db'] = stats.duration
+        timings['middleware'] = max(total - timings['view'], 0.0)
+        response['Server-Timing'] = self.server_timing(timings, stats, total)
+
+        match = request.resolver_match
+        record_latency(match.view_name if match else '<unresolved>', total * 1000)
+        return response
+
+    def server_timing(self, timings, stats, total):
+        metrics = [
+            f'db;dur={timings["db"] * 1000:.1f};desc="SQL ({stats.count} queries)"',
+            f'tpl;dur={timings["template"] * 1000:.1f};desc="Templates"',
+            f'session;dur={timings["session"] * 1000:.1f};desc="Session"',
+            f'view;dur={timings["view"] * 1000:.1f};desc="View"',
+            f'mw;dur={timings["middleware"] * 1000:.1f};desc="Middleware"',
+            f'total;dur={total * 1000:.1f}',
+        ]
+        return ', '.join(metrics)
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        profiler.runcall(self.get_response, request)
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(PROFILE_LINES)
+        return HttpResponse(output.getvalue(), content_type='text/plain; charset=utf-8')
+
+
+class ViewTimingMiddleware:
+    """
+    Innermost half of ProfilingMiddleware: times URL resolution, the view
+    and template responses, so the outer half can tell view time from
+    middleware time. Must come last in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        if not profiling_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = current_timings()
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            if timings is not None:
+                timings['view'] += time.perf_counter() - start
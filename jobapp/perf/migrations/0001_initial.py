@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view', models.CharField(blank=True, help_text='URL name of the view, blank outside requests', max_length=200)),
+                ('fingerprint_hash', models.CharField(help_text='md5 of view and fingerprint', max_length=32, unique=True)),
+                ('fingerprint', models.TextField(help_text='SQL with literals stripped')),
+                ('count', models.PositiveBigIntegerField(default=0)),
+                ('total_time', models.FloatField(default=0, help_text='Seconds')),
+                ('max_time', models.FloatField(default=0, help_text='Seconds')),
+                ('slowest_sql', models.TextField(blank=True, help_text='Slowest logged execution, with parameters')),
+                ('slowest_plan', models.TextField(blank=True, help_text='EXPLAIN output for slowest_sql')),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_time'], name='perf_fingerprint_total_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:23
+
+from django.db import migrations, models
+
+from perf.queries import fingerprint
+
+
+def strip_stored_params(apps, schema_editor):
+    """Replace stored slow statements, which carried their parameters, with their fingerprints"""
+    QueryFingerprint = apps.get_model('perf', 'QueryFingerprint')
+    entries = list(QueryFingerprint.objects.exclude(slowest_sql='').only('pk', 'slowest_sql'))
+    for entry in entries:
+        entry.slowest_sql = fingerprint(entry.slowest_sql.split(' -- params: ')[0])
+    QueryFingerprint.objects.bulk_update(entries, ['slowest_sql'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perf', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='queryfingerprint',
+            name='slowest_sql',
+            field=models.TextField(blank=True, help_text='Slowest logged execution (with parameters only under SLOW_QUERY_LOG_PARAMS)'),
+        ),
+        migrations.RunPython(strip_stored_params, migrations.RunPython.noop),
+    ]
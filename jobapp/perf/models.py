@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class QueryFingerprint(models.Model):
+    """Aggregated timings of one normalized SQL statement per view (see perf/querylog.py)"""
+
+    view = models.CharField(max_length=200, blank=True, help_text="URL name of the view, blank outside requests")
+    fingerprint_hash = models.CharField(max_length=32, unique=True, help_text="md5 of view and fingerprint")
+    fingerprint = models.TextField(help_text="SQL with literals stripped")
+    count = models.PositiveBigIntegerField(default=0)
+    total_time = models.FloatField(default=0, help_text="Seconds")
+    max_time = models.FloatField(default=0, help_text="Seconds")
+    slowest_sql = models.TextField(
+        blank=True, help_text="Slowest logged execution (with parameters only under SLOW_QUERY_LOG_PARAMS)"
+    )
+    slowest_plan = models.TextField(blank=True, help_text="EXPLAIN output for slowest_sql")
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_time'], name='perf_fingerprint_total_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.view or '-'}: {self.fingerprint[:80]}"
+
+    @property
+    def average_time(self):
+        return self.total_time / self.count if self.count else 0.0
@@ -0,0 +1,86 @@
+"""
+Per-request SQL accounting.
+
+QueryStats is installed as a database execute wrapper and counts every
+query, the time spent in the database and how often each statement ran.
+Statements are grouped by fingerprint (literals and IN lists collapsed),
+so the same query repeated once per row - the signature of an N+1 loop -
+stands out. Views declare how many queries they should need with
+@query_budget; QueryBudgetMiddleware and perf.testing check it.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """SQL with literals, placeholders and IN lists normalized"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql.replace('%s', '?'))
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    """Execute wrapper counting queries, SQL time and repeated statements"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # Raw SQL -> executions; fingerprinted lazily, off the hot path
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def fingerprints(self):
+        counts = Counter()
+        for sql, executions in self.statements.items():
+            counts[fingerprint(sql)] += executions
+        return counts
+
+    def duplicates(self, threshold=2):
+        """[(fingerprint, executions)] for statements run at least threshold times, most frequent first"""
+        return [(sql, executions) for sql, executions in self.fingerprints.most_common() if executions >= threshold]
+
+
+@contextmanager
+def track_queries(using=None):
+    """Collect QueryStats for every query run inside the block (all databases by default)"""
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for alias in [using] if using else connections:
+            stack.enter_context(connections[alias].execute_wrapper(stats))
+        yield stats
+
+
+def query_budget(queries):
+    """
+    Declare the most queries a view may run per request.
+
+    Apply it outermost so the budget survives other decorators:
+
+    @query_budget(8)
+    @recruiter_required
+    def candidates(request):
+        ...
+    """
+    def decorator(view_func):
+        view_func.query_budget = queries
+        return view_func
+    return decorator
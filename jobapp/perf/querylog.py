@@ -0,0 +1,237 @@
+"""
+Slow-query log and per-fingerprint query statistics.
+
+QueryLog is installed as a permanent execute wrapper on every database
+connection. Each statement is fingerprinted (perf.queries.fingerprint)
+and its count, total and maximum time are aggregated in memory per
+(view, fingerprint), then added to QueryFingerprint in batches at the end
+of a request or background task, like search statistics, and once more
+when a task worker or other process exits (perf/signals.py). Statements slower than
+SLOW_QUERY_MS are logged right away to the "perf.slow_queries" logger
+with their view and EXPLAIN plan.
+
+Parameters can hold password hashes, e-mail addresses and profile text,
+so slow statements are logged and stored as their fingerprint; the SQL
+with its parameters is only kept with SLOW_QUERY_LOG_PARAMS, for local
+debugging.
+
+The slow_queries management command lists the heaviest fingerprints.
+"""
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .queries import fingerprint
+
+logger = logging.getLogger('perf.slow_queries')
+
+# Rows per UPDATE when flushing statistics
+FLUSH_BATCH_SIZE = 100
+
+# URL name of the view being handled, set by QueryBudgetMiddleware
+_current_view = contextvars.ContextVar('perf_current_view', default='')
+# Set while the log runs its own queries (EXPLAIN, flushing) so they aren't logged
+_suspended = contextvars.ContextVar('perf_querylog_suspended', default=False)
+
+
+def set_current_view(view_name):
+    """Tag queries run from now on in this context with view_name"""
+    _current_view.set(view_name)
+
+
+@contextmanager
+def suspend_query_log():
+    """Leave queries run inside the block out of the log (bulk loads, the log's own writes)"""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+@lru_cache(maxsize=4096)
+def cached_fingerprint(sql):
+    # ORM statements keep parameters out of the SQL, so the same text repeats
+    return fingerprint(sql)
+
+
+def slow_query_seconds():
+    return getattr(settings, 'SLOW_QUERY_MS', 100) / 1000
+
+
+def explain(connection, sql, params):
+    """EXPLAIN output for a SELECT, or '' when the database can't explain it"""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    token = _suspended.set(True)
+    # A failed EXPLAIN must not break the caller's transaction
+    guard = transaction.atomic(using=connection.alias) if connection.in_atomic_block else nullcontext()
+    try:
+        with guard:
+            with connection.cursor() as cursor:
+                cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+                return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+    except DatabaseError:
+        return ''
+    finally:
+        _suspended.reset(token)
+
+
+def format_sql(sql, params):
+    """Slow statement as logged and stored: its fingerprint unless parameters are opted in"""
+    if getattr(settings, 'SLOW_QUERY_LOG_PARAMS', False):
+        return f'{sql} -- params: {params!r}' if params else sql
+    return cached_fingerprint(sql)
+
+
+class QueryLog:
+    """Execute wrapper aggregating timings per fingerprint and logging slow statements"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (view, fingerprint) -> [count, total seconds, max seconds, slowest SQL, slowest plan]
+        self.pending = {}
+        self.last_flush = time.monotonic()
+
+    def __call__(self, execute, sql, params, many, context):
+        if _suspended.get():
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = execute(sql, params, many, context)
+            failed = False
+            return result
+        finally:
+            self.record(context['connection'], sql, params, many, time.perf_counter() - start, failed)
+
+    def record(self, connection, sql, params, many, duration, failed=False):
+        view = _current_view.get()
+        slowest_sql = plan = ''
+        if duration >= slow_query_seconds():
+            slowest_sql = format_sql(sql, params)
+            if not (many or failed):
+                plan = explain(connection, sql, params)
+            logger.warning(
+                'Slow query (%.1f ms) in %s: %s%s',
+                duration * 1000, view or 'no view', slowest_sql, f'\nPlan:\n{plan}' if plan else ''
+            )
+
+        key = (view, cached_fingerprint(sql))
+        with self.lock:
+            stats = self.pending.get(key)
+            if stats is None:
+                self.pending[key] = [1, duration, duration, slowest_sql, plan]
+                return
+            stats[0] += 1
+            stats[1] += duration
+            if duration > stats[2]:
+                stats[2] = duration
+                if slowest_sql:
+                    stats[3], stats[4] = slowest_sql, plan
+
+    def take_pending(self, force=False):
+        """Pending statistics if a flush is due (or forced), clearing them"""
+        with self.lock:
+            due = force or (
+                len(self.pending) >= getattr(settings, 'QUERY_STATS_FLUSH_SIZE', 500) or
+                time.monotonic() - self.last_flush >= getattr(settings, 'QUERY_STATS_FLUSH_SECONDS', 60)
+            )
+            if not due or not self.pending:
+                return {}
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        return pending
+
+    def flush(self, force=False):
+        """Add pending statistics to QueryFingerprint if a flush is due; returns the entries written"""
+        pending = self.take_pending(force)
+        if pending:
+            with suspend_query_log():
+                save_fingerprints(pending)
+        return len(pending)
+
+
+def save_fingerprints(pending):
+    """Add pending statistics to QueryFingerprint in a few bulk statements"""
+    from .models import QueryFingerprint
+
+    now = timezone.now()
+    rows = {
+        hashlib.md5(f'{view}\n{statement}'.encode()).hexdigest(): (view, statement, *stats)
+        for (view, statement), stats in pending.items()
+    }
+    existing = dict(
+        QueryFingerprint.objects.filter(fingerprint_hash__in=list(rows)).values_list('fingerprint_hash', 'pk')
+    )
+    new = [
+        QueryFingerprint(
+            view=view, fingerprint_hash=fingerprint_hash, fingerprint=statement,
+            count=count, total_time=total, max_time=longest,
+            slowest_sql=slowest_sql, slowest_plan=plan, last_seen=now
+        )
+        for fingerprint_hash, (view, statement, count, total, longest, slowest_sql, plan) in rows.items()
+        if fingerprint_hash not in existing
+    ]
+    if new:
+        try:
+            with transaction.atomic():
+                QueryFingerprint.objects.bulk_create(new)
+        except IntegrityError:
+            # Another process created some of them meanwhile: fall back to one upsert per row
+            for entry in new:
+                _save_fingerprint(entry.fingerprint_hash, *rows[entry.fingerprint_hash], now)
+
+    # Every column is computed from the row's old values, within one UPDATE per batch
+    updates = []
+    for fingerprint_hash, pk in existing.items():
+        _, _, count, total, longest, slowest_sql, plan = rows[fingerprint_hash]
+        entry = QueryFingerprint(
+            pk=pk, count=F('count') + count, total_time=F('total_time') + total,
+            max_time=Greatest('max_time', longest), last_seen=now,
+            slowest_sql=F('slowest_sql'), slowest_plan=F('slowest_plan'),
+        )
+        if slowest_sql:
+            entry.slowest_sql = Case(When(max_time__lt=longest, then=Value(slowest_sql)), default=F('slowest_sql'))
+            entry.slowest_plan = Case(When(max_time__lt=longest, then=Value(plan)), default=F('slowest_plan'))
+        updates.append(entry)
+    QueryFingerprint.objects.bulk_update(
+        updates, ['count', 'total_time', 'max_time', 'last_seen', 'slowest_sql', 'slowest_plan'],
+        batch_size=FLUSH_BATCH_SIZE
+    )
+
+
+def _save_fingerprint(fingerprint_hash, view, statement, count, total, longest, slowest_sql, plan, now):
+    from .models import QueryFingerprint
+
+    entries = QueryFingerprint.objects.filter(fingerprint_hash=fingerprint_hash)
+    if slowest_sql:
+        entries.filter(max_time__lt=longest).update(slowest_sql=slowest_sql, slowest_plan=plan)
+    updated = entries.update(
+        count=F('count') + count, total_time=F('total_time') + total,
+        max_time=Greatest('max_time', longest), last_seen=now
+    )
+    if not updated:
+        QueryFingerprint.objects.create(
+            view=view, fingerprint_hash=fingerprint_hash, fingerprint=statement,
+            count=count, total_time=total, max_time=longest,
+            slowest_sql=slowest_sql, slowest_plan=plan, last_seen=now
+        )
+
+
+query_log = QueryLog()
+
+
+def install_query_log(connection):
+    if getattr(settings, 'QUERY_LOG_ENABLED', True) and query_log not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, query_log)
@@ -0,0 +1,23 @@
+"""
+Database session store that charges loading and saving to the current request.
+
+Identical to django.contrib.sessions.backends.db outside profiled requests.
+"""
+from django.contrib.sessions.backends import db
+
+from .timing import timed
+
+
+class SessionStore(db.SessionStore):
+
+    def load(self):
+        with timed('session'):
+            return super().load()
+
+    def save(self, must_create=False):
+        with timed('session'):
+            return super().save(must_create)
+
+    def delete(self, session_key=None):
+        with timed('session'):
+            return super().delete(session_key)
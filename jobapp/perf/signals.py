@@ -0,0 +1,50 @@
+import atexit
+import logging
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from tasks.queue import task_finished, worker_stopped
+from .querylog import install_query_log, query_log, suspend_query_log
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(connection_created)
+def add_query_log(sender, connection, **kwargs):
+    """Log and aggregate every statement run on new database connections"""
+    install_query_log(connection)
+
+
+@receiver(request_finished)
+@receiver(task_finished)
+def flush_query_log(sender, **kwargs):
+    """Write aggregated query statistics once a flush is due"""
+    query_log.flush()
+
+
+@receiver(worker_stopped)
+def flush_query_log_now(sender, **kwargs):
+    """Write what a stopping task worker has left (worker processes exit without atexit handlers)"""
+    query_log.flush(force=True)
+
+
+def flush_query_log_at_exit():
+    """Management commands and other processes without requests write their statistics on the way out"""
+    from .models import QueryFingerprint
+
+    try:
+        with suspend_query_log():
+            # Not migrated yet (or a command like migrate running before the table exists)
+            if QueryFingerprint._meta.db_table not in connection.introspection.table_names():
+                return
+        query_log.flush(force=True)
+    except DatabaseError:
+        logger.warning('Could not write query statistics at exit', exc_info=True)
+
+
+if getattr(settings, 'QUERY_LOG_ENABLED', True):
+    atexit.register(flush_query_log_at_exit)
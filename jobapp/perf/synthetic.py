@@ -0,0 +1,544 @@
+"""
+Synthetic data at production scale, for load tests and benchmarks.
+
+generate_load_data() creates recruiters, jobs and applicants with their
+profiles, work history, education, skill links and applications. The
+rows are split into chunks across a process pool. Each worker builds its
+chunk and bulk_creates it in batches inside one transaction. On SQLite,
+which allows a single writer, the transactions take turns under a shared
+lock while the other workers keep building.
+
+Every row draws from its own random generator seeded from the seed and
+the row number, so the same seed and counts produce the same data
+whatever the chunk size or number of processes (dates are relative to
+the start of the run).
+
+bulk_create skips save() and post_save, so the data those normally derive
+is filled in directly: gazetteer locations, experience_months,
+education_level, skill links and application status events (created,
+then one move to the current status). The per-status application
+counters and stage times are recounted and the keyword index is rebuilt
+at the end; recommendations and similar jobs are left to their rebuild
+commands.
+"""
+import bisect
+import csv
+import itertools
+import math
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from decimal import Decimal
+from multiprocessing import Pool
+
+import django
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from applicants.education import highest_education_level
+from applicants.experience import total_experience_months
+from applicants.models import ApplicantProfile, ApplicantSkill, Education, WorkExperience
+from geo.gazetteer import DATA_DIR, get_gazetteer
+from jobapp.versions import bump_version
+from jobs.models import ApplicationStatusEvent, Job, JobApplication, JobSkill, JobStageTime, RecruiterStageTime
+from jobs.search import get_search_backend
+from recruiters.models import RecruiterProfile
+from skills.utils import get_or_create_skills, normalize_skill
+from .querylog import suspend_query_log
+
+# Role family -> (titles, skills in order of popularity), and its share of jobs and people
+FAMILIES = {
+    'backend': (
+        ['Backend Engineer', 'Software Engineer', 'Python Developer', 'Java Developer', 'API Engineer'],
+        ['Python', 'SQL', 'Django', 'Java', 'PostgreSQL', 'Docker', 'AWS', 'Go', 'REST APIs', 'Redis',
+         'Spring Boot', 'Node.js', 'Kafka', 'Ruby on Rails', 'C#', '.NET'],
+    ),
+    'frontend': (
+        ['Frontend Engineer', 'Web Developer', 'UI Engineer', 'React Developer'],
+        ['JavaScript', 'React', 'TypeScript', 'HTML', 'CSS', 'Node.js', 'Vue.js', 'Angular', 'Next.js',
+         'GraphQL', 'Webpack', 'Figma'],
+    ),
+    'data': (
+        ['Data Engineer', 'Data Scientist', 'Machine Learning Engineer', 'Data Analyst', 'Analytics Engineer'],
+        ['Python', 'SQL', 'Pandas', 'Machine Learning', 'Spark', 'Airflow', 'Tableau', 'Statistics',
+         'TensorFlow', 'PyTorch', 'dbt', 'Snowflake'],
+    ),
+    'devops': (
+        ['DevOps Engineer', 'Site Reliability Engineer', 'Platform Engineer', 'Cloud Engineer'],
+        ['AWS', 'Kubernetes', 'Docker', 'Linux', 'Terraform', 'Python', 'CI/CD', 'Go', 'Prometheus',
+         'GCP', 'Azure', 'Ansible'],
+    ),
+    'mobile': (
+        ['iOS Developer', 'Android Developer', 'Mobile Engineer'],
+        ['Swift', 'Kotlin', 'iOS', 'Android', 'React Native', 'Java', 'Flutter', 'Firebase',
+         'Objective-C', 'GraphQL'],
+    ),
+    'design': (
+        ['Product Designer', 'UX Designer', 'UI Designer'],
+        ['Figma', 'UI/UX Design', 'Prototyping', 'User Research', 'Sketch', 'Adobe Creative Suite',
+         'HTML', 'CSS'],
+    ),
+    'product': (
+        ['Product Manager', 'Technical Program Manager', 'Project Manager'],
+        ['Agile', 'Jira', 'Scrum', 'Roadmapping', 'SQL', 'Analytics', 'A/B Testing',
+         'Stakeholder Management'],
+    ),
+}
+FAMILY_WEIGHTS = {'backend': 30, 'frontend': 20, 'data': 18, 'devops': 12, 'mobile': 8, 'design': 6, 'product': 6}
+
+# Job.EXPERIENCE_CHOICES -> (share of jobs, median yearly salary, title prefix)
+LEVELS = {
+    'entry': (0.20, 68_000, 'Junior'),
+    'mid': (0.40, 98_000, ''),
+    'senior': (0.32, 138_000, 'Senior'),
+    'executive': (0.08, 190_000, 'Principal'),
+}
+JOB_TYPES = {'full_time': 78, 'contract': 10, 'part_time': 5, 'internship': 4, 'temporary': 3}
+REMOTE_TYPES = {'onsite': 45, 'hybrid': 35, 'remote': 20}
+REMOTE_PREFERENCES = {'flexible': 40, 'hybrid': 25, 'remote_only': 20, 'onsite_only': 15}
+APPLICATION_STATUSES = {
+    'applied': 45, 'review': 20, 'rejected': 15, 'interview': 12, 'offer': 3, 'withdrawn': 3, 'accepted': 2,
+}
+# Degree -> (share, years of study)
+DEGREES = {
+    "Bachelor of Science": (40, 4), "Bachelor of Arts": (15, 4), "Master of Science": (14, 2),
+    'High School Diploma': (13, 4), 'Associate of Science': (8, 2), 'MBA': (6, 2), 'PhD': (4, 5),
+}
+FIELDS_OF_STUDY = [
+    'Computer Science', 'Software Engineering', 'Information Systems', 'Mathematics', 'Statistics',
+    'Electrical Engineering', 'Physics', 'Economics', 'Business Administration', 'Graphic Design',
+]
+INSTITUTIONS = [
+    'State University', 'Institute of Technology', 'Community College', 'Polytechnic University',
+    'City College', 'University of the West', 'Northern University', 'Coastal University',
+]
+FIRST_NAMES = [
+    'James', 'Mary', 'Wei', 'Priya', 'Carlos', 'Fatima', 'John', 'Aisha', 'Michael', 'Elena', 'David',
+    'Yuki', 'Sarah', 'Ahmed', 'Daniel', 'Sofia', 'Kwame', 'Olga', 'Lucas', 'Mei', 'Robert', 'Ana',
+    'Arjun', 'Emma', 'Diego', 'Chloe', 'Omar', 'Hannah', 'Ivan', 'Grace',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Garcia', 'Chen', 'Patel', 'Kim', 'Nguyen', 'Brown', 'Martinez', 'Lee',
+    'Williams', 'Khan', 'Silva', 'Müller', 'Rossi', 'Tanaka', 'Okafor', 'Novak', 'Cohen', 'Singh',
+    'Davis', 'Lopez', 'Wilson', 'Ivanova', 'Andersson', 'Dubois', 'Murphy', 'Haddad', 'Park', 'Jones',
+]
+COMPANY_WORDS = [
+    'Blue', 'North', 'Bright', 'Summit', 'Cedar', 'Atlas', 'Nova', 'Harbor', 'Quantum', 'Maple',
+    'Iron', 'Silver', 'Pioneer', 'Vertex', 'Orbit', 'Lumen', 'Granite', 'Signal', 'Beacon', 'Crest',
+]
+COMPANY_SUFFIXES = [
+    'Labs', 'Systems', 'Health', 'Analytics', 'Software', 'Logistics', 'Bank', 'Media', 'Energy', 'Retail',
+]
+INDUSTRIES = {
+    'Labs': 'Technology', 'Systems': 'Technology', 'Health': 'Healthcare', 'Analytics': 'Technology',
+    'Software': 'Technology', 'Logistics': 'Transportation', 'Bank': 'Financial Services',
+    'Media': 'Media', 'Energy': 'Energy', 'Retail': 'Retail',
+}
+COMPANY_SIZES = {'startup': 25, 'small': 25, 'medium': 25, 'large': 15, 'enterprise': 10}
+
+
+class Choice:
+    """Weighted choice over a fixed population, with cumulative weights computed once"""
+
+    def __init__(self, weights):
+        self.items = list(weights)
+        self.cumulative = list(itertools.accumulate(weights.values()))
+
+    def __call__(self, rng):
+        return self.items[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+    def sample(self, rng, k):
+        """k distinct items, more popular ones more often"""
+        k = min(k, len(self.items))
+        chosen = []
+        while len(chosen) < k:
+            item = self(rng)
+            if item not in chosen:
+                chosen.append(item)
+        return chosen
+
+
+def zipf(items, exponent=1.0):
+    """Weights falling off with rank, for lists ordered by popularity"""
+    return {item: 1 / (rank + 1) ** exponent for rank, item in enumerate(items)}
+
+
+def count_around(rng, mean, shape=2.0):
+    """Non-negative integer with the given mean and a long tail"""
+    if mean <= 0:
+        return 0
+    return int(round(rng.gammavariate(shape, mean / shape)))
+
+
+def country_names():
+    with open(DATA_DIR / 'countries.csv', newline='', encoding='utf-8') as f:
+        return {row['code']: row['name'] for row in csv.DictReader(f)}
+
+
+class Distributions:
+    """Population-weighted places and the per-family skill and title distributions"""
+
+    def __init__(self):
+        gazetteer = get_gazetteer()
+        # The bundled places are listed roughly by population
+        self.places = Choice(zipf([gazetteer.place(index) for index in range(len(gazetteer.ids))], 0.8))
+        self.countries = country_names()
+        self.families = Choice(FAMILY_WEIGHTS)
+        self.skills = {family: Choice(zipf(skills)) for family, (_, skills) in FAMILIES.items()}
+        self.levels = Choice({level: share for level, (share, _, _) in LEVELS.items()})
+        self.job_types = Choice(JOB_TYPES)
+        self.remote_types = Choice(REMOTE_TYPES)
+        self.remote_preferences = Choice(REMOTE_PREFERENCES)
+        self.statuses = Choice(APPLICATION_STATUSES)
+        self.degrees = Choice({degree: share for degree, (share, _) in DEGREES.items()})
+        self.company_sizes = Choice(COMPANY_SIZES)
+
+    def location(self, rng):
+        place = self.places(rng)
+        return {
+            'city': place.city, 'state': place.region, 'country': self.countries.get(place.country, place.country),
+            # bulk_create skips save(), which normally fills these in from the gazetteer
+            'location_id': place.id,
+            'latitude': Decimal(str(place.latitude)), 'longitude': Decimal(str(place.longitude)),
+        }
+
+
+def all_skill_names():
+    return sorted({skill for _, skills in FAMILIES.values() for skill in skills})
+
+
+def company_name(number):
+    words = len(COMPANY_WORDS)
+    return f'{COMPANY_WORDS[number % words]} {COMPANY_SUFFIXES[number // words % len(COMPANY_SUFFIXES)]}' + (
+        f' {number // (words * len(COMPANY_SUFFIXES)) + 1}' if number >= words * len(COMPANY_SUFFIXES) else ''
+    )
+
+
+def person(rng, username):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        'username': username, 'first_name': first, 'last_name': last,
+        'email': f'{username}@example.com',
+    }
+
+
+def past(rng, now, days, skew=1.0):
+    """A moment in the last days days; skew > 1 favours recent moments"""
+    return now - timedelta(days=days * rng.random() ** skew)
+
+
+def between(rng, start, end):
+    return start + (end - start) * rng.random()
+
+
+# Per-worker state, set by _init_worker (or directly when generating in-process)
+_context = None
+_write_lock = None
+
+
+def _init_worker(context, write_lock=None):
+    global _context, _write_lock
+    if not apps.ready:
+        # Spawned (rather than forked) workers start without Django configured
+        django.setup()
+    _context = dict(context, distributions=Distributions())
+    _write_lock = write_lock
+
+
+def _rng(kind, number):
+    # Per-row generators keep the data independent of chunking and process count
+    return random.Random(f'{_context["seed"]}:{kind}:{number}')
+
+
+def _username(kind, number):
+    return f'{_context["prefix"]}-{kind}{number}'
+
+
+def _new_user(rng, username, joined):
+    return User(**person(rng, username), password=_context['password'], date_joined=joined)
+
+
+def build_recruiters(numbers):
+    """Recruiter users with their UserProfile and RecruiterProfile"""
+    now, days, dist = _context['now'], _context['days'], _context['distributions']
+    users, user_profiles, recruiter_profiles = [], [], []
+    for number in numbers:
+        rng = _rng('recruiter', number)
+        joined = past(rng, now, days * 2)
+        user = _new_user(rng, _username('r', number), joined)
+        company = company_name(number)
+        users.append(user)
+        user_profiles.append(UserProfile(user=user, user_type='recruiter', created_at=joined, updated_at=joined))
+        location = dist.location(rng)
+        recruiter_profiles.append(RecruiterProfile(
+            user=user, company_name=company, company_size=dist.company_sizes(rng),
+            industry=INDUSTRIES[company.split()[1]], city=location['city'], state=location['state'],
+            country=location['country'], website=f'https://{company.lower().replace(" ", "")}.example.com',
+            company_description=f'{company} builds products for customers around the world.',
+            created_at=joined, updated_at=joined,
+        ))
+    return [users, user_profiles, recruiter_profiles]
+
+
+def build_jobs(numbers):
+    """Jobs, spread over the recruiters, with their JobSkill links"""
+    now, days, dist = _context['now'], _context['days'], _context['distributions']
+    recruiters, skill_ids = _context['recruiters'], _context['skill_ids']
+    jobs, links = [], []
+    for number in numbers:
+        rng = _rng('job', number)
+        # A few recruiters post most of the jobs
+        company, recruiter_id = recruiters[int(len(recruiters) * rng.random() ** 2)]
+        family = dist.families(rng)
+        level = dist.levels(rng)
+        _, median, prefix = LEVELS[level]
+        title = f'{prefix} {rng.choice(FAMILIES[family][0])}'.strip()
+        skills = dist.skills[family].sample(rng, rng.randint(3, 8))
+        required, preferred = skills[:max(3, len(skills) - 3)], skills[max(3, len(skills) - 3):]
+        location = dist.location(rng)
+        remote_type = dist.remote_types(rng)
+
+        salary_min = salary_max = None
+        if rng.random() < 0.85:
+            # Salaries are roughly log-normal around the level's median
+            low = round(median * math.exp(rng.gauss(0, 0.25)), -3)
+            salary_min, salary_max = Decimal(low), Decimal(round(low * rng.uniform(1.1, 1.4), -3))
+        created = past(rng, now, days, skew=1.5)
+        job = Job(
+            title=title, company=company, posted_by_id=recruiter_id,
+            description=(
+                f'{company} is hiring a {title} to join our {family} team'
+                f'{" (remote friendly)" if remote_type != "onsite" else ""} in {location["city"]}. '
+                f'You will build and run services with {", ".join(skills[:3])}.'
+            ),
+            requirements=f'{rng.randint(1, 4) * (2 if level in ("senior", "executive") else 1)}+ years with '
+                         f'{", ".join(required)}.',
+            job_type=dist.job_types(rng), remote_type=remote_type, experience_level=level,
+            salary_min=salary_min, salary_max=salary_max,
+            required_skills=', '.join(required), preferred_skills=', '.join(preferred),
+            visa_sponsorship=rng.random() < 0.15,
+            # Older postings are more likely to be closed
+            is_active=rng.random() > 0.05 + 0.4 * (now - created).days / max(days, 1),
+            created_at=created, updated_at=between(rng, created, now),
+            **location,
+        )
+        jobs.append(job)
+        links.extend(
+            JobSkill(job=job, skill_id=skill_ids[normalize_skill(name)], is_required=name in required)
+            for name in skills
+        )
+    return [jobs, links]
+
+
+def career(rng, today, mean_roles):
+    """Back-to-back roles ending today (or recently), newest first: [(start, end, is_current)]"""
+    roles = []
+    end, is_current = today, rng.random() < 0.75
+    if not is_current:
+        end -= timedelta(days=rng.randint(14, 270))
+    for _ in range(count_around(rng, mean_roles)):
+        start = end - timedelta(days=int(rng.gammavariate(2.0, 365)) + 60)
+        roles.append((start, None if is_current else end, is_current))
+        end, is_current = start - timedelta(days=rng.randint(0, 120)), False
+    return roles
+
+
+def build_applicants(numbers):
+    """Applicants with profiles, history, skills and applications to the generated jobs"""
+    now, days, dist = _context['now'], _context['days'], _context['distributions']
+    skill_ids, job_ids, job_created = _context['skill_ids'], _context['job_ids'], _context['job_created']
+    today = now.date()
+    users, user_profiles, profiles, experience, education, links, applications, events = ([] for _ in range(8))
+    for number in numbers:
+        rng = _rng('applicant', number)
+        joined = past(rng, now, days * 2, skew=1.5)
+        user = _new_user(rng, _username('a', number), joined)
+        users.append(user)
+        user_profiles.append(UserProfile(user=user, user_type='applicant', created_at=joined, updated_at=joined))
+
+        family = dist.families(rng)
+        titles = FAMILIES[family][0]
+        skills = dist.skills[family].sample(rng, rng.randint(3, 10))
+        roles = career(rng, today, _context['experience'])
+        months = total_experience_months(roles, today)
+        degrees = [dist.degrees(rng) for _ in range(count_around(rng, _context['education'], shape=4.0))]
+        level = 'entry' if months < 30 else 'mid' if months < 72 else 'senior' if months < 150 else 'executive'
+
+        profile = ApplicantProfile(
+            user=user, headline=f'{LEVELS[level][2]} {titles[0]}'.strip(),
+            summary=f'{months // 12} years building products with {", ".join(skills[:3])}.',
+            skills=', '.join(skills), remote_work_preference=dist.remote_preferences(rng),
+            willing_to_relocate=rng.random() < 0.3, is_public=rng.random() < 0.85,
+            is_seeking_jobs=rng.random() < 0.65, experience_months=months, experience_updated_on=today,
+            education_level=highest_education_level(degrees),
+            created_at=joined, updated_at=between(rng, joined, now), **dist.location(rng),
+        )
+        profile.location = profile.get_full_location()
+        profiles.append(profile)
+        links.extend(ApplicantSkill(applicant=profile, skill_id=skill_ids[normalize_skill(name)]) for name in skills)
+
+        for order, (start, end, is_current) in enumerate(reversed(roles)):
+            experience.append(WorkExperience(
+                applicant=profile, company=company_name(rng.randrange(1000)), position=rng.choice(titles),
+                start_date=start, end_date=end, is_current=is_current, order=order,
+                description=f'Worked on {rng.choice(skills)} services with a team of {rng.randint(3, 12)}.',
+            ))
+        graduated = (roles[-1][0] if roles else today) - timedelta(days=rng.randint(0, 365))
+        for order, degree in enumerate(degrees):
+            start = graduated - timedelta(days=365 * DEGREES[degree][1])
+            education.append(Education(
+                applicant=profile, institution=f'{rng.choice(LAST_NAMES)} {rng.choice(INSTITUTIONS)}',
+                degree=degree, field_of_study=rng.choice(FIELDS_OF_STUDY),
+                start_date=start, end_date=graduated, order=order,
+            ))
+            graduated = start - timedelta(days=rng.randint(0, 720))
+
+        # Recent jobs (first in job_ids) attract most applications
+        wanted = min(count_around(rng, _context['applications'], shape=1.0), len(job_ids) // 2)
+        chosen = set()
+        while len(chosen) < wanted:
+            chosen.add(int(len(job_ids) * rng.random() ** 2))
+        for index in sorted(chosen):
+            applied = between(rng, job_created[index], now)
+            status = dist.statuses(rng)
+            changed = applied if status == 'applied' else between(rng, applied, now)
+            application = JobApplication(
+                job_id=job_ids[index], applicant=user, status=status, applied_at=applied,
+                updated_at=changed, status_changed_at=changed,
+            )
+            applications.append(application)
+            events.append(ApplicationStatusEvent(application=application, to_status='applied', created_at=applied))
+            if status != 'applied':
+                events.append(ApplicationStatusEvent(
+                    application=application, from_status='applied', to_status=status, created_at=changed,
+                    stage_seconds=int((changed - applied).total_seconds()),
+                ))
+    return [users, user_profiles, profiles, experience, education, links, applications, events]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the given created/updated times instead of auto_now(_add)"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def save_chunk(groups, batch_size):
+    """bulk_create each group of objects in order, in one transaction; returns rows written"""
+    rows = 0
+    with transaction.atomic():
+        for objects in groups:
+            if objects:
+                type(objects[0]).objects.bulk_create(objects, batch_size=batch_size)
+                rows += len(objects)
+    return rows
+
+
+# Chunk kind -> (builder, what the parent needs back about the saved rows)
+TASKS = {
+    'recruiters': (
+        build_recruiters, lambda groups: [(profile.company_name, profile.user_id) for profile in groups[2]]
+    ),
+    'jobs': (build_jobs, lambda groups: [(job.created_at, job.pk) for job in groups[0]]),
+    'applicants': (build_applicants, lambda groups: []),
+}
+TIMESTAMPED_MODELS = [User, UserProfile, RecruiterProfile, Job, ApplicantProfile, JobApplication]
+
+
+def _create_chunk(task):
+    kind, numbers = task
+    build, summarize = TASKS[kind]
+    groups = build(numbers)
+    with _write_lock or nullcontext(), suspend_query_log(), explicit_timestamps(*TIMESTAMPED_MODELS):
+        rows = save_chunk(groups, _context['batch_size'])
+    return rows, summarize(groups)
+
+
+def chunked(count, chunk_size):
+    return [range(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def generate_load_data(
+    applicants=10_000, recruiters=200, jobs=5_000, applications=4.0, experience=3.0, education=1.2,
+    days=365, seed=0, prefix='load', password='load-test-password', processes=1,
+    chunk_size=1000, batch_size=1000, log=None,
+):
+    """
+    Create the requested numbers of recruiters, jobs and applicants.
+
+    applications, experience and education are means per applicant. Usernames
+    are "<prefix>-r<n>" for recruiters and "<prefix>-a<n>" for applicants, and
+    all share one password. Returns {model label: rows created}.
+    """
+    log = log or (lambda message: None)
+    created = {}
+    context = {
+        'seed': seed, 'prefix': prefix, 'now': timezone.now(), 'days': days,
+        'applications': applications, 'experience': experience, 'education': education,
+        # Hashing is slow on purpose; every generated user shares this one hash
+        'password': make_password(password),
+        'batch_size': batch_size,
+        'skill_ids': {key: skill.pk for key, skill in get_or_create_skills(all_skill_names()).items()},
+    }
+
+    def run(kind, count):
+        start = time.perf_counter()
+        rows, saved = 0, []
+        tasks = [(kind, numbers) for numbers in chunked(count, chunk_size)]
+        if processes <= 1 or len(tasks) <= 1:
+            _init_worker(context)
+            results = map(_create_chunk, tasks)
+            for chunk_rows, chunk_saved in results:
+                rows += chunk_rows
+                saved.extend(chunk_saved)
+        else:
+            # SQLite allows one writer at a time; other databases insert in parallel
+            write_lock = multiprocessing.Lock() if connection.vendor == 'sqlite' else None
+            # Forked workers must not share the parent's database connection
+            connections.close_all()
+            with Pool(processes, _init_worker, (context, write_lock)) as pool:
+                for chunk_rows, chunk_saved in pool.imap_unordered(_create_chunk, tasks):
+                    rows += chunk_rows
+                    saved.extend(chunk_saved)
+        created[kind] = count
+        log(f'Created {count} {kind} ({rows} rows) in {time.perf_counter() - start:.1f}s')
+        return saved
+
+    # Sorted by company rather than id, which depends on the order chunks finish in
+    context['recruiters'] = sorted(run('recruiters', recruiters))
+    # Newest first, so applicants can favour recent postings
+    job_rows = sorted(run('jobs', jobs) if context['recruiters'] else [], reverse=True)
+    context['job_ids'] = [pk for _, pk in job_rows]
+    context['job_created'] = [created_at for created_at, _ in job_rows]
+    run('applicants', applicants)
+
+    start = time.perf_counter()
+    with suspend_query_log():
+        Job.recount_applications(context['job_ids'])
+        JobStageTime.rebuild()
+        RecruiterStageTime.rebuild()
+        indexed = get_search_backend().rebuild()
+        if connection.vendor in ('sqlite', 'postgresql'):
+            # Fresh planner statistics for the new data
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+    bump_version('jobs')
+    bump_version('profiles')
+    log(f'Indexed {indexed} jobs and analyzed tables in {time.perf_counter() - start:.1f}s')
+    return created
@@ -0,0 +1,236 @@
+"""
+Query-budget and query-plan assertions, and seed data for view tests.
+
+QueryBudgetTestCase.assertQueryBudget() requests a URL with cold caches
+and fails when the view runs more queries than its @query_budget.
+assertQueriesConstant() measures a URL, grows the dataset and measures
+again, so a query per row fails the suite even when the budget has slack.
+
+QueryPlanTestCase seeds a few thousand jobs and profiles, runs ANALYZE
+and fails any hot query whose EXPLAIN QUERY PLAN scans a whole table.
+"""
+import random
+import re
+import unittest
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import resolve
+
+from accounts.models import UserProfile
+from applicants.models import ApplicantProfile, ApplicantSkill, Education, WorkExperience
+from jobs.models import Job, JobApplication, JobSkill
+from geo.gazetteer import geocode_text
+from searches.cache import flush_recorded
+from skills.models import Skill
+from .queries import track_queries
+from .querylog import query_log
+
+PASSWORD = 'budget-test-password'
+
+
+def make_user(username, user_type, **fields):
+    user = User.objects.create_user(username, f'{username}@example.com', PASSWORD, **fields)
+    UserProfile.objects.create(user=user, user_type=user_type)
+    return user
+
+
+def make_applicant(username, experience=0, education=0, **profile_fields):
+    """Applicant with a public profile and the given number of experience/education entries"""
+    user = make_user(username, 'applicant', first_name=username.title(), last_name='Tester')
+    fields = {
+        'headline': 'Software Developer', 'skills': 'Python, Django, SQL',
+        'city': 'Austin', 'state': 'TX', 'country': 'United States',
+        'is_public': True, 'is_seeking_jobs': True,
+    }
+    fields.update(profile_fields)
+    profile = ApplicantProfile.objects.create(user=user, **fields)
+    add_history(profile, experience, education)
+    return user
+
+
+def add_history(profile, experience=0, education=0):
+    """Add work experience and education entries to an applicant profile"""
+    start = profile.work_experience.count()
+    for i in range(start, start + experience):
+        WorkExperience.objects.create(
+            applicant=profile, position=f'Engineer {i}', company=f'Company {i}',
+            description='Shipped things.', start_date=f'{2010 + i}-01-01', end_date=f'{2011 + i}-01-01'
+        )
+    start = profile.education.count()
+    for i in range(start, start + education):
+        Education.objects.create(
+            applicant=profile, institution=f'University {i}', degree="Bachelor's",
+            field_of_study='Computer Science', start_date=f'{2000 + i}-09-01', end_date=f'{2004 + i}-06-01'
+        )
+
+
+def make_recruiter(username):
+    return make_user(username, 'recruiter')
+
+
+def make_jobs(recruiter, count, start=0, **fields):
+    jobs = []
+    for i in range(start, start + count):
+        job_fields = {
+            'title': f'Python Developer {i}', 'company': f'Company {i}',
+            'description': 'Build and run Django services.', 'requirements': 'Three years of Python.',
+            'required_skills': 'Python, Django', 'city': 'Austin', 'state': 'TX',
+        }
+        job_fields.update(fields)
+        jobs.append(Job.objects.create(posted_by=recruiter, **job_fields))
+    return jobs
+
+
+def apply_to(applicant, jobs):
+    return [JobApplication.objects.create(job=job, applicant=applicant) for job in jobs]
+
+
+class QueryBudgetTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.clear_caches()
+
+    def clear_caches(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def login(self, user):
+        self.client.login(username=user.username, password=PASSWORD)
+
+    def measure(self, url):
+        """(response, QueryStats) for a GET of url with cold caches"""
+        self.clear_caches()
+        # Keep due query- and search-statistics flushes out of the measurement
+        query_log.flush(force=True)
+        flush_recorded()
+        with track_queries() as stats:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, f'GET {url} returned {response.status_code}')
+        return response, stats
+
+    def format_stats(self, stats):
+        return '\n'.join(f'  {executions}x {sql}' for sql, executions in stats.fingerprints.most_common())
+
+    def assertQueryBudget(self, url, budget=None):
+        """GET url and fail if it runs more queries than budget (default: the view's @query_budget)"""
+        if budget is None:
+            budget = getattr(resolve(urlsplit(url).path).func, 'query_budget', None)
+            self.assertIsNotNone(budget, f'The view for {url} declares no @query_budget')
+        response, stats = self.measure(url)
+        if stats.count > budget:
+            self.fail(f'GET {url} ran {stats.count} queries (budget {budget}):\n{self.format_stats(stats)}')
+        return response
+
+    def assertQueriesConstant(self, url, grow):
+        """Fail if GET url runs more queries after grow() adds rows to the page"""
+        _, before = self.measure(url)
+        grow()
+        _, after = self.measure(url)
+        if after.count != before.count:
+            self.fail(
+                f'GET {url} went from {before.count} to {after.count} queries as data grew:\n'
+                f'{self.format_stats(after)}'
+            )
+
+
+# "SCAN table" with no index after it; "SCAN t USING INDEX x" walks an index
+FULL_SCAN = re.compile(r'\bSCAN (\w+)$')
+
+SEED_SKILLS = ['Python', 'Django', 'SQL', 'JavaScript', 'React', 'AWS', 'Docker', 'Java', 'Go', 'Figma']
+SEED_CITIES = [
+    'Austin, TX', 'Seattle, WA', 'New York, NY', 'Chicago, IL',
+    'Denver, CO', 'Atlanta, GA', 'Boston, MA', 'San Francisco, CA',
+]
+
+
+def seed_location(place):
+    # bulk_create skips save(), which normally fills these in from the gazetteer
+    return {
+        'city': place.city, 'state': place.region, 'location_id': place.id,
+        'latitude': place.latitude, 'longitude': place.longitude,
+    }
+
+
+def seed_listings(jobs=2000, profiles=2000, seed=0):
+    """Bulk-create a recruiter, jobs and public/private applicant profiles with skill links"""
+    rng = random.Random(seed)
+    recruiter = make_recruiter('plan-recruiter')
+    skills = Skill.objects.bulk_create([Skill(name=name, normalized_name=name.lower()) for name in SEED_SKILLS])
+    places = [geocode_text(city) for city in SEED_CITIES]
+
+    created = Job.objects.bulk_create([
+        Job(
+            title=f'Job {i}', company=f'Company {i % 50}', description='Seeded job.', requirements='-',
+            posted_by=recruiter, **seed_location(rng.choice(places)),
+            is_active=rng.random() < 0.8,
+            job_type=rng.choice(Job.JOB_TYPE_CHOICES)[0],
+            remote_type=rng.choice(Job.REMOTE_CHOICES)[0],
+            experience_level=rng.choice(Job.EXPERIENCE_CHOICES)[0],
+            salary_min=rng.randrange(30, 200) * 1000,
+            visa_sponsorship=rng.random() < 0.15,
+        )
+        for i in range(jobs)
+    ], batch_size=500)
+    JobSkill.objects.bulk_create([
+        JobSkill(job=job, skill=skill) for job in created for skill in rng.sample(skills, 3)
+    ], batch_size=1000)
+
+    users = User.objects.bulk_create([User(username=f'plan-applicant-{i}') for i in range(profiles)], batch_size=500)
+    created = ApplicantProfile.objects.bulk_create([
+        ApplicantProfile(
+            user=user, is_public=rng.random() < 0.8, is_seeking_jobs=rng.random() < 0.7,
+            remote_work_preference=rng.choice(['remote_only', 'hybrid', 'onsite_only', 'flexible']),
+            experience_months=rng.randrange(0, 240), education_level=rng.randrange(0, 5),
+            **seed_location(rng.choice(places)),
+        )
+        for user in users
+    ], batch_size=500)
+    ApplicantSkill.objects.bulk_create([
+        ApplicantSkill(applicant=profile, skill=skill) for profile in created for skill in rng.sample(skills, 4)
+    ], batch_size=1000)
+
+    # Give the planner production-like statistics
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return recruiter
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite')
+class QueryPlanTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = seed_listings()
+
+    def full_scans(self, queryset):
+        plan = queryset.explain()
+        return plan, [match.group(1) for match in map(FULL_SCAN.search, plan.splitlines()) if match]
+
+    def assertNoFullScan(self, queryset):
+        plan, scans = self.full_scans(queryset)
+        if scans:
+            self.fail(f'Full scan of {", ".join(scans)}:\n{plan}\n\n{queryset.query}')
+
+    def assertOrderedByIndex(self, queryset):
+        """No full scan and no separate sort step"""
+        self.assertNoFullScan(queryset)
+        plan = queryset.explain()
+        if 'TEMP B-TREE FOR ORDER BY' in plan:
+            self.fail(f'Sorted without an index:\n{plan}\n\n{queryset.query}')
+
+    def search_querysets(self, search, query_string):
+        """The ordering-key and count queries a cached Search runs for a query string"""
+        params = search.canonicalize(QueryDict(query_string))
+        paginator = search.paginator(params)
+        names = [name for name, _ in paginator.fields]
+        keys = paginator.queryset.order_by(*paginator.ordering).values_list(*names)[:paginator.max_results + 1]
+        # Capped count (LISTING_COUNT_MODE); unfiltered listings read the first
+        # count_cap + 1 rows by design, so callers check it for filtered searches
+        count = paginator.queryset.order_by().values('pk')[:paginator.count_cap + 1]
+        return keys, count
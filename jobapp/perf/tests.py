@@ -0,0 +1,275 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from applicants.education import highest_education_level
+from applicants.experience import total_experience_months
+from applicants.models import ApplicantProfile
+from jobs.models import Job, JobApplication
+from jobs.tasks import refresh_similar_jobs
+from tasks.models import Task
+from tasks.queue import enqueue, run_pending
+from . import histograms
+from .middleware import PROFILE_PARAM, make_profile_token
+from .models import QueryFingerprint
+from .queries import fingerprint
+from .querylog import query_log
+from .benchmark import SCENARIOS, percentile, run_benchmark
+from .synthetic import generate_load_data
+from .testing import PASSWORD, QueryBudgetTestCase, make_jobs, make_recruiter
+
+
+class FingerprintTests(SimpleTestCase):
+
+    def test_literals_and_placeholders_collapse(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 'x''y' AND b = 42 AND c = %s"),
+            'SELECT * FROM t WHERE a = ? AND b = ? AND c = ?'
+        )
+
+    def test_in_lists_collapse(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s,%s)')
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        self.assertEqual(fingerprint('SELECT t1.id FROM t1'), 'SELECT t1.id FROM t1')
+
+
+class QueryBudgetMiddlewareTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_jobs(make_recruiter('recruiter'), 2)
+
+    def test_request_stats_are_recorded(self):
+        response = self.client.get(reverse('jobs:list'))
+        stats = response.wsgi_request.query_stats
+        self.assertGreater(stats.count, 0)
+        self.assertEqual(response.wsgi_request.query_budget, 8)
+
+    @override_settings(QUERY_BUDGET_WARNINGS=True)
+    def test_overrun_is_logged(self):
+        from jobs import views
+        budget = views.job_list.query_budget
+        views.job_list.query_budget = 0
+        try:
+            with self.assertLogs('perf.queries', 'WARNING') as logs:
+                self.client.get(reverse('jobs:list'))
+        finally:
+            views.job_list.query_budget = budget
+        self.assertIn('budget 0', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_WARNINGS=True)
+    def test_within_budget_is_quiet(self):
+        with self.assertNoLogs('perf.queries', 'WARNING'):
+            self.client.get(reverse('jobs:list'))
+
+
+class LatencyHistogramTests(SimpleTestCase):
+
+    def test_percentiles(self):
+        histogram = histograms.LatencyHistogram(window=60)
+        for ms in range(1, 101):
+            histogram.record(ms, now=0)
+        summary = histogram.summary(now=0)
+        self.assertEqual(summary['count'], 100)
+        # Percentiles are bucket upper bounds, within one bucket (10%) of the truth
+        self.assertAlmostEqual(summary['p50'], 50, delta=5)
+        self.assertAlmostEqual(summary['p95'], 95, delta=10)
+        self.assertAlmostEqual(summary['p99'], 99, delta=10)
+
+    def test_old_slices_leave_the_window(self):
+        histogram = histograms.LatencyHistogram(window=60)
+        histogram.record(500, now=0)
+        histogram.record(5, now=30)
+        self.assertEqual(histogram.summary(now=30)['count'], 2)
+        summary = histogram.summary(now=65)
+        self.assertEqual(summary['count'], 1)
+        self.assertLess(summary['p99'], 10)
+
+    def test_empty(self):
+        self.assertEqual(histograms.LatencyHistogram(window=60).summary()['p50'], None)
+
+
+@override_settings(PERF_PROFILING=True)
+class ProfilingMiddlewareTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        histograms.reset()
+        make_jobs(make_recruiter('recruiter'), 2)
+        self.staff = User.objects.create_user('staff', 'staff@example.com', PASSWORD, is_staff=True)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('jobs:list'))
+        phases = [metric.split(';')[0] for metric in response['Server-Timing'].split(', ')]
+        self.assertEqual(phases, ['db', 'tpl', 'session', 'view', 'mw', 'total'])
+
+    def test_report_is_staff_only(self):
+        self.client.get(reverse('jobs:list'))
+        self.assertEqual(self.client.get(reverse('perf:report')).status_code, 302)
+        self.login(self.staff)
+        views = self.client.get(reverse('perf:report')).json()['views']
+        self.assertEqual(views['jobs:list']['count'], 1)
+
+    def test_signed_profile_capture(self):
+        path = reverse('jobs:list')
+        response = self.client.get(path, {PROFILE_PARAM: make_profile_token(path)})
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertIn(b'function calls', response.content)
+
+    def test_profile_token_is_bound_to_path(self):
+        path = reverse('jobs:list')
+        response = self.client.get(path, {PROFILE_PARAM: make_profile_token('/other/')})
+        self.assertIn('text/html', response['Content-Type'])
+
+
+class QueryLogTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_jobs(make_recruiter('recruiter'), 2)
+        query_log.take_pending(force=True)
+
+    def test_statistics_are_aggregated_per_view_and_fingerprint(self):
+        self.client.get(reverse('jobs:list'))
+        list(Job.objects.filter(pk=1))
+        list(Job.objects.filter(pk=2))
+        query_log.flush(force=True)
+
+        self.assertTrue(QueryFingerprint.objects.filter(view='jobs:list').exists())
+        entry = QueryFingerprint.objects.get(view='', fingerprint__startswith='SELECT "jobs_job"."id"')
+        self.assertEqual(entry.count, 2)
+        self.assertGreaterEqual(entry.max_time, entry.total_time / 2)
+
+        list(Job.objects.filter(pk=3))
+        query_log.flush(force=True)
+        entry.refresh_from_db()
+        self.assertEqual(entry.count, 3)
+
+    def test_task_workers_write_their_statistics(self):
+        Task.objects.all().delete()
+        enqueue(refresh_similar_jobs, {'job_id': Job.objects.first().pk})
+        query_log.take_pending(force=True)
+        self.assertEqual(run_pending(), (1, 0))
+        # Written when the worker stopped, without a request or a forced flush
+        self.assertFalse(query_log.pending)
+        self.assertTrue(QueryFingerprint.objects.filter(view='', fingerprint__contains='"jobs_jobterm"').exists())
+
+    def test_slow_queries_are_logged_with_a_plan(self):
+        with override_settings(SLOW_QUERY_MS=0), self.assertLogs('perf.slow_queries', 'WARNING') as logs:
+            list(Job.objects.filter(is_active=True, remote_type='remote'))
+        # Parameters stay out of the log and the stored statement
+        self.assertIn('"jobs_job"."remote_type" = ?', logs.output[0])
+        self.assertNotIn("'remote'", logs.output[0])
+        self.assertIn('Plan:', logs.output[0])
+
+        query_log.flush(force=True)
+        entry = QueryFingerprint.objects.get(fingerprint__contains='"jobs_job"."remote_type" = ?')
+        self.assertEqual(entry.slowest_sql, entry.fingerprint)
+        self.assertTrue(entry.slowest_plan)
+
+    @override_settings(SLOW_QUERY_MS=0, SLOW_QUERY_LOG_PARAMS=True)
+    def test_parameters_can_be_logged_for_debugging(self):
+        with self.assertLogs('perf.slow_queries', 'WARNING') as logs:
+            list(Job.objects.filter(is_active=True, remote_type='remote'))
+        self.assertIn("params: (", logs.output[0])
+        query_log.flush(force=True)
+        entry = QueryFingerprint.objects.get(fingerprint__contains='"jobs_job"."remote_type" = ?')
+        self.assertIn("'remote'", entry.slowest_sql)
+
+    def test_flush_writes_in_bulk(self):
+        for pk in range(5):
+            list(Job.objects.filter(pk=pk))
+            list(Job.objects.filter(title=str(pk)))
+        list(Job.objects.filter(company='x'))
+        query_log.flush(force=True)
+        for pk in range(3):
+            list(Job.objects.filter(pk=pk))
+        list(Job.objects.filter(title='x'))
+        list(Job.objects.filter(remote_type='remote'))
+        # A lookup, one INSERT (in a savepoint) for the new fingerprint and one UPDATE for the rest
+        with self.assertNumQueries(5):
+            self.assertEqual(query_log.flush(force=True), 3)
+        counts = dict(QueryFingerprint.objects.filter(view='').values_list('fingerprint', 'count'))
+        self.assertEqual(counts[next(sql for sql in counts if '"jobs_job"."id" = ?' in sql)], 8)
+        self.assertEqual(counts[next(sql for sql in counts if '"jobs_job"."title" = ?' in sql)], 6)
+        self.assertEqual(counts[next(sql for sql in counts if '"jobs_job"."remote_type" = ?' in sql)], 1)
+
+
+class GenerateLoadDataTests(TestCase):
+
+    def generate(self, **options):
+        options = {
+            'applicants': 30, 'recruiters': 3, 'jobs': 40, 'seed': 7, 'processes': 1, 'chunk_size': 8, **options
+        }
+        call_command('generate_load_data', stdout=StringIO(), **options)
+
+    def test_rows_and_derived_fields(self):
+        self.generate()
+        self.assertEqual(Job.objects.count(), 40)
+        self.assertEqual(ApplicantProfile.objects.count(), 30)
+        self.assertTrue(self.client.login(username='load-a0', password='load-test-password'))
+
+        for job in Job.objects.prefetch_related('skill_links'):
+            self.assertTrue(job.location_id)
+            skills = job.get_required_skills_list() + job.get_preferred_skills_list()
+            self.assertEqual(len(job.skill_links.all()), len(skills))
+        for profile in ApplicantProfile.objects.prefetch_related('work_experience', 'education', 'skill_links'):
+            self.assertTrue(profile.location_id)
+            self.assertEqual(len(profile.skill_links.all()), len(profile.get_skills_list()))
+            periods = [(role.start_date, role.end_date, role.is_current) for role in profile.work_experience.all()]
+            degrees = [record.degree for record in profile.education.all()]
+            self.assertEqual(profile.experience_months, total_experience_months(periods, profile.experience_updated_on))
+            self.assertEqual(profile.education_level, highest_education_level(degrees))
+
+        applications = JobApplication.objects.select_related('job')
+        self.assertTrue(applications)
+        for application in applications:
+            self.assertGreaterEqual(application.applied_at, application.job.created_at)
+
+    def test_same_seed_same_data(self):
+        generate_load_data(applicants=10, recruiters=2, jobs=10, seed=3, prefix='first')
+        generate_load_data(applicants=10, recruiters=2, jobs=10, seed=3, prefix='second', chunk_size=3)
+
+        def snapshot(prefix):
+            profiles = ApplicantProfile.objects.filter(user__username__startswith=prefix).order_by('pk')
+            jobs = Job.objects.filter(posted_by__username__startswith=prefix).order_by('pk')
+            return (
+                list(profiles.values_list('headline', 'skills', 'location_id', 'experience_months')),
+                list(jobs.values_list('title', 'company', 'salary_min', 'required_skills')),
+            )
+
+        self.assertEqual(snapshot('first-'), snapshot('second-'))
+
+    def test_existing_prefix_is_refused(self):
+        self.generate(applicants=1, jobs=0)
+        with self.assertRaises(CommandError):
+            self.generate(applicants=1, jobs=0)
+
+
+class BenchmarkTests(TestCase):
+
+    def test_percentiles_use_nearest_rank(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(percentile(ordered, 50), 50)
+        self.assertEqual(percentile(ordered, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_every_scenario_runs(self):
+        generate_load_data(applicants=20, recruiters=2, jobs=20, applications=3, prefix='bench')
+        results = run_benchmark(requests=2, warmup=0, memory_requests=1)
+
+        self.assertEqual(list(results), [scenario.name for scenario in SCENARIOS])
+        for name, result in results.items():
+            self.assertEqual(result['requests'], 2, name)
+            self.assertEqual(result['errors'], 0, name)
+            self.assertGreater(result['peak_kb'], 0, name)
+        self.assertGreater(results['candidates:unfiltered']['queries']['max'], 0)
+        # Cold, timed and traced requests each apply to another job
+        self.assertEqual(JobApplication.objects.filter(cover_letter='Benchmark application.').count(), 4)
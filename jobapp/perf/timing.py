@@ -0,0 +1,63 @@
+"""
+Per-request phase timings for ProfilingMiddleware.
+
+The timings of the request being handled live in a context variable, so
+code that cannot see the request (the template backend, the session
+store) can still charge time to it. ContextVars follow the request across
+the sync/async boundary under ASGI as well as WSGI.
+"""
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar('perf_request_timings', default=None)
+
+
+class RequestTimings:
+    """Seconds spent per phase while handling one request"""
+
+    def __init__(self):
+        self.phases = defaultdict(float)
+        self._active = set()
+
+    def __getitem__(self, phase):
+        return self.phases.get(phase, 0.0)
+
+    def __setitem__(self, phase, seconds):
+        self.phases[phase] = seconds
+
+
+def start_request():
+    """Start collecting timings for the current request; returns (timings, reset token)"""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def timed(phase):
+    """
+    Charge the time spent in the block to phase of the current request.
+
+    A no-op outside profiled requests; nested blocks for the same phase
+    (e.g. a template rendering another template) are only counted once.
+    """
+    timings = _current.get()
+    if timings is None or phase in timings._active:
+        yield
+        return
+    timings._active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[phase] += time.perf_counter() - start
+        timings._active.discard(phase)
@@ -0,0 +1,26 @@
+import os
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .histograms import latency_report, window_seconds
+from .middleware import PROFILE_PARAM, make_profile_token, profiling_enabled
+
+
+@staff_member_required
+def report(request):
+    """
+    Rolling latency percentiles per view for this process, as JSON.
+
+    ?sign=<path> also returns a URL that profiles one request to path.
+    """
+    data = {
+        'enabled': profiling_enabled(),
+        'pid': os.getpid(),
+        'window_seconds': window_seconds(),
+        'views': latency_report(),
+    }
+    path = request.GET.get('sign')
+    if path:
+        data['profile_url'] = f'{path}?{PROFILE_PARAM}={make_profile_token(path)}'
+    return JsonResponse(data)
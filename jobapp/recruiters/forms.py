@@ -50,6 +50,38 @@ class CandidateSearchForm(forms.Form):
         help_text="Search by location"
     )
     
+    # Radius search around a point
+    near = forms.CharField(
+        max_length=200,
+        required=False,
+        widget=forms.TextInput(attrs={
+            'placeholder': 'City, ZIP code, or latitude, longitude',
+            'class': 'form-control'
+        }),
+        help_text="Find candidates within a distance of this place"
+    )
+    
+    radius = forms.ChoiceField(
+        choices=[
+            ('10', 'Within 10 miles'),
+            ('25', 'Within 25 miles'),
+            ('50', 'Within 50 miles'),
+            ('100', 'Within 100 miles'),
+        ],
+        required=False,
+        initial='25',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
+    sort = forms.ChoiceField(
+        choices=[
+            ('', 'Recently updated'),
+            ('distance', 'Distance'),
+        ],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
     # Remote work preference
     remote_preference = forms.ChoiceField(
         choices=[
@@ -93,10 +125,10 @@ class CandidateSearchForm(forms.Form):
     education_level = forms.ChoiceField(
         choices=[
             ('', 'Any'),
-            ('high_school', 'High School'),
-            ('associate', 'Associate Degree'),
-            ('bachelor', "Bachelor's Degree"),
-            ('master', "Master's Degree"),
+            ('high_school', 'High School or higher'),
+            ('associate', 'Associate Degree or higher'),
+            ('bachelor', "Bachelor's Degree or higher"),
+            ('master', "Master's Degree or higher"),
             ('phd', 'PhD'),
         ],
         required=False,
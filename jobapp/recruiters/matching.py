@@ -0,0 +1,263 @@
+"""
+Job-to-candidate matching.
+
+Every public, job-seeking candidate is scored against a job in one batch:
+candidate data lives in a column-oriented CandidatePool (a sparse
+candidate x skill matrix plus NumPy arrays for the other attributes), so
+scoring is a handful of vectorized operations rather than a Python loop
+over profiles. Pools are rebuilt when the "profiles" data version changes
+and top-K results are cached per job.
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from scipy import sparse
+
+from applicants.models import ApplicantProfile, ApplicantSkill
+from geo.distance import EARTH_RADIUS_MILES
+from jobapp.versions import get_version
+from jobs.models import JobSkill
+
+# Score weights (sum to 1)
+SKILL_WEIGHT = 0.55
+REMOTE_WEIGHT = 0.15
+LOCATION_WEIGHT = 0.15
+EXPERIENCE_WEIGHT = 0.15
+
+PREFERRED_SKILL_WEIGHT = 0.5
+
+REMOTE_PREFERENCES = ['remote_only', 'hybrid', 'onsite_only', 'flexible']
+
+# Job remote_type -> compatibility with each candidate preference (REMOTE_PREFERENCES order)
+REMOTE_COMPATIBILITY = {
+    'remote': np.array([1.0, 0.8, 0.3, 1.0], dtype=np.float32),
+    'hybrid': np.array([0.2, 1.0, 0.8, 1.0], dtype=np.float32),
+    'onsite': np.array([0.0, 0.5, 1.0, 1.0], dtype=np.float32),
+}
+
+# Job experience_level -> target range in months [low, high)
+EXPERIENCE_TARGETS = {
+    'entry': (0, 36),
+    'mid': (36, 72),
+    'senior': (72, None),
+    'executive': (120, None),
+}
+
+COMMUTE_MILES = 50
+
+
+@dataclass
+class CandidatePool:
+    """Column-oriented snapshot of every matchable candidate"""
+
+    version: int
+    profile_ids: np.ndarray
+    user_ids: np.ndarray
+    skills: sparse.csc_matrix
+    remote_preference: np.ndarray
+    willing_to_relocate: np.ndarray
+    experience_months: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+
+def matchable_profiles():
+    return ApplicantProfile.objects.filter(is_public=True, is_seeking_jobs=True)
+
+
+def build_candidate_pool(version=None, profiles=None):
+    """Load candidates (matchable ones by default) into NumPy/SciPy structures (two queries)"""
+    if profiles is None:
+        profiles = matchable_profiles()
+    rows = list(
+        profiles.order_by('pk').values_list(
+            'pk', 'user_id', 'remote_work_preference', 'willing_to_relocate',
+            'experience_months', 'latitude', 'longitude'
+        )
+    )
+    preference_codes = {preference: i for i, preference in enumerate(REMOTE_PREFERENCES)}
+    flexible = preference_codes['flexible']
+
+    count = len(rows)
+    profile_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+    user_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=count)
+    remote_preference = np.fromiter(
+        (preference_codes.get(row[2], flexible) for row in rows), dtype=np.int8, count=count
+    )
+    willing_to_relocate = np.fromiter((row[3] for row in rows), dtype=bool, count=count)
+    experience_months = np.fromiter((row[4] for row in rows), dtype=np.float32, count=count)
+    latitude = np.fromiter((np.nan if row[5] is None else float(row[5]) for row in rows), dtype=np.float64, count=count)
+    longitude = np.fromiter((np.nan if row[6] is None else float(row[6]) for row in rows), dtype=np.float64, count=count)
+
+    links = np.array(
+        list(ApplicantSkill.objects.filter(applicant__in=profiles).values_list('applicant_id', 'skill_id')),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    row_index = np.searchsorted(profile_ids, links[:, 0])
+    n_skills = int(links[:, 1].max()) + 1 if len(links) else 1
+    skills = sparse.csc_matrix(
+        (np.ones(len(links), dtype=np.float32), (row_index, links[:, 1])),
+        shape=(count, n_skills)
+    )
+
+    return CandidatePool(
+        version if version is not None else get_version('profiles'),
+        profile_ids, user_ids, skills, remote_preference, willing_to_relocate,
+        experience_months, latitude, longitude
+    )
+
+
+_pool_lock = threading.Lock()
+# public_only -> (pool, monotonic build time)
+_pools = {}
+
+
+def get_candidate_pool(public_only=True):
+    """
+    Process-wide candidate pool, rebuilt when the candidate data version moves.
+
+    public_only=False includes every applicant, not just those visible to
+    recruiters. Rebuilds happen at most every MATCHING_POOL_REFRESH_SECONDS
+    so a busy stream of profile edits doesn't rebuild the pool on every
+    request.
+    """
+    version = get_version('profiles')
+    refresh_seconds = getattr(settings, 'MATCHING_POOL_REFRESH_SECONDS', 60)
+    with _pool_lock:
+        pool, built_at = _pools.get(public_only, (None, 0.0))
+        stale = pool is None or (
+            pool.version != version and time.monotonic() - built_at >= refresh_seconds
+        )
+        if stale:
+            profiles = matchable_profiles() if public_only else ApplicantProfile.objects.all()
+            pool = build_candidate_pool(version, profiles)
+            _pools[public_only] = (pool, time.monotonic())
+        return pool
+
+
+def skill_scores(pool, required_ids, preferred_ids):
+    """Weighted fraction of the job's skills each candidate has"""
+    weights = {skill_id: PREFERRED_SKILL_WEIGHT for skill_id in preferred_ids}
+    weights.update({skill_id: 1.0 for skill_id in required_ids})
+    columns = np.array([skill_id for skill_id in weights if skill_id < pool.skills.shape[1]], dtype=np.int64)
+    total = sum(weights.values())
+    if not total or not len(columns):
+        return np.zeros(len(pool), dtype=np.float32)
+    vector = np.array([weights[skill_id] for skill_id in columns], dtype=np.float32)
+    return np.asarray(pool.skills[:, columns] @ vector).ravel() / total
+
+
+def remote_scores(pool, remote_type):
+    compatibility = REMOTE_COMPATIBILITY.get(remote_type, REMOTE_COMPATIBILITY['onsite'])
+    return compatibility[pool.remote_preference]
+
+
+def location_fit(distance, willing_to_relocate, remote=False):
+    """
+    Location score from distances in miles (NaN when unknown).
+
+    Commutable candidates score 1; others depend on willingness to
+    relocate, and remote jobs fit everyone. Arguments broadcast.
+    """
+    unknown = np.isnan(distance)
+    scores = np.where(unknown, np.where(willing_to_relocate, 0.7, 0.4), np.where(willing_to_relocate, 0.7, 0.2))
+    scores = np.where(~unknown & (distance <= COMMUTE_MILES), 1.0, scores)
+    return np.where(remote, 1.0, scores).astype(np.float32)
+
+
+def distances_miles(lat, lng, latitudes, longitudes):
+    """Great-circle distance from one point to arrays of points (NaN for missing coordinates)"""
+    lat1 = np.radians(latitudes)
+    lat2 = np.radians(lat)
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((np.radians(lng) - np.radians(longitudes)) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+def location_scores(pool, job):
+    if job.latitude is None or job.longitude is None:
+        distance = np.full(len(pool), np.nan)
+    else:
+        distance = distances_miles(float(job.latitude), float(job.longitude), pool.latitude, pool.longitude)
+    return location_fit(distance, pool.willing_to_relocate, job.remote_type == 'remote')
+
+
+def experience_fit(months, low, high):
+    """1 inside [low, high) months, decaying by a fifth per year outside it (high may be inf)"""
+    short = np.clip(low - months, 0, None)
+    over = np.clip(months - high, 0, None)
+    # Over-qualification is penalized half as much as missing experience
+    gap_years = (short + over * 0.5) / 12
+    return np.clip(1 - gap_years / 5, 0, 1).astype(np.float32)
+
+
+def experience_scores(pool, experience_level):
+    low, high = EXPERIENCE_TARGETS.get(experience_level, EXPERIENCE_TARGETS['mid'])
+    return experience_fit(pool.experience_months, low, np.inf if high is None else high)
+
+
+def score_candidates(pool, job):
+    """Scores for every candidate in pool against job, plus the per-factor breakdown"""
+    links = JobSkill.objects.filter(job=job).values_list('skill_id', 'is_required')
+    required_ids = [skill_id for skill_id, is_required in links if is_required]
+    preferred_ids = [skill_id for skill_id, is_required in links if not is_required]
+
+    factors = {
+        'skills': skill_scores(pool, required_ids, preferred_ids),
+        'remote': remote_scores(pool, job.remote_type),
+        'location': location_scores(pool, job),
+        'experience': experience_scores(pool, job.experience_level),
+    }
+    return weighted_score(factors), factors
+
+
+def weighted_score(factors):
+    """Combine per-factor score arrays into the overall match score"""
+    return (
+        SKILL_WEIGHT * factors['skills'] +
+        REMOTE_WEIGHT * factors['remote'] +
+        LOCATION_WEIGHT * factors['location'] +
+        EXPERIENCE_WEIGHT * factors['experience']
+    )
+
+
+def top_candidates(pool, job, limit):
+    """[(profile_id, score, {factor: score})] for the best limit candidates"""
+    if not len(pool):
+        return []
+    total, factors = score_candidates(pool, job)
+    limit = min(limit, len(pool))
+    best = np.argpartition(-total, limit - 1)[:limit]
+    best = best[np.argsort(-total[best], kind='stable')]
+    return [
+        (int(pool.profile_ids[i]), float(total[i]), {name: float(values[i]) for name, values in factors.items()})
+        for i in best
+    ]
+
+
+def job_matches_cache_key(job, pool_version):
+    return f'job-matches:{job.pk}:{job.updated_at.timestamp()}:{pool_version}'
+
+
+def get_job_matches(job, limit=50):
+    """
+    Best candidates for a job, cached per job.
+
+    The cache key includes the job's updated_at and the candidate pool
+    version, so editing the job or any candidate change invalidates it.
+    """
+    pool = get_candidate_pool()
+    key = job_matches_cache_key(job, pool.version)
+    # Stored with the limit it was computed for: a small pool yields fewer matches than asked
+    cached_limit, matches = cache.get(key, (0, None))
+    if matches is None or limit > cached_limit:
+        matches = top_candidates(pool, job, limit)
+        cache.set(key, (limit, matches), getattr(settings, 'MATCHING_CACHE_TIMEOUT', 3600))
+    return matches[:limit]
@@ -0,0 +1,125 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from applicants.education import EDUCATION_FILTER_LEVELS
+from applicants.experience import experience_bucket_filter
+from applicants.models import ApplicantProfile, ApplicantSkill
+from geo.distance import parse_point, within_radius
+from geo.gazetteer import geocode_text, place_filter
+from searches.cache import FLAG, SKILLS, TEXT, VALUE, Search, register
+from skills.utils import split_skills, owners_with_all_skills
+from .forms import CandidateSearchForm
+
+
+def resolve_near(text):
+    """(lat, lng) for a "lat,lng" pair or a place name, or None"""
+    near = parse_point(text)
+    if text and not near:
+        place = geocode_text(text)
+        near = (place.latitude, place.longitude) if place else None
+    return near
+
+
+def clean_radius(value):
+    """value if the search form offers that radius, else the form's default"""
+    field = CandidateSearchForm.base_fields['radius']
+    try:
+        return field.clean(value) or field.initial
+    except ValidationError:
+        return field.initial
+
+
+@register
+class CandidateSearch(Search):
+    """Recruiter candidate search (recruiters.views.candidates)"""
+
+    name = 'candidates'
+    version = 'profiles'
+    per_page = 12
+    params = {
+        'keywords': TEXT,
+        'skills': SKILLS,
+        'location': TEXT,
+        'near': TEXT,
+        'radius': VALUE,
+        'sort': VALUE,
+        'remote_preference': VALUE,
+        'willing_to_relocate': FLAG,
+        'is_seeking_jobs': FLAG,
+        'experience_years': VALUE,
+        'education_level': VALUE,
+    }
+
+    def canonicalize(self, data):
+        # Only the radii the form offers reach the query (and the cache key)
+        if data.get('radius'):
+            data = data.copy()
+            data['radius'] = clean_radius(data['radius'].strip())
+        return super().canonicalize(data)
+
+    def build(self, params):
+        # Start with all public profiles (joined to the user for card names), then apply filters
+        candidates = ApplicantProfile.objects.filter(is_public=True).select_related('user')
+
+        # Keywords search
+        keywords = params.get('keywords')
+        if keywords:
+            candidates = candidates.filter(
+                Q(user__first_name__icontains=keywords) |
+                Q(user__last_name__icontains=keywords) |
+                Q(user__username__icontains=keywords) |
+                Q(headline__icontains=keywords) |
+                Q(summary__icontains=keywords)
+            )
+
+        # Skills search (candidate must have every requested skill)
+        skill_list = split_skills(params.get('skills', ''))
+        if skill_list:
+            candidates = candidates.filter(
+                pk__in=owners_with_all_skills(ApplicantSkill, 'applicant_id', skill_list)
+            )
+
+        # Location search: canonical place ids when the gazetteer knows the place
+        location = params.get('location')
+        if location:
+            at_place = place_filter(location)
+            if at_place is not None:
+                candidates = candidates.filter(at_place)
+            else:
+                candidates = candidates.filter(
+                    Q(city__icontains=location) |
+                    Q(state__icontains=location) |
+                    Q(country__icontains=location) |
+                    Q(location__icontains=location)
+                )
+
+        # Radius search: bounding-box prefilter, then exact haversine distance
+        near = resolve_near(params.get('near', ''))
+        if near:
+            radius = float(clean_radius(params.get('radius')))
+            candidates = within_radius(candidates, near[0], near[1], radius)
+
+        # Remote work preference
+        remote_preference = params.get('remote_preference')
+        if remote_preference:
+            candidates = candidates.filter(remote_work_preference=remote_preference)
+
+        # Checkboxes only filter when ticked
+        if params.get('willing_to_relocate'):
+            candidates = candidates.filter(willing_to_relocate=True)
+        if params.get('is_seeking_jobs'):
+            candidates = candidates.filter(is_seeking_jobs=True)
+
+        # Experience level filter (materialized total months of experience)
+        experience_filter = experience_bucket_filter(params.get('experience_years'))
+        if experience_filter:
+            candidates = candidates.filter(**experience_filter)
+
+        # Education level filter (highest level at or above the selected one)
+        min_education = EDUCATION_FILTER_LEVELS.get(params.get('education_level'))
+        if min_education is not None:
+            candidates = candidates.filter(education_level__gte=min_education)
+
+        # Most recently updated (or nearest) first
+        if near and params.get('sort') == 'distance':
+            return candidates, ('distance', '-id')
+        return candidates, ('-updated_at', '-id')
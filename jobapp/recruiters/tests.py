@@ -1,3 +1,216 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.http import QueryDict
+from django.urls import reverse
+
+from applicants.models import ApplicantProfile
+from perf.testing import (
+    QueryBudgetTestCase, QueryPlanTestCase, add_history, make_applicant, make_jobs, make_recruiter,
+)
+from . import matching
+from .matching import (
+    build_candidate_pool, experience_fit, get_candidate_pool, get_job_matches, location_fit, score_candidates,
+    top_candidates, weighted_score,
+)
+from .search import CandidateSearch
+
+FACTORS = ('skills', 'remote', 'location', 'experience')
+
+
+class RecruiterViewQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter('recruiter')
+        self.login(self.recruiter)
+
+    def test_candidates(self):
+        make_applicant('candidate0')
+        url = reverse('recruiters:candidates')
+        self.assertQueryBudget(url)
+        self.assertQueriesConstant(url, lambda: [make_applicant(f'candidate{i}') for i in range(1, 6)])
+
+    def test_candidate_search(self):
+        make_applicant('candidate0')
+        self.assertQueryBudget(reverse('recruiters:candidates') + '?skills=python&location=Austin')
+
+    def test_candidate_detail(self):
+        user = make_applicant('candidate', experience=1, education=1)
+        profile = ApplicantProfile.objects.get(user=user)
+        url = reverse('recruiters:candidate_detail', args=[profile.pk])
+        self.assertQueryBudget(url)
+        self.assertQueriesConstant(url, lambda: add_history(profile, experience=4, education=3))
+
+    def test_job_matches(self):
+        job, = make_jobs(self.recruiter, 1)
+        make_applicant('candidate0')
+        url = reverse('recruiters:job_matches', args=[job.pk])
+        self.assertQueryBudget(url)
+        self.assertQueriesConstant(url, lambda: [make_applicant(f'candidate{i}') for i in range(1, 6)])
+
+
+class CandidateListingTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(make_recruiter('recruiter'))
+
+    def test_result_count_is_pluralized(self):
+        make_applicant('candidate0')
+        response = self.client.get(reverse('recruiters:candidates'))
+        self.assertContains(response, 'Found 1 candidate\n')
+
+        for i in range(1, 4):
+            make_applicant(f'candidate{i}')
+        with override_settings(LISTING_COUNT_MODE='capped', LISTING_COUNT_CAP=2):
+            response = self.client.get(reverse('recruiters:candidates'))
+        self.assertContains(response, 'Found 2+ candidates')
+
+
+class CandidateRadiusSearchTests(TestCase):
+
+    def setUp(self):
+        self.austin = make_applicant('austin', city='Austin', state='TX').applicant_profile
+        self.san_antonio = make_applicant('san-antonio', city='San Antonio', state='TX').applicant_profile
+
+    def search(self, query_string):
+        return CandidateSearch().canonicalize(QueryDict(query_string))
+
+    def test_only_offered_radii_are_searched(self):
+        self.assertEqual(self.search('near=Austin&radius=100')['radius'], '100')
+        for radius in ('-5', '1e9', 'nan', '26', 'far'):
+            with self.subTest(radius=radius):
+                self.assertEqual(self.search(f'near=Austin&radius={radius}')['radius'], '25')
+
+    def results(self, query_string):
+        return set(CandidateSearch().build(self.search(query_string))[0])
+
+    def test_radius_search(self):
+        self.assertEqual(self.results('near=Austin, TX&radius=50'), {self.austin})
+        self.assertEqual(self.results('near=Austin, TX&radius=100'), {self.austin, self.san_antonio})
+        self.assertEqual(self.results('near=Austin, TX&radius=-1000'), {self.austin})
+        self.assertEqual(self.results('near=30.2672,-97.7431'), {self.austin})
+
+
+class MatchScoreTests(SimpleTestCase):
+
+    def test_location_fit(self):
+        distance = np.array([10.0, 500.0, 500.0, np.nan, np.nan])
+        relocate = np.array([False, False, True, False, True])
+        np.testing.assert_allclose(location_fit(distance, relocate), [1.0, 0.2, 0.7, 0.4, 0.7], rtol=1e-6)
+        self.assertEqual(location_fit(distance, relocate, remote=True).tolist(), [1.0] * 5)
+
+    def test_experience_fit(self):
+        months = np.array([48, 24, 96, 0], dtype=np.float32)
+        scores = experience_fit(months, 36, 72)
+        # Inside the range, a year short, two years over (half penalty), three years short
+        np.testing.assert_allclose(scores, [1.0, 0.8, 0.8, 0.4], rtol=1e-6)
+        self.assertEqual(experience_fit(np.array([600.0]), 120, np.inf).tolist(), [1.0])
+
+    def test_weighted_score(self):
+        ones = np.ones(1, dtype=np.float32)
+        self.assertAlmostEqual(float(weighted_score(dict.fromkeys(FACTORS, ones))[0]), 1.0, places=6)
+        factors = dict.fromkeys(FACTORS, ones * 0)
+        factors['skills'] = ones
+        self.assertAlmostEqual(float(weighted_score(factors)[0]), 0.55, places=6)
+
+
+class JobMatchingTests(TestCase):
+
+    def setUp(self):
+        # Start from an empty process-wide pool and keep it for the whole test
+        matching._pools.clear()
+        self.addCleanup(matching._pools.clear)
+        self.recruiter = make_recruiter('recruiter')
+        self.job, = make_jobs(
+            self.recruiter, 1, required_skills='Python, Django', preferred_skills='Docker', experience_level='mid'
+        )
+        self.full = make_applicant('full', experience=4, skills='Python, Django, Docker').applicant_profile
+        self.partial = make_applicant('partial', experience=4, skills='Python').applicant_profile
+        self.hidden = make_applicant('hidden', skills='Python, Django, Docker', is_public=False)
+
+    def test_skill_scores(self):
+        pool = build_candidate_pool()
+        scores = dict(zip(pool.profile_ids.tolist(), score_candidates(pool, self.job)[1]['skills'].tolist()))
+        self.assertEqual(list(scores), [self.full.pk, self.partial.pk])
+        self.assertAlmostEqual(scores[self.full.pk], 1.0, places=6)
+        # Required skills count more than preferred ones
+        self.assertAlmostEqual(scores[self.partial.pk], 0.4, places=6)
+
+    def test_best_candidates_first(self):
+        matches = top_candidates(build_candidate_pool(), self.job, 10)
+        self.assertEqual([profile_id for profile_id, _, _ in matches], [self.full.pk, self.partial.pk])
+        profile_id, score, factors = matches[0]
+        self.assertAlmostEqual(score, float(weighted_score({name: np.float32(v) for name, v in factors.items()})))
+        empty = build_candidate_pool(profiles=ApplicantProfile.objects.none())
+        self.assertEqual(top_candidates(empty, self.job, 5), [])
+
+    def test_matches_are_cached_for_small_pools(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with mock.patch.object(matching, 'top_candidates', wraps=top_candidates) as scored:
+            first = get_job_matches(self.job, limit=50)
+            # Fewer candidates than the limit still counts as a complete list
+            self.assertEqual(get_job_matches(self.job, limit=50), first)
+            self.assertEqual(get_job_matches(self.job, limit=1), first[:1])
+            self.assertEqual(scored.call_count, 1)
+            get_job_matches(self.job, limit=60)
+            self.assertEqual(scored.call_count, 2)
+        self.assertEqual(len(first), 2)
+
+    @override_settings(MATCHING_POOL_REFRESH_SECONDS=3600)
+    def test_hidden_candidates_leave_the_page_at_once(self):
+        self.client.force_login(self.recruiter)
+        url = reverse('recruiters:job_matches', args=[self.job.pk])
+        self.assertContains(response := self.client.get(url), 'Full Tester')
+        self.assertContains(response, 'Partial Tester')
+        self.assertNotContains(response, 'Hidden Tester')
+
+        self.full.is_public = False
+        self.full.save()
+        self.partial.is_seeking_jobs = False
+        self.partial.save()
+        # The pool isn't rebuilt yet, but the page doesn't show them
+        self.assertIn(self.full.pk, get_candidate_pool().profile_ids)
+        response = self.client.get(url)
+        self.assertNotContains(response, 'Full Tester')
+        self.assertNotContains(response, 'Partial Tester')
+
+
+class CandidateQueryPlanTests(QueryPlanTestCase):
+
+    FILTER_MIXES = [
+        '',
+        'is_seeking_jobs=on',
+        'remote_preference=hybrid',
+        'remote_preference=remote_only&willing_to_relocate=on',
+        'experience_years=6-10',
+        'education_level=bachelor',
+        'skills=python,sql',
+        'near=30.27,-97.74&radius=50',
+        'near=30.27,-97.74&radius=50&sort=distance',
+        'location=Austin, TX',
+    ]
+
+    def test_search_filters(self):
+        search = CandidateSearch()
+        for query_string in self.FILTER_MIXES:
+            with self.subTest(query_string=query_string):
+                keys, count = self.search_querysets(search, query_string)
+                self.assertNoFullScan(keys)
+                if query_string:
+                    self.assertNoFullScan(count)
+
+    def test_default_search_is_read_in_index_order(self):
+        keys, _ = self.search_querysets(CandidateSearch(), '')
+        self.assertOrderedByIndex(keys)
+
+    def test_candidate_detail(self):
+        profile = ApplicantProfile.objects.filter(is_public=True).first()
+        self.assertNoFullScan(
+            ApplicantProfile.objects.select_related('user').prefetch_related('work_experience', 'education')
+            .filter(pk=profile.pk, is_public=True)
+        )
+        self.assertNoFullScan(profile.work_experience.all())
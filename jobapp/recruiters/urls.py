@@ -9,4 +9,5 @@ urlpatterns = [
     path('jobs/', views.job_postings, name='job_postings'),
     path('candidates/', views.candidates, name='candidates'),
     path('candidates/<int:pk>/', views.candidate_detail, name='candidate_detail'),
+    path('jobs/<int:pk>/matches/', views.job_matches, name='job_matches'),
 ]
@@ -1,12 +1,17 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
+from django.utils.timesince import timesince
 from accounts.decorators import recruiter_required
+from jobapp.fragments import render_cached_fragments
+from perf.queries import query_budget
 from applicants.models import ApplicantProfile, Education, WorkExperience
+from jobs.models import Job, StageTime
 from .models import RecruiterProfile
 from .forms import RecruiterProfileForm, CandidateSearchForm
+from .matching import get_job_matches, matchable_profiles
+from .search import CandidateSearch
 
 @recruiter_required
 def dashboard(request):
@@ -16,7 +21,9 @@ def dashboard(request):
         'user_type': 'recruiter'
     }
     return render(request, 'recruiters/dashboard.html', {
-        'template_data': template_data
+        'template_data': template_data,
+        # Precomputed per-recruiter rollup; never scans the status events
+        'stage_times': StageTime.in_status_order(request.user.stage_times.all()),
     })
 
 @recruiter_required
@@ -41,102 +48,26 @@ def job_postings(request):
         'template_data': template_data
     })
 
+def candidate_card_key(candidate):
+    """Everything a cached candidate card depends on (distance only in radius searches)"""
+    distance = getattr(candidate, 'distance', None)
+    return (
+        candidate.pk, candidate.updated_at.timestamp(), timesince(candidate.updated_at),
+        candidate.user.get_full_name(), candidate.user.username,
+        None if distance is None else round(distance)
+    )
+
+@query_budget(8)
 @recruiter_required
 def candidates(request):
     """Search and view candidates"""
     form = CandidateSearchForm(request.GET or None)
     
-    # Start with all public profiles, then apply filters
-    candidates = ApplicantProfile.objects.filter(is_public=True)
-    
-    # Process search filters
-    if request.GET:
-        # Keywords search
-        keywords = request.GET.get('keywords', '').strip()
-        if keywords:
-            candidates = candidates.filter(
-                Q(user__first_name__icontains=keywords) |
-                Q(user__last_name__icontains=keywords) |
-                Q(user__username__icontains=keywords) |
-                Q(headline__icontains=keywords) |
-                Q(summary__icontains=keywords)
-            )
-        
-        # Skills search
-        skills = request.GET.get('skills', '').strip()
-        if skills:
-            skill_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-            for skill in skill_list:
-                candidates = candidates.filter(skills__icontains=skill)
-        
-        # Location search
-        location = request.GET.get('location', '').strip()
-        if location:
-            candidates = candidates.filter(
-                Q(city__icontains=location) |
-                Q(state__icontains=location) |
-                Q(country__icontains=location) |
-                Q(location__icontains=location)
-            )
-        
-        # Remote work preference
-        remote_preference = request.GET.get('remote_preference')
-        if remote_preference:
-            candidates = candidates.filter(remote_work_preference=remote_preference)
-        
-        # Willing to relocate (only filter if explicitly checked)
-        willing_to_relocate = request.GET.get('willing_to_relocate')
-        if willing_to_relocate == 'on':  # Checkbox returns 'on' when checked
-            candidates = candidates.filter(willing_to_relocate=True)
-        
-        # Currently seeking jobs (only filter if explicitly checked)
-        is_seeking_jobs = request.GET.get('is_seeking_jobs')
-        if is_seeking_jobs == 'on':  # Checkbox returns 'on' when checked
-            candidates = candidates.filter(is_seeking_jobs=True)
-        
-        # Experience level filter (based on work experience)
-        experience_years = request.GET.get('experience_years')
-        if experience_years:
-            if experience_years == '0-2':
-                # Filter for candidates with 0-2 years of experience
-                candidates = candidates.annotate(
-                    total_experience=Count('work_experience')
-                ).filter(
-                    Q(work_experience__isnull=True) |  # No work experience
-                    Q(work_experience__isnull=False)  # Has work experience but we'll filter by years
-                )
-                # Additional filtering would need to be done in Python for date calculations
-            elif experience_years == '3-5':
-                # Similar logic for 3-5 years
-                pass
-            elif experience_years == '6-10':
-                # Similar logic for 6-10 years
-                pass
-            elif experience_years == '10+':
-                # Similar logic for 10+ years
-                pass
-        
-        # Education level filter
-        education_level = request.GET.get('education_level')
-        if education_level:
-            if education_level == 'high_school':
-                candidates = candidates.filter(education__isnull=True)
-            elif education_level == 'associate':
-                candidates = candidates.filter(education__degree__icontains='associate')
-            elif education_level == 'bachelor':
-                candidates = candidates.filter(education__degree__icontains="bachelor")
-            elif education_level == 'master':
-                candidates = candidates.filter(education__degree__icontains="master")
-            elif education_level == 'phd':
-                candidates = candidates.filter(education__degree__icontains="phd")
-    
-    # Order by most recently updated
-    candidates = candidates.order_by('-updated_at')
-    
-    # Pagination
-    paginator = Paginator(candidates, 12)  # Show 12 candidates per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Filters, ordering and result caching live in CandidateSearch
+    paginator, page_obj = CandidateSearch().run(request.GET, request.GET.get('cursor'))
+    candidate_cards = render_cached_fragments(
+        'recruiters/_candidate_card.html', page_obj, 'candidate', candidate_card_key
+    )
     
     template_data = {
         'title': 'Find Candidates',
@@ -147,13 +78,20 @@ def candidates(request):
         'template_data': template_data,
         'form': form,
         'page_obj': page_obj,
-        'candidates_count': candidates.count()
+        'candidate_cards': candidate_cards,
+        'candidates_count': paginator.count_display,
+        # The number itself, for pluralizing ("1,000+" isn't one)
+        'candidates_total': paginator.count
     })
 
+@query_budget(8)
 @recruiter_required
 def candidate_detail(request, pk):
     """View detailed candidate profile"""
-    candidate = get_object_or_404(ApplicantProfile, pk=pk, is_public=True)
+    candidate = get_object_or_404(
+        ApplicantProfile.objects.select_related('user').prefetch_related('work_experience', 'education'),
+        pk=pk, is_public=True
+    )
     
     template_data = {
         'title': f'{candidate.user.get_full_name()} - Profile',
@@ -165,6 +103,32 @@ def candidate_detail(request, pk):
         'candidate': candidate
     })
 
+@query_budget(10)
+@recruiter_required
+def job_matches(request, pk):
+    """Best-matching candidates for one of the recruiter's job postings"""
+    job = get_object_or_404(Job, pk=pk, posted_by=request.user)
+    
+    matches = get_job_matches(job, limit=50)
+    # The pool and cached matches can lag profile edits: only show candidates still matchable
+    profiles = matchable_profiles().select_related('user').in_bulk([profile_id for profile_id, _, _ in matches])
+    results = [
+        {'candidate': profiles[profile_id], 'score': score, 'factors': factors}
+        for profile_id, score, factors in matches
+        if profile_id in profiles
+    ]
+    
+    template_data = {
+        'title': f'Matches for {job.title}',
+        'user_type': 'recruiter'
+    }
+    
+    return render(request, 'recruiters/job_matches.html', {
+        'template_data': template_data,
+        'job': job,
+        'results': results
+    })
+
 @recruiter_required
 def profile(request):
     """Recruiter profile management"""
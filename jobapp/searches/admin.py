@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import SearchQuery
+
+
+@admin.register(SearchQuery)
+class SearchQueryAdmin(admin.ModelAdmin):
+    list_display = ['search', 'query_string', 'hits', 'last_seen']
+    list_filter = ['search']
+    search_fields = ['query_string']
+    readonly_fields = ['query_hash']
@@ -0,0 +1,249 @@
+"""
+Cached listing searches.
+
+A Search turns GET parameters into a canonical form (sorted multi-value
+lists, case-folded text, a normalized skill list) and builds its queryset
+from that canonical form only, so every spelling of the same search shares
+one cache entry. Entries hold the ordering keys of the matching rows (or
+just the total for very large results) in the "search" cache alias. Keys
+embed a data version (jobapp/versions.py) that signals bump on
+save/delete; the alias's TIMEOUT bounds how long an entry can outlive a
+bump that didn't reach this process.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.module_loading import autodiscover_modules
+
+from jobapp.pagination import CursorPaginator, InvalidCursor, CursorPage
+from jobapp.versions import get_version
+from skills.utils import normalize_skill, split_skills
+
+# Parameter kinds understood by Search.canonicalize()
+TEXT = 'text'          # case-folded, whitespace collapsed
+CHOICES = 'choices'    # multi-value, sorted and de-duplicated
+SKILLS = 'skills'      # comma-separated skills, normalized and sorted
+NUMBER = 'number'      # parsed as a float, dropped when invalid
+FLAG = 'flag'          # checkbox, kept as "on" when set
+VALUE = 'value'        # single value, stripped
+
+
+def get_search_cache():
+    return caches[getattr(settings, 'SEARCH_CACHE_ALIAS', 'search')]
+
+
+class Search:
+    """
+    A cacheable listing search.
+
+    Subclasses set name, version (the data version that invalidates
+    results), params ({GET name: kind}) and per_page, and implement
+    build(params) returning (queryset, ordering) for a canonical QueryDict.
+    """
+
+    name = None
+    version = None
+    params = {}
+    per_page = 10
+
+    def canonicalize(self, data):
+        """Canonical QueryDict for request GET data; unknown parameters are dropped"""
+        canonical = QueryDict(mutable=True)
+        for key, kind in sorted(self.params.items()):
+            if kind == CHOICES:
+                values = sorted({value.strip() for value in data.getlist(key) if value.strip()})
+                if values:
+                    canonical.setlist(key, values)
+                continue
+
+            value = (data.get(key) or '').strip()
+            if kind == TEXT:
+                value = ' '.join(value.split()).casefold()
+            elif kind == SKILLS:
+                skills = sorted({normalize_skill(skill) for skill in split_skills(value)} - {''})
+                value = ', '.join(skills)
+            elif kind == NUMBER:
+                try:
+                    value = repr(float(value)) if value else ''
+                except ValueError:
+                    value = ''
+            elif kind == FLAG:
+                value = 'on' if value == 'on' else ''
+            if value:
+                canonical[key] = value
+        canonical._mutable = False
+        return canonical
+
+    def build(self, params):
+        raise NotImplementedError
+
+    def cache_key(self, params):
+        digest = hashlib.md5(params.urlencode().encode()).hexdigest()
+        return f'search:{self.name}:{get_version(self.version)}:{digest}'
+
+    def paginator(self, params):
+        """CachedCursorPaginator over the results for canonical params"""
+        queryset, ordering = self.build(params)
+        return CachedCursorPaginator(queryset, self.per_page, ordering, self.cache_key(params))
+
+    def run(self, data, cursor=None):
+        """Canonicalize request data, record the search and return (paginator, page)"""
+        params = self.canonicalize(data)
+        if not cursor:
+            record_query(self.name, params.urlencode())
+        paginator = self.paginator(params)
+        return paginator, paginator.page(cursor)
+
+
+_registry = {}
+
+
+def register(search_class):
+    """Class decorator adding a Search to the registry used for cache warming"""
+    _registry[search_class.name] = search_class()
+    return search_class
+
+
+def get_searches():
+    """All registered searches, importing every app's search module first"""
+    autodiscover_modules('search')
+    return dict(_registry)
+
+
+class CachedCursorPaginator(CursorPaginator):
+    """
+    CursorPaginator that serves pages from cached ordering keys.
+
+    Results up to SEARCH_CACHE_MAX_RESULTS rows are cached as the list of
+    ordering values (ending with the primary key), so a page is a slice of
+    the list plus one pk lookup. Larger results only cache their count and
+    page through the database. Cursors are interchangeable between both.
+    """
+
+    def __init__(self, queryset, per_page, ordering, cache_key, max_results=None, **kwargs):
+        super().__init__(queryset, per_page, ordering, **kwargs)
+        self.cache_key = cache_key
+        self.max_results = max_results or getattr(settings, 'SEARCH_CACHE_MAX_RESULTS', 1000)
+        if self.fields[-1][0] not in ('id', 'pk'):
+            raise ValueError('Cached ordering must end with the primary key')
+
+    @cached_property
+    def entry(self):
+        cache = get_search_cache()
+        entry = cache.get(self.cache_key)
+        if entry is None:
+            names = [name for name, _ in self.fields]
+            keys = [
+                tuple(key) for key in
+                self.queryset.order_by(*self.ordering).values_list(*names)[:self.max_results + 1]
+            ]
+            if len(keys) <= self.max_results:
+                entry = {'keys': keys, 'total': len(keys)}
+            else:
+                entry = {'keys': None, 'total': self.count_queryset()}
+            cache.set(self.cache_key, entry)
+        return entry
+
+    def warm(self):
+        """Make sure the cache entry exists, returns the result total"""
+        return self.entry['total']
+
+    @cached_property
+    def count(self):
+        return self.entry['total']
+
+    def page(self, cursor=None):
+        keys = self.entry['keys']
+        if keys is None:
+            return super().page(cursor)
+
+        values, backwards = None, False
+        if cursor:
+            try:
+                values, backwards = self.decode_cursor(cursor)
+            except InvalidCursor:
+                values = None
+
+        start, end = 0, self.per_page
+        if values is not None:
+            position = {key: i for i, key in enumerate(keys)}.get(tuple(values))
+            if position is None:
+                # Cursor from a row outside the cached list; let the database find it
+                return super().page(cursor)
+            if backwards:
+                start, end = max(0, position - self.per_page), position
+            else:
+                start, end = position + 1, position + 1 + self.per_page
+        page_keys = keys[start:end]
+
+        ids = [key[-1] for key in page_keys]
+        objects = {obj.pk: obj for obj in self.queryset.filter(pk__in=ids)}
+        rows = [objects[pk] for pk in ids if pk in objects]
+
+        next_cursor = previous_cursor = None
+        if page_keys:
+            if end < len(keys):
+                next_cursor = self.encode_cursor(list(page_keys[-1]))
+            if start > 0:
+                previous_cursor = self.encode_cursor(list(page_keys[0]), backwards=True)
+        elif values is not None:
+            previous_cursor = self.encode_cursor(list(values), backwards=True)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+# Search statistics are counted in memory and written in batches, so
+# recording a search doesn't add a write to every request
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record_query(search, query_string):
+    """Count a run of a canonical search; flushed to SearchQuery periodically"""
+    with _pending_lock:
+        _pending[(search, query_string)] += 1
+        due = (
+            sum(_pending.values()) >= getattr(settings, 'SEARCH_STATS_FLUSH_SIZE', 100) or
+            time.monotonic() - _last_flush >= getattr(settings, 'SEARCH_STATS_FLUSH_SECONDS', 60)
+        )
+        if not due:
+            return
+    flush_recorded()
+
+
+def flush_recorded():
+    """Write out the searches counted so far"""
+    global _last_flush
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    flush_queries(pending)
+
+
+def flush_queries(pending):
+    """Add {(search, query_string): hits} to the stored search statistics"""
+    from .models import SearchQuery
+
+    now = timezone.now()
+    for (search, query_string), hits in pending.items():
+        query_hash = hashlib.md5(query_string.encode()).hexdigest()
+        lookup = {'search': search, 'query_hash': query_hash}
+        updated = SearchQuery.objects.filter(**lookup).update(hits=F('hits') + hits, last_seen=now)
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                SearchQuery.objects.create(query_string=query_string, hits=hits, last_seen=now, **lookup)
+        except IntegrityError:
+            # Created concurrently by another process
+            SearchQuery.objects.filter(**lookup).update(hits=F('hits') + hits, last_seen=now)
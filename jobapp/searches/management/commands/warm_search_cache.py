@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from searches.cache import get_searches
+from searches.models import SearchQuery
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-populate the search result cache with the most frequent searches, '
+        'e.g. right after a deploy. The unfiltered listing is always warmed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=100, help='Searches to warm per listing')
+        parser.add_argument('--search', action='append', help='Only warm these listings (repeatable)')
+
+    def handle(self, *args, **options):
+        searches = get_searches()
+        names = options['search'] or sorted(searches)
+        unknown = set(names) - set(searches)
+        if unknown:
+            raise CommandError(f"Unknown search: {', '.join(sorted(unknown))}")
+
+        for name in names:
+            search = searches[name]
+            query_strings = [''] + list(
+                SearchQuery.objects.filter(search=name).exclude(query_string='')
+                .order_by('-hits').values_list('query_string', flat=True)[:options['top']]
+            )
+            for query_string in query_strings:
+                params = search.canonicalize(QueryDict(query_string))
+                search.paginator(params).warm()
+            self.stdout.write(self.style.SUCCESS(f'Warmed {len(query_strings)} {name} searches'))
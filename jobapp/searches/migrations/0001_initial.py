@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search', models.CharField(help_text="Registered search name (e.g. 'jobs')", max_length=50)),
+                ('query_string', models.TextField(help_text='Canonical query string')),
+                ('query_hash', models.CharField(help_text='md5 of the canonical query string', max_length=32)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['search', '-hits'], name='searches_query_hits_idx')],
+                'unique_together': {('search', 'query_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class SearchQuery(models.Model):
+    """How often a canonicalized search has been run, used to warm the result cache"""
+
+    search = models.CharField(max_length=50, help_text="Registered search name (e.g. 'jobs')")
+    query_string = models.TextField(help_text="Canonical query string")
+    query_hash = models.CharField(max_length=32, help_text="md5 of the canonical query string")
+    hits = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        unique_together = ['search', 'query_hash']
+        indexes = [
+            models.Index(fields=['search', '-hits'], name='searches_query_hits_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.search}?{self.query_string} ({self.hits})"
@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase
+
+from jobapp.versions import bump_version
+from jobs.search import JobListingSearch
+
+
+class SearchCanonicalizationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.search = JobListingSearch()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def canonical(self, query_string):
+        return self.search.canonicalize(QueryDict(query_string)).urlencode()
+
+    def test_spellings_of_one_search_match(self):
+        spellings = [
+            'keywords=Python++Developer&job_type=part_time&job_type=full_time&skills=SQL,python',
+            'job_type=full_time&skills=+Python+,+sql,+,python&keywords=+python+developer+&job_type=part_time'
+            '&job_type=full_time&page=3&utm_source=mail',
+        ]
+        canonical = {self.canonical(spelling) for spelling in spellings}
+        self.assertEqual(canonical, {
+            'job_type=full_time&job_type=part_time&keywords=python+developer&skills=python%2C+sql'
+        })
+
+    def test_values_and_flags(self):
+        self.assertEqual(self.canonical('salary_min=50000'), self.canonical('salary_min=50000.0'))
+        self.assertEqual(self.canonical('salary_min=lots&location='), '')
+        self.assertEqual(self.canonical('visa_sponsorship=yes'), 'visa_sponsorship=on')
+        self.assertEqual(self.canonical('visa_sponsorship='), '')
+
+    def test_cache_keys(self):
+        params = self.search.canonicalize(QueryDict('keywords=python'))
+        key = self.search.cache_key(params)
+        self.assertEqual(self.search.cache_key(self.search.canonicalize(QueryDict('keywords=PYTHON'))), key)
+        self.assertNotEqual(self.search.cache_key(self.search.canonicalize(QueryDict('keywords=java'))), key)
+        bump_version('jobs')
+        self.assertNotEqual(self.search.cache_key(params), key)
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Skill
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'normalized_name', 'created_at']
+    search_fields = ['name', 'normalized_name']
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from applicants.models import ApplicantProfile, ApplicantSkill
+from jobs.models import Job, JobSkill
+from skills.utils import split_skills, normalize_skill, get_or_create_skills
+
+
+class Command(BaseCommand):
+    help = 'Parse the comma-separated skills fields into the normalized Skill tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        jobs = self.backfill(
+            Job.objects.only('pk', 'required_skills', 'preferred_skills'),
+            JobSkill, 'job', self.job_links, batch_size
+        )
+        profiles = self.backfill(
+            ApplicantProfile.objects.only('pk', 'skills'),
+            ApplicantSkill, 'applicant', self.profile_links, batch_size
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Backfilled skills for {jobs} jobs and {profiles} applicant profiles')
+        )
+
+    def job_links(self, job):
+        required = split_skills(job.required_skills)
+        preferred = split_skills(job.preferred_skills)
+        required_keys = {normalize_skill(name) for name in required}
+        return required + preferred, lambda key: {'is_required': key in required_keys}
+
+    def profile_links(self, profile):
+        return split_skills(profile.skills), lambda key: {}
+
+    def backfill(self, queryset, link_model, owner_field, get_links, batch_size):
+        count = 0
+        batch = []
+        for obj in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                self.write_batch(batch, link_model, owner_field, get_links)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.write_batch(batch, link_model, owner_field, get_links)
+            count += len(batch)
+        return count
+
+    @transaction.atomic
+    def write_batch(self, batch, link_model, owner_field, get_links):
+        parsed = [(obj, *get_links(obj)) for obj in batch]
+        skills = get_or_create_skills([name for _, names, _ in parsed for name in names])
+
+        link_model.objects.filter(**{f'{owner_field}__in': batch}).delete()
+        links = []
+        for obj, names, fields_for in parsed:
+            seen = set()
+            for name in names:
+                key = normalize_skill(name)
+                if key and key not in seen:
+                    seen.add(key)
+                    links.append(link_model(**{owner_field: obj, 'skill': skills[key]}, **fields_for(key)))
+        link_model.objects.bulk_create(links)
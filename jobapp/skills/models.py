@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class Skill(models.Model):
+    """Canonical skill shared by job postings and applicant profiles"""
+
+    name = models.CharField(max_length=100, help_text="Display name (first spelling seen)")
+    normalized_name = models.CharField(
+        max_length=100, unique=True,
+        help_text="Case-folded name used for matching and de-duplication"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase, TestCase
+
+from applicants.models import ApplicantSkill
+from jobs.models import Job, JobSkill
+from perf.testing import make_applicant, make_jobs, make_recruiter
+from .models import Skill
+from .utils import get_or_create_skills, normalize_skill, owners_with_all_skills, split_skills
+
+
+class SkillParsingTests(SimpleTestCase):
+
+    def test_split_skills(self):
+        self.assertEqual(split_skills(' Python, ,Django ,SQL,'), ['Python', 'Django', 'SQL'])
+        self.assertEqual(split_skills(''), [])
+        self.assertEqual(split_skills(None), [])
+
+    def test_normalize_skill(self):
+        self.assertEqual(normalize_skill('  Machine \t Learning '), 'machine learning')
+        self.assertEqual(normalize_skill('JAVA'), normalize_skill('java'))
+        self.assertNotEqual(normalize_skill('Java'), normalize_skill('JavaScript'))
+        self.assertEqual(len(normalize_skill('x' * 500)), 100)
+
+
+class SkillVocabularyTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = make_recruiter('recruiter')
+
+    def job_ids(self, *names):
+        return sorted(owners_with_all_skills(JobSkill, 'job_id', names).values_list('job_id', flat=True))
+
+    def test_spellings_share_one_skill(self):
+        skills = get_or_create_skills(['Node JS', 'node  js', 'NODE JS'])
+        self.assertEqual(list(skills), ['node js'])
+        self.assertEqual(Skill.objects.get().name, 'Node JS')
+        self.assertEqual(get_or_create_skills(['node js'])['node js'].pk, skills['node js'].pk)
+        self.assertEqual(Skill.objects.count(), 1)
+
+    def test_job_links_follow_the_skills_text(self):
+        job, = make_jobs(self.recruiter, 1, required_skills='Python, SQL', preferred_skills='Docker, python')
+        links = dict(job.skill_links.values_list('skill__normalized_name', 'is_required'))
+        self.assertEqual(links, {'python': True, 'sql': True, 'docker': False})
+
+        job.required_skills = 'Go'
+        job.save()
+        links = dict(job.skill_links.values_list('skill__normalized_name', 'is_required'))
+        self.assertEqual(links, {'go': True, 'docker': False, 'python': False})
+
+    def test_exact_skill_matches(self):
+        java, = make_jobs(self.recruiter, 1, required_skills='Java, SQL')
+        javascript, = make_jobs(self.recruiter, 1, start=1, required_skills='JavaScript, SQL')
+        self.assertEqual(self.job_ids('java'), [java.pk])
+        self.assertEqual(self.job_ids('JavaScript'), [javascript.pk])
+        self.assertEqual(self.job_ids('sql'), sorted([java.pk, javascript.pk]))
+        self.assertEqual(self.job_ids('Java', ' sql '), [java.pk])
+        # An unknown skill matches nothing rather than being ignored
+        self.assertEqual(self.job_ids('java', 'cobol'), [])
+        self.assertEqual(list(Job.objects.filter(pk__in=owners_with_all_skills(JobSkill, 'job_id', ['cobol']))), [])
+
+    def test_profile_links(self):
+        applicant = make_applicant('applicant', skills='Python, Django')
+        profile = applicant.applicant_profile
+        profile.skills = 'python, React'
+        profile.save()
+        self.assertEqual(
+            sorted(ApplicantSkill.objects.filter(applicant=profile).values_list('skill__normalized_name', flat=True)),
+            ['python', 'react']
+        )
+        react = owners_with_all_skills(ApplicantSkill, 'applicant_id', ['REACT'])
+        self.assertEqual(list(react.values_list('applicant_id', flat=True)), [profile.pk])
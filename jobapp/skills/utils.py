@@ -0,0 +1,93 @@
+from functools import lru_cache
+from django.db.models import Count
+from .models import Skill
+
+MAX_SKILL_LENGTH = 100
+
+
+@lru_cache(maxsize=4096)
+def _split(text):
+    return tuple(skill.strip() for skill in text.split(',') if skill.strip())
+
+
+def split_skills(text):
+    """Split a comma-separated skills string into a list (parsing is memoized)"""
+    if not text:
+        return []
+    return list(_split(text))
+
+
+def normalize_skill(name):
+    """Canonical matching key for a skill: collapsed whitespace, case-folded"""
+    return ' '.join(name.split()).casefold()[:MAX_SKILL_LENGTH]
+
+
+def get_or_create_skills(names):
+    """Return {normalized_name: Skill} for names, creating any missing skills"""
+    wanted = {}
+    for name in names:
+        key = normalize_skill(name)
+        if key and key not in wanted:
+            wanted[key] = ' '.join(name.split())[:MAX_SKILL_LENGTH]
+    if not wanted:
+        return {}
+
+    skills = {skill.normalized_name: skill for skill in Skill.objects.filter(normalized_name__in=wanted)}
+    missing = [Skill(name=wanted[key], normalized_name=key) for key in wanted if key not in skills]
+    if missing:
+        # ignore_conflicts covers a concurrent insert of the same skill
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        skills.update({
+            skill.normalized_name: skill
+            for skill in Skill.objects.filter(normalized_name__in=[skill.normalized_name for skill in missing])
+        })
+    return skills
+
+
+def sync_skill_links(links, link_model, owner_field, owner, desired):
+    """
+    Bring an owner's skill links in line with desired ({skill_id: extra field values}).
+
+    links is the owner's related manager (e.g. job.skill_links); only the
+    rows that actually changed are written.
+    """
+    existing = {link.skill_id: link for link in links.all()}
+    stale = [link.pk for skill_id, link in existing.items() if skill_id not in desired]
+    if stale:
+        link_model.objects.filter(pk__in=stale).delete()
+
+    to_create = []
+    to_update = []
+    for skill_id, fields in desired.items():
+        link = existing.get(skill_id)
+        if link is None:
+            to_create.append(link_model(**{owner_field: owner, 'skill_id': skill_id}, **fields))
+        elif any(getattr(link, name) != value for name, value in fields.items()):
+            for name, value in fields.items():
+                setattr(link, name, value)
+            to_update.append(link)
+    if to_create:
+        link_model.objects.bulk_create(to_create, ignore_conflicts=True)
+    if to_update:
+        link_model.objects.bulk_update(to_update, list(desired[to_update[0].skill_id]))
+
+
+def owners_with_all_skills(link_model, owner_field, names):
+    """
+    Subquery of owner ids linked to every skill in names.
+
+    This is an indexed set intersection over the link table instead of one
+    substring scan per skill. Unknown skills can never match, so they
+    short-circuit to an empty result.
+    """
+    keys = {normalize_skill(name) for name in names if normalize_skill(name)}
+    skill_ids = list(Skill.objects.filter(normalized_name__in=keys).values_list('pk', flat=True))
+    if len(skill_ids) < len(keys):
+        return link_model.objects.none().values(owner_field)
+    return (
+        link_model.objects.filter(skill_id__in=skill_ids)
+        .values(owner_field)
+        .annotate(matched=Count('skill_id'))
+        .filter(matched=len(skill_ids))
+        .values(owner_field)
+    )
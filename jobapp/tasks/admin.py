@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'attempts', 'max_attempts', 'run_after', 'created_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'key']
+    readonly_fields = ['locked_by', 'locked_until', 'last_error', 'created_at', 'updated_at']
+    actions = ['requeue']
+
+    @admin.action(description='Requeue selected tasks')
+    def requeue(self, request, queryset):
+        for task in queryset:
+            task.requeue()
+        self.message_user(request, f'Requeued {len(queryset)} tasks.')
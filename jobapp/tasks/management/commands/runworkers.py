@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from tasks.queue import Worker, worker_name
+
+
+def use_immediate_transactions():
+    """
+    Make SQLite transactions opened from now on in this process take the
+    write lock up front.
+
+    A worker transaction reads before it writes (claiming a batch, most
+    task work). In SQLite's default DEFERRED mode, upgrading that read lock
+    while another worker is writing fails at once with "database is
+    locked", without waiting out the busy timeout. IMMEDIATE transactions
+    wait for the lock instead. Only worker processes opt in: web requests
+    keep DEFERRED transactions, so their atomic blocks don't serialize
+    behind every writer.
+    """
+    for alias in connections:
+        if connections[alias].vendor == 'sqlite':
+            connections[alias].settings_dict.setdefault('OPTIONS', {}).setdefault('transaction_mode', 'IMMEDIATE')
+
+
+def _work(name, options, stop, results=None):
+    """One worker's loop, in a thread or a process of its own"""
+    if not apps.ready:
+        # Spawned (rather than forked) workers start without Django configured
+        django.setup()
+    use_immediate_transactions()
+    if results is not None:
+        # The parent handles Ctrl-C and tells workers to stop through the event
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker = Worker(
+        name=name, batch_size=options['batch_size'], lease_seconds=options['lease'],
+        poll_seconds=options['poll'], stop=stop, burst=options['burst'],
+    )
+    try:
+        counts = worker.run()
+    finally:
+        connections.close_all()
+    if results is not None:
+        results.put(counts)
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Run background tasks with a pool of worker threads or processes. Each worker '
+        'claims a batch of due tasks at a time (row locks where the database has them, '
+        'leases on SQLite), runs them, and polls when the queue is empty. Stops cleanly '
+        'on Ctrl-C or SIGTERM; unstarted tasks in a batch go back to the queue.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            '--mode', choices=['thread', 'process'], default='thread',
+            help='Threads suit I/O-bound tasks such as email; processes suit CPU-bound ones'
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.TASK_BATCH_SIZE, help='Tasks per claim')
+        parser.add_argument(
+            '--lease', type=int, default=settings.TASK_LEASE_SECONDS,
+            help='Seconds a claimed batch is reserved before other workers may take it over'
+        )
+        parser.add_argument('--poll', type=float, default=settings.TASK_POLL_SECONDS, help='Seconds between polls')
+        parser.add_argument('--burst', action='store_true', help='Exit once no tasks are due')
+
+    def handle(self, *args, **options):
+        count = max(1, options['workers'])
+        base = worker_name().rsplit(':', 1)[0]
+        # Only what workers need; the rest (output streams) may not pickle for spawned processes
+        options = {name: options[name] for name in ('mode', 'batch_size', 'lease', 'poll', 'burst')}
+        if options['mode'] == 'process':
+            stop = multiprocessing.Event()
+            results = multiprocessing.Queue()
+            # Forked workers must not share the parent's database connection
+            connections.close_all()
+            workers = [
+                multiprocessing.Process(target=_work, args=(f'{base}-p{i}', options, stop, results), daemon=True)
+                for i in range(count)
+            ]
+        else:
+            stop = threading.Event()
+            results = None
+            workers = [
+                threading.Thread(target=self.collect, args=(f'{base}-t{i}', options, stop), daemon=True)
+                for i in range(count)
+            ]
+            self.counts = []
+
+        def request_stop(signum, frame):
+            self.stdout.write('Stopping after the tasks in progress...')
+            stop.set()
+        previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+        self.stdout.write(f'Starting {count} worker {"processes" if options["mode"] == "process" else "threads"}')
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(0.5)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+        counts = self.counts if results is None else self.drain(results, len(workers))
+        succeeded, failed = sum(c[0] for c in counts), sum(c[1] for c in counts)
+        self.stdout.write(self.style.SUCCESS(
+            f'Ran {succeeded + failed} tasks: {succeeded} succeeded, {failed} failed'
+        ))
+
+    def collect(self, name, options, stop):
+        self.counts.append(_work(name, options, stop))
+
+    def drain(self, results, expected):
+        """Counts reported by worker processes (none from one that crashed)"""
+        counts = []
+        while len(counts) < expected:
+            try:
+                counts.append(results.get(timeout=1))
+            except queue.Empty:
+                break
+        return counts
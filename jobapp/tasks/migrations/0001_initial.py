@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:37
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Registered task name', max_length=200)),
+                ('kwargs', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('key', models.CharField(blank=True, help_text='Enqueueing again while a task with this key is queued is a no-op', max_length=200)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('dead', 'Dead')], default='queued', max_length=10)),
+                ('priority', models.SmallIntegerField(default=0, help_text='Higher runs first')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5)),
+                ('locked_by', models.CharField(blank=True, help_text='Claim token of the worker running it', max_length=100)),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Lease expiry; then it can be claimed again', null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-priority', 'run_after', 'id'], name='tasks_task_claim_idx'), models.Index(fields=['status', 'locked_until'], name='tasks_task_lease_idx'), models.Index(condition=models.Q(('locked_by', ''), _negated=True), fields=['locked_by'], name='tasks_task_locked_by_idx'), models.Index(condition=models.Q(('key', ''), _negated=True), fields=['key', 'status'], name='tasks_task_key_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """A queued call of a registered task function (see tasks/queue.py)"""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('dead', 'Dead'),
+    ]
+
+    name = models.CharField(max_length=200, help_text="Registered task name")
+    kwargs = models.JSONField(default=dict, encoder=DjangoJSONEncoder, blank=True)
+    key = models.CharField(
+        max_length=200, blank=True, help_text="Enqueueing again while a task with this key is queued is a no-op"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    priority = models.SmallIntegerField(default=0, help_text="Higher runs first")
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True, help_text="Claim token of the worker running it")
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="Lease expiry; then it can be claimed again")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Claiming: due queued tasks by priority
+            models.Index(fields=['status', '-priority', 'run_after', 'id'], name='tasks_task_claim_idx'),
+            # Expired leases, and a claim's batch by its token
+            models.Index(fields=['status', 'locked_until'], name='tasks_task_lease_idx'),
+            models.Index(fields=['locked_by'], name='tasks_task_locked_by_idx', condition=~models.Q(locked_by='')),
+            # Pending tasks with a deduplication key
+            models.Index(fields=['key', 'status'], name='tasks_task_key_idx', condition=~models.Q(key='')),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    def requeue(self):
+        """Put a dead task back in the queue with its attempts reset"""
+        Task.objects.filter(pk=self.pk).update(
+            status='queued', attempts=0, run_after=timezone.now(), locked_by='', locked_until=None
+        )
@@ -0,0 +1,226 @@
+"""
+Database-backed background tasks.
+
+Functions decorated with @task are registered by name. enqueue() inserts
+a Task row in the caller's transaction, so a task only runs if the work
+that queued it commits. Keyword arguments must be JSON-serializable: pass
+ids, not model instances. A key makes enqueueing idempotent while a task
+with that key is still waiting, so repeated saves queue one refresh.
+
+Workers (the runworkers command) claim due tasks in batches:
+
+* where the database has SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL),
+  the batch is locked and marked running in one transaction, and
+  concurrent workers skip past each other's rows;
+* elsewhere (SQLite) one UPDATE of a LIMITed subquery stamps the batch
+  with the worker's claim token. SQLite runs one write at a time, so two
+  workers never win the same row.
+
+A claim is a lease. If a batch isn't finished by locked_until, its worker
+is presumed dead and release_expired() queues the tasks again. A task can
+therefore run more than once and must be idempotent.
+
+A task that raises is retried with exponential backoff (with jitter)
+until max_attempts, then left 'dead' for inspection. Dead tasks can be
+requeued from the admin. Finished tasks are deleted in the same
+transaction as their work, which keeps the table small.
+
+With TASKS_EAGER, enqueue() calls the function straight away instead.
+
+Workers send task_finished after each task they run and worker_stopped
+when they stop, for per-process bookkeeping such as flushing statistics.
+"""
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+import uuid
+from datetime import timedelta
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSpec(NamedTuple):
+    func: Callable
+    max_attempts: int
+    priority: int
+
+
+# Task name -> TaskSpec, filled by @task as apps' tasks.py modules are imported
+registry = {}
+
+# Sent by a Worker (sender) with task= after each task it ran, and when it stops
+task_finished = Signal()
+worker_stopped = Signal()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def task(func=None, *, name=None, max_attempts=None, priority=0):
+    """Register a function as a task; func.enqueue(**kwargs) queues a call"""
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registry[task_name] = TaskSpec(func, max_attempts or _setting('TASK_MAX_ATTEMPTS', 5), priority)
+        func.task_name = task_name
+        func.enqueue = lambda **kwargs: enqueue(task_name, kwargs)
+        return func
+    return register(func) if func else register
+
+
+def enqueue(name, kwargs=None, *, delay=None, priority=None, key=''):
+    """
+    Queue a call of the task (a name or @task function) with kwargs, to run
+    after delay seconds. Returns the Task, or None when it ran eagerly or a
+    task with the same key is already waiting.
+    """
+    name = getattr(name, 'task_name', name)
+    spec = registry.get(name)
+    if spec is None:
+        raise ValueError(f'Unknown task "{name}"')
+    # What a worker would get back, so eager runs see the same values
+    kwargs = json.loads(json.dumps(kwargs or {}, cls=DjangoJSONEncoder))
+    if _setting('TASKS_EAGER', False):
+        spec.func(**kwargs)
+        return None
+    if key and Task.objects.filter(key=key, status='queued').exists():
+        return None
+    return Task.objects.create(
+        name=name, kwargs=kwargs, key=key, priority=spec.priority if priority is None else priority,
+        run_after=timezone.now() + timedelta(seconds=delay or 0), max_attempts=spec.max_attempts,
+    )
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def claim(batch_size=None, lease_seconds=None, worker=None):
+    """Lease up to batch_size due tasks to this worker, highest priority first"""
+    batch_size = batch_size or _setting('TASK_BATCH_SIZE', 10)
+    now = timezone.now()
+    # Unique per claim, so a batch is told apart from any earlier one of the same worker
+    token = f'{worker or worker_name()}:{uuid.uuid4().hex[:8]}'[-100:]
+    claimed = {
+        'status': 'running', 'locked_by': token, 'attempts': F('attempts') + 1,
+        'locked_until': now + timedelta(seconds=lease_seconds or _setting('TASK_LEASE_SECONDS', 300)),
+    }
+    due = Task.objects.filter(status='queued', run_after__lte=now).order_by('-priority', 'run_after', 'id')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pks = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            Task.objects.filter(pk__in=pks).update(**claimed)
+    else:
+        Task.objects.filter(status='queued', pk__in=due.values('pk')[:batch_size]).update(**claimed)
+    return list(Task.objects.filter(locked_by=token).order_by('-priority', 'run_after', 'id'))
+
+
+def release(tasks):
+    """Give tasks of one claim that were never started back to the queue"""
+    if tasks:
+        Task.objects.filter(pk__in=[task.pk for task in tasks], locked_by=tasks[0].locked_by).update(
+            status='queued', locked_by='', locked_until=None, attempts=F('attempts') - 1
+        )
+
+
+def release_expired():
+    """Queue again tasks whose worker's lease ran out; those out of attempts die"""
+    expired = Task.objects.filter(status='running', locked_until__lt=timezone.now())
+    dead = expired.filter(attempts__gte=F('max_attempts')).update(
+        status='dead', locked_by='', locked_until=None, last_error='The lease expired: its worker died or stalled'
+    )
+    return dead + expired.update(status='queued', locked_by='', locked_until=None)
+
+
+def retry_delay(attempts):
+    """Seconds before retrying after a task's attempts-th failure"""
+    base = _setting('TASK_RETRY_BACKOFF_SECONDS', 10)
+    delay = min(base * 2 ** (attempts - 1), _setting('TASK_RETRY_BACKOFF_MAX_SECONDS', 3600))
+    # Jitter spreads out retries of tasks that failed together
+    return delay * random.uniform(0.5, 1.0)
+
+
+def run_claimed(task):
+    """Run one claimed task; True if it succeeded"""
+    mine = Task.objects.filter(pk=task.pk, locked_by=task.locked_by)
+    spec = registry.get(task.name)
+    if spec is None:
+        mine.update(status='dead', locked_by='', locked_until=None, last_error=f'Unknown task "{task.name}"')
+        return False
+    try:
+        with transaction.atomic():
+            spec.func(**task.kwargs)
+            mine.delete()
+    except Exception:
+        logger.exception('Task %s #%s failed (attempt %s of %s)', task.name, task.pk, task.attempts, task.max_attempts)
+        fields = {'locked_by': '', 'locked_until': None, 'last_error': traceback.format_exc()}
+        if task.attempts >= task.max_attempts:
+            mine.update(status='dead', **fields)
+        else:
+            retry_at = timezone.now() + timedelta(seconds=retry_delay(task.attempts))
+            mine.update(status='queued', run_after=retry_at, **fields)
+        return False
+    return True
+
+
+class Worker:
+    """Claims batches and runs them until stopped (or, with burst, until nothing is due)"""
+
+    def __init__(self, name=None, batch_size=None, lease_seconds=None, poll_seconds=None, stop=None, burst=False):
+        self.name = name
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds or _setting('TASK_POLL_SECONDS', 1.0)
+        self.stop = stop or threading.Event()
+        self.burst = burst
+        self.succeeded = self.failed = 0
+
+    def run(self):
+        reap_every = (self.lease_seconds or _setting('TASK_LEASE_SECONDS', 300)) / 4
+        next_reap = 0
+        while not self.stop.is_set():
+            try:
+                if timezone.now().timestamp() >= next_reap:
+                    release_expired()
+                    next_reap = timezone.now().timestamp() + reap_every
+                tasks = claim(self.batch_size, self.lease_seconds, self.name)
+            except DatabaseError:
+                # Busy or briefly unreachable database: keep the worker alive and poll again
+                logger.warning('Could not claim tasks', exc_info=True)
+                self.stop.wait(self.poll_seconds)
+                continue
+            if not tasks:
+                if self.burst:
+                    break
+                self.stop.wait(self.poll_seconds)
+                continue
+            for index, task in enumerate(tasks):
+                if self.stop.is_set():
+                    release(tasks[index:])
+                    break
+                if run_claimed(task):
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+                task_finished.send(sender=self.__class__, task=task)
+        worker_stopped.send(sender=self.__class__)
+        return self.succeeded, self.failed
+
+
+def run_pending(**options):
+    """Run every due task in this thread; (succeeded, failed)"""
+    return Worker(burst=True, **options).run()
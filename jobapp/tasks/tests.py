@@ -0,0 +1,153 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Task
+from .queue import claim, enqueue, release, release_expired, run_claimed, run_pending, task
+
+calls = []
+
+
+@task(name='tasks.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='tasks.tests.explode', max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+@task(name='tasks.tests.transaction_mode')
+def record_transaction_mode():
+    calls.append(connection.transaction_mode)
+
+
+@task(name='tasks.tests.make_group')
+def make_group(name):
+    Group.objects.get_or_create(name=name)
+
+
+class QueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        queued = record.enqueue(value=1)
+        enqueue('tasks.tests.record', {'value': 2}, delay=60)
+        self.assertEqual((queued.name, queued.kwargs, queued.status), ('tasks.tests.record', {'value': 1}, 'queued'))
+        self.assertEqual(calls, [])
+
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(calls, [1])
+        # Done tasks are deleted; the delayed one is still waiting
+        self.assertEqual(list(Task.objects.values_list('kwargs', flat=True)), [{'value': 2}])
+
+    def test_keys_coalesce_waiting_tasks(self):
+        self.assertIsNotNone(enqueue(record, {'value': 1}, key='record'))
+        self.assertIsNone(enqueue(record, {'value': 2}, key='record'))
+        claim()
+        self.assertIsNotNone(enqueue(record, {'value': 3}, key='record'))
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_unknown_task(self):
+        with self.assertRaises(ValueError):
+            enqueue('tasks.tests.missing')
+        Task.objects.create(name='tasks.tests.missing')
+        self.assertEqual(run_pending(), (0, 1))
+        self.assertEqual(Task.objects.get().status, 'dead')
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager(self):
+        self.assertIsNone(record.enqueue(value=timezone.now().date()))
+        self.assertEqual(calls, [str(timezone.now().date())])
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(TASK_RETRY_BACKOFF_SECONDS=100)
+    def test_retries_then_dead_letter(self):
+        queued = explode.enqueue()
+        start = timezone.now()
+        self.assertEqual(run_pending(), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts, queued.locked_by), ('queued', 1, ''))
+        self.assertIn('RuntimeError: boom', queued.last_error)
+        self.assertGreaterEqual(queued.run_after, start + timedelta(seconds=50))
+        self.assertLessEqual(queued.run_after, timezone.now() + timedelta(seconds=100))
+
+        Task.objects.update(run_after=timezone.now())
+        run_pending()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('dead', 2))
+
+        queued.requeue()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('queued', 0))
+
+    def test_claims_are_disjoint_and_by_priority(self):
+        for value in range(5):
+            enqueue(record, {'value': value}, priority=value % 2)
+        first, second = claim(batch_size=3), claim(batch_size=3)
+        self.assertEqual([t.kwargs['value'] for t in first], [1, 3, 0])
+        self.assertEqual([t.kwargs['value'] for t in second], [2, 4])
+        self.assertEqual(claim(), [])
+        self.assertEqual(len({t.locked_by for t in first}), 1)
+        self.assertNotEqual(first[0].locked_by, second[0].locked_by)
+        self.assertTrue(all(t.status == 'running' and t.attempts == 1 for t in first + second))
+
+    def test_release_unstarted_tasks(self):
+        for value in range(3):
+            record.enqueue(value=value)
+        batch = claim()
+        run_claimed(batch[0])
+        release(batch[1:])
+        self.assertEqual(
+            list(Task.objects.values_list('status', 'attempts', 'locked_by')), [('queued', 0, '')] * 2
+        )
+
+    def test_expired_leases(self):
+        record.enqueue(value=1)
+        explode.enqueue()
+        stale = claim(lease_seconds=60)
+        Task.objects.filter(name='tasks.tests.explode').update(attempts=2)
+        self.assertEqual(release_expired(), 0)
+
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(release_expired(), 2)
+        self.assertEqual(
+            dict(Task.objects.values_list('name', 'status')),
+            {'tasks.tests.record': 'queued', 'tasks.tests.explode': 'dead'}
+        )
+        # The stalled worker finishing late does not touch the task's new claim
+        reclaimed, = claim()
+        run_claimed(stale[0])
+        self.assertTrue(Task.objects.filter(pk=reclaimed.pk, locked_by=reclaimed.locked_by).exists())
+        self.assertTrue(run_claimed(reclaimed))
+        self.assertEqual(calls, [1, 1])
+
+
+class RunWorkersTests(TransactionTestCase):
+
+    def test_thread_pool(self):
+        for number in range(25):
+            make_group.enqueue(name=f'group-{number}')
+        out = StringIO()
+        # One worker: the in-memory test database locks whole tables against other threads
+        call_command('runworkers', workers=1, batch_size=4, burst=True, stdout=out)
+        self.assertIn('Ran 25 tasks: 25 succeeded, 0 failed', out.getvalue())
+        self.assertEqual(Group.objects.count(), 25)
+        self.assertFalse(Task.objects.exists())
+
+    def test_workers_take_the_write_lock_up_front(self):
+        # Web requests keep SQLite's default DEFERRED transactions
+        self.assertIsNone(connection.transaction_mode)
+        self.addCleanup(connection.settings_dict.__setitem__, 'OPTIONS', dict(connection.settings_dict['OPTIONS']))
+        calls.clear()
+        record_transaction_mode.enqueue()
+        call_command('runworkers', workers=1, burst=True, stdout=StringIO())
+        self.assertEqual(calls, ['IMMEDIATE'])